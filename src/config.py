@@ -58,6 +58,28 @@ class Configuration(BaseModel, frozen=True):
     development: DevelopmentConfiguration
     routing: RoutingConfiguration
     logging: list[LoggingConfiguration]
+    query_deadlines: QueryDeadlineConfiguration = Field(
+        # The lambda defers the lookup, the class is only defined further below.
+        default_factory=lambda: QueryDeadlineConfiguration(),  # noqa: PLW0108
+    )
+    admission: AdmissionConfiguration = Field(
+        default_factory=lambda: AdmissionConfiguration(),  # noqa: PLW0108
+    )
+    cache_control: dict[str, str] = Field(
+        default_factory=dict,
+        description="Cache-Control header of entity GET endpoints by path template. "
+        "These endpoints also support conditional requests, see `core.conditional`.",
+    )
+    caches: dict[str, CacheConfiguration] = Field(
+        default_factory=dict,
+        description="Settings of in-process caches by name, see `core.cache`.",
+    )
+    shared_cache: SharedCacheConfiguration = Field(
+        default_factory=lambda: SharedCacheConfiguration(),  # noqa: PLW0108
+    )
+    response_cache: ResponseCacheConfiguration = Field(
+        default_factory=lambda: ResponseCacheConfiguration(),  # noqa: PLW0108
+    )
 
 
 class DatabaseConfiguration(BaseModel, frozen=True):
@@ -76,6 +98,176 @@ class DatabaseConfiguration(BaseModel, frozen=True):
         default="mysql+aiomysql",
         description="SQLAlchemy `dialect` and `driver`: https://docs.sqlalchemy.org/en/20/dialects/index.html",
     )
+    pool_size: int = Field(
+        default=5,
+        ge=0,
+        description="Number of connections kept open in the pool, 0 means no limit.",
+    )
+    max_overflow: int = Field(
+        default=10,
+        ge=-1,
+        description="Connections opened beyond `pool_size` under load, -1 means no limit.",
+    )
+    pool_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds to wait for a connection from the pool before giving up.",
+    )
+    pool_recycle: int = Field(
+        default=3600,
+        description="Seconds after which a pooled connection is replaced, -1 disables recycling.",
+    )
+    pool_pre_ping: bool = Field(
+        default=False,
+        description="Test connections for liveness on checkout, costs a round trip.",
+    )
+    pool_use_lifo: bool = Field(
+        default=False,
+        description="Check out the most recently used connection first (LIFO) instead of FIFO, "
+        "which lets idle connections time out server-side during quiet periods.",
+    )
+    warm_up_connections: int = Field(
+        default=1,
+        ge=1,
+        description="Connections each engine opens and probes at startup, before the service "
+        "reports ready. Limited to `pool_size`, as only those are kept open.",
+    )
+    max_parallel_queries: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of pooled connections a single request may use to run "
+        "independent read queries in parallel, 1 runs them on the request's own connection. "
+        "Only idle connections are used, so requests never wait on each other for them.",
+    )
+    replicas: list[ReplicaConfiguration] = Field(
+        default_factory=list,
+        description="Read replicas of this database. Endpoints that only read data are "
+        "spread over the replicas, all other endpoints use the database above.",
+    )
+
+
+class ReplicaConfiguration(BaseModel, frozen=True):
+    """Location of a read replica, it shares all other settings with its primary."""
+
+    host: str = Field(description="Database server host name")
+    port: int = Field(default=3306, gt=0)
+
+
+class QueryDeadlineConfiguration(BaseModel, frozen=True):
+    """Execution time budgets for SELECT statements, enforced by MySQL per statement."""
+
+    default: float = Field(default=30.0, ge=0, description="Seconds, 0 means no limit.")
+    routes: dict[str, float] = Field(
+        default_factory=dict,
+        description="Budget in seconds for the statements of a route, by path template, "
+        "e.g., `/datasets/list` or `/datasets/{dataset_id}`.",
+    )
+
+    def for_route(self, path: str) -> float:
+        """Return the budget for statements executed on behalf of the route at `path`."""
+        return self.routes.get(path, self.default)
+
+
+class AdmissionConfiguration(BaseModel, frozen=True):
+    """Limits on the number of requests that are handled at the same time."""
+
+    retry_after: int = Field(
+        default=1,
+        ge=0,
+        description="Seconds after which rejected clients are told to retry.",
+    )
+    groups: dict[str, AdmissionGroupConfiguration] = Field(
+        default_factory=dict,
+        description="Groups of routes that share a limit, by name. A request belongs to the "
+        "first group with a matching path prefix, requests without a group are not limited.",
+    )
+
+
+class AdmissionGroupConfiguration(BaseModel, frozen=True):
+    """Concurrency limit shared by the routes under a set of path prefixes."""
+
+    paths: list[str] = Field(
+        description="Path prefixes (without `root_path`), e.g., `/datasets` also matches "
+        "`/datasets/list` but not `/datasets_old`.",
+    )
+    max_concurrent: int = Field(gt=0, description="Requests that are handled at the same time.")
+    max_queued: int = Field(
+        default=0,
+        ge=0,
+        description="Requests that may wait for a slot, further requests are rejected.",
+    )
+    queue_timeout: float = Field(
+        default=1.0,
+        ge=0,
+        description="Seconds a request may wait for a slot before it is rejected.",
+    )
+
+
+class CacheConfiguration(BaseModel, frozen=True):
+    """Settings of one in-process cache."""
+
+    ttl: float = Field(
+        default=600,
+        ge=0,
+        description="Seconds an entry is served before it is loaded again, 0 disables the cache.",
+    )
+    max_size: int = Field(
+        default=1024,
+        gt=0,
+        description="Number of entries, the least recently used are evicted beyond it.",
+    )
+    negative_ttl: float | None = Field(
+        default=None,
+        ge=0,
+        description="Seconds a result that something does not exist is served, defaults to `ttl`.",
+    )
+
+
+class SharedCacheConfiguration(BaseModel, frozen=True):
+    """Cache shared by all workers, see `core.shared_cache`."""
+
+    backend: Literal["memory", "redis"] = Field(
+        default="memory",
+        description="`memory` keeps entries per worker, `redis` shares them through a server "
+        "that speaks the Redis protocol.",
+    )
+    url: str = Field(
+        default="redis://localhost:6379/0",
+        description="Location of the server of the `redis` backend.",
+    )
+    max_connections: int = Field(
+        default=10,
+        gt=0,
+        description="Connections each worker opens to the server of the `redis` backend.",
+    )
+    timeout: float = Field(
+        default=0.5,
+        gt=0,
+        description="Seconds to wait for the server of the `redis` backend to accept a "
+        "connection or reply to a command, after which requests are served without the cache.",
+    )
+    invalidation_interval: float = Field(
+        default=1,
+        gt=0,
+        description="Seconds between the checks of each worker for caches that were cleared "
+        "by another worker, see `core.cache.broadcast_invalidation`.",
+    )
+
+
+class ResponseCacheConfiguration(BaseModel, frozen=True):
+    """Responses of GET endpoints that are stored in the shared cache."""
+
+    ttl: float = Field(
+        default=60,
+        gt=0,
+        description="Seconds a response is served from the cache, unless invalidated earlier.",
+    )
+    routes: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description="Tags of the cached responses by path template, e.g., "
+        "`/datasets/{dataset_id}` with tags `dataset:{dataset_id}`. The response is "
+        "removed from the cache when a write endpoint invalidates one of its tags.",
+    )
 
 
 class DevelopmentConfiguration(BaseModel, frozen=True):
@@ -179,4 +371,13 @@ def parse_config(
         openml_database=openml_db,
         expdb_database=expdb_db,
         development=DevelopmentConfiguration(**config["development"]),
+        query_deadlines=QueryDeadlineConfiguration(**config.get("query_deadlines", {})),
+        admission=AdmissionConfiguration(**config.get("admission", {})),
+        cache_control=config.get("cache_control", {}),
+        caches={
+            name: CacheConfiguration(**cache_configuration)
+            for name, cache_configuration in config.get("caches", {}).items()
+        },
+        shared_cache=SharedCacheConfiguration(**config.get("shared_cache", {})),
+        response_cache=ResponseCacheConfiguration(**config.get("response_cache", {})),
     )
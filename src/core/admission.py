@@ -0,0 +1,114 @@
+"""Limit the number of requests that are handled at the same time.
+
+Without a limit, every request competes for a pooled database connection during a
+traffic spike, and most of them end up waiting until the pool times out. Rejecting
+the requests that cannot be handled soon instead keeps latency bounded for the
+requests that are admitted, and keeps the load on the database manageable.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from starlette.requests import Request
+
+from core.errors import ServiceOverloadedError, problem_detail_exception_handler
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+    from config import AdmissionConfiguration, AdmissionGroupConfiguration
+
+
+class ConcurrencyLimit:
+    """Admit at most `max_concurrent` requests at a time, with a bounded wait queue."""
+
+    def __init__(self, name: str, configuration: AdmissionGroupConfiguration) -> None:
+        """Create the limit for the route group `name`."""
+        self.name = name
+        self.paths = tuple(path.rstrip("/") for path in configuration.paths)
+        self.max_queued = configuration.max_queued
+        self.queue_timeout = configuration.queue_timeout
+        self.queued = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(configuration.max_concurrent)
+
+    def matches(self, path: str) -> bool:
+        """Whether the request for `path` belongs to this group."""
+        return any(path == prefix or path.startswith(f"{prefix}/") for prefix in self.paths)
+
+    async def _acquire(self) -> bool:
+        # `locked` is also true if others are waiting, so this does not skip the queue.
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return True
+        if self.queued >= self.max_queued:
+            return False
+        self.queued += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            return False
+        finally:
+            self.queued -= 1
+        return True
+
+    @contextlib.asynccontextmanager
+    async def admit(self) -> AsyncIterator[bool]:
+        """Hold a slot for the duration of the context, yields False if none is available."""
+        if not await self._acquire():
+            self.rejected += 1
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._slots.release()
+
+
+class AdmissionControlMiddleware:
+    """Reject requests with a 503 status if their route group is saturated.
+
+    This is a pure ASGI middleware, so the slot is held until the response is fully
+    sent, which matters for streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp, configuration: AdmissionConfiguration) -> None:
+        """Wrap `app` and limit it according to `configuration`."""
+        self.app = app
+        self.retry_after = configuration.retry_after
+        self.limits = [
+            ConcurrencyLimit(name, group) for name, group in configuration.groups.items()
+        ]
+
+    def _limit_for(self, scope: Scope) -> ConcurrencyLimit | None:
+        root_path = scope.get("root_path", "")
+        path = scope["path"].removeprefix(root_path) if root_path else scope["path"]
+        return next((limit for limit in self.limits if limit.matches(path)), None)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle the request with `app` once it is admitted, or reject it."""
+        limit = self._limit_for(scope) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        async with limit.admit() as admitted:
+            if admitted:
+                await self.app(scope, receive, send)
+                return
+
+        logger.warning(
+            "Rejected request, route group {group} is saturated.",
+            group=limit.name,
+            rejected=limit.rejected,
+        )
+        error = ServiceOverloadedError(
+            "The server is handling too many requests, please try again later.",
+        )
+        response = problem_detail_exception_handler(Request(scope), error)
+        response.headers["Retry-After"] = str(self.retry_after)
+        await response(scope, receive, send)
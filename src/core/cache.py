@@ -0,0 +1,227 @@
+"""In-process caches for data that rarely changes, shared by all requests of a worker.
+
+Each cache has a name by which it is configured (see `CacheConfiguration`), reported
+on (`cache_statistics`) and invalidated (`invalidate_caches`). Entries expire after a
+time-to-live, and the least recently used entries are evicted once a cache is full.
+Entries can be stored with tags, e.g., the id of the user they belong to, to invalidate
+all entries with a tag at once. A `None` value records that something does not exist,
+and may have a shorter lifetime.
+Caches are local to a worker process. To clear a cache in every worker, a new generation
+of it is stored in the shared cache (`broadcast_invalidation`), and each worker clears
+its caches whose generation changed when it next checks (`watch_invalidations`).
+"""
+
+import asyncio
+import functools
+import inspect
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any, cast
+
+from loguru import logger
+
+from core.shared_cache import RedisError, shared_cache
+
+if TYPE_CHECKING:
+    from config import CacheConfiguration
+
+_caches: dict[str, TTLCache] = {}
+_MISSING: Any = object()
+
+_GENERATION_PREFIX = "cache-generation:"
+# Generations only need to outlive the interval between checks. When one expires, the
+# workers clear that cache once more, which is harmless.
+_GENERATION_TTL = 24 * 3600
+# The generation of each cache that this worker last saw, or stored itself.
+_generations: dict[str, bytes | None] = {}
+
+
+class TTLCache:
+    """A size-bounded mapping whose entries expire `ttl` seconds after they are stored."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float = 600,
+        max_size: int = 1024,
+        negative_ttl: float | None = None,
+    ) -> None:
+        """Create and register the cache `name`, see `configure_caches` for its settings.
+
+        `None` values expire after `negative_ttl` seconds, by default the same as `ttl`.
+        """
+        if name in _caches:
+            msg = f"A cache named {name!r} already exists."
+            raise ValueError(msg)
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any, tuple[Hashable, ...]]] = (
+            OrderedDict()
+        )
+        self._keys_by_tag: dict[Hashable, set[Hashable]] = {}
+        _caches[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        """Return the live entry for `key`, or `default` if there is none."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, *, tags: Iterable[Hashable] = ()) -> None:  # noqa: ANN401
+        """Store `value` for `key`, unless caching is disabled with a `ttl` of 0.
+
+        The entry is removed along with any of `tags`, see `invalidate_tag`.
+        """
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Remove the entry for `key`, or all entries if no key is given."""
+        if key is _MISSING:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+        else:
+            self._remove(key)
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        """Remove all entries that were stored with `tag`."""
+        for key in list(self._keys_by_tag.get(tag, ())):
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+    def statistics(self) -> dict[str, str | int | float]:
+        """Return the settings, size and hit/miss counters of the cache."""
+        return {
+            "name": self.name,
+            "ttl": self.ttl,
+            "max_size": self.max_size,
+            "negative_ttl": self.negative_ttl,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def cached[**P, T](
+    cache: TTLCache,
+    *,
+    tags: Callable[[T], Iterable[Hashable]] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Cache the results of a database query function in `cache`.
+
+    Results are keyed on the function name and all arguments except the last one,
+    which, as for all functions in `database`, must be the connection. If given, `tags`
+    returns the tags to store a result with, see `TTLCache.invalidate_tag`.
+    """
+
+    def decorator(query: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        signature = inspect.signature(query)
+        *key_parameters, _connection = signature.parameters
+
+        @functools.wraps(query)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key = (query.__name__, *(arguments.arguments[name] for name in key_parameters))
+            if (result := cache.get(key, _MISSING)) is not _MISSING:
+                return cast("T", result)
+            result = await query(*args, **kwargs)
+            cache.set(key, result, tags=tags(result) if tags else ())
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def configure_caches(configurations: dict[str, CacheConfiguration]) -> None:
+    """Apply the settings of each configured cache, and clear all caches."""
+    for cache in _caches.values():
+        if configuration := configurations.get(cache.name):
+            cache.ttl = configuration.ttl
+            cache.max_size = configuration.max_size
+            cache.negative_ttl = (
+                configuration.ttl
+                if configuration.negative_ttl is None
+                else configuration.negative_ttl
+            )
+        cache.invalidate()
+
+
+def cache_statistics() -> list[dict[str, str | int | float]]:
+    """Return the statistics of each cache in this worker."""
+    return [cache.statistics() for cache in _caches.values()]
+
+
+def invalidate_caches(name: str) -> bool:
+    """Clear the cache called `name`, returns False if there is no such cache."""
+    if (cache := _caches.get(name)) is None:
+        return False
+    cache.invalidate()
+    return True
+
+
+async def broadcast_invalidation(name: str) -> None:
+    """Have the other workers clear the cache `name` when they next check for it.
+
+    The cache of this worker is not cleared, see `invalidate_caches`. Raises an `OSError`
+    or `RedisError` if the shared cache is unavailable.
+    """
+    generation = secrets.token_bytes(8)
+    await shared_cache().set(_GENERATION_PREFIX + name, generation, ttl=_GENERATION_TTL)
+    _generations[name] = generation
+
+
+async def apply_invalidations() -> None:
+    """Clear the caches of which another worker stored a new generation since the last call.
+
+    The first call only records the current generations.
+    """
+    backend = shared_cache()
+    for name, cache in _caches.items():
+        generation = await backend.get(_GENERATION_PREFIX + name)
+        if name in _generations and generation != _generations[name]:
+            cache.invalidate()
+        _generations[name] = generation
+
+
+async def watch_invalidations(interval: float) -> None:
+    """Apply the invalidations of other workers every `interval` seconds, until cancelled."""
+    available = True
+    while True:
+        try:
+            await apply_invalidations()
+        except OSError, RedisError:
+            if available:
+                logger.exception("Could not check the shared cache for cache invalidations.")
+            available = False
+        else:
+            available = True
+        await asyncio.sleep(interval)
@@ -0,0 +1,69 @@
+"""Stop handling requests of clients that are no longer waiting for a response."""
+
+import math
+from typing import TYPE_CHECKING
+
+import anyio
+from loguru import logger
+from starlette.types import Message
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Not an official status code, but commonly used to log that the client closed the request.
+CLIENT_CLOSED_REQUEST = 499
+
+
+class CancelOnDisconnectMiddleware:
+    """Cancel handling a request if its client disconnects before the response starts.
+
+    Cancellation propagates to in-flight database statements, which are then killed,
+    and rolls back the transaction of the request. Once the response has started, the
+    request is left to finish, e.g., so that its transaction is committed.
+    This is a pure ASGI middleware, rather than a `call_next` one, as it needs to run
+    the endpoint within its own cancel scope.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap `app`, which handles the requests."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle the request with `app`, while listening for the client to disconnect."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # All messages are received here and forwarded to the app, so that the
+        # disconnect is noticed even if the app is not receiving.
+        forward, messages = anyio.create_memory_object_stream[Message](math.inf)
+        response_started = disconnected = False
+
+        async def send_and_track(message: Message) -> None:
+            nonlocal response_started
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        with forward, messages:
+            async with anyio.create_task_group() as tasks:
+
+                async def cancel_when_disconnected() -> None:
+                    nonlocal disconnected
+                    while True:
+                        message = await receive()
+                        await forward.send(message)
+                        if message["type"] == "http.disconnect":
+                            disconnected = not response_started
+                            if disconnected:
+                                tasks.cancel_scope.cancel()
+                            return
+
+                tasks.start_soon(cancel_when_disconnected)
+                await self.app(scope, messages.receive, send_and_track)
+                tasks.cancel_scope.cancel()
+
+        if disconnected and not response_started:
+            logger.info("Client disconnected, stopped handling the request.")
+            # Nobody will read it, but it lets the middleware around this one finish.
+            await send({"type": "http.response.start", "status": CLIENT_CLOSED_REQUEST})
+            await send({"type": "http.response.body", "body": b""})
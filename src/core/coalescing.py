@@ -0,0 +1,78 @@
+"""Share one in-flight computation among concurrent identical requests.
+
+When many clients request the same entity at once, e.g., right after a benchmark
+suite is announced, only the first request (the leader) computes the response.
+Requests for the same key that arrive while it is in flight wait for, and share,
+its result or exception. Nothing is kept once the computation is done, so this
+never serves stale data; see `core.cache` for that.
+
+Keys must capture everything the result depends on, including who may see it.
+Endpoints therefore check access for each request, and only share what is the same
+for everyone who has access.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, cast
+
+_groups: dict[str, SingleFlight] = {}
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single computation."""
+
+    def __init__(self, name: str) -> None:
+        """Create and register the group `name`, its statistics are reported by that name."""
+        if name in _groups:
+            msg = f"A single flight group named {name!r} already exists."
+            raise ValueError(msg)
+        self.name = name
+        self.computations = 0
+        self.coalesced = 0
+        self._in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+        _groups[name] = self
+
+    async def __call__[T](self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `compute`, or of the in-flight computation for `key`."""
+        while (in_flight := self._in_flight.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                # Shielded, so a waiter that is cancelled does not cancel the leader.
+                return cast("T", await asyncio.shield(in_flight))
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leader was cancelled, e.g., as its client disconnected. Try again.
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.computations += 1
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved, there may be no waiters to do so.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def statistics(self) -> dict[str, str | int]:
+        """Return the number of computations, and of calls that shared one instead."""
+        return {
+            "name": self.name,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def coalescing_statistics() -> list[dict[str, str | int]]:
+    """Return the statistics of all single flight groups."""
+    return [group.statistics() for group in _groups.values()]
@@ -0,0 +1,108 @@
+"""Conditional GET requests: ETag validators and 304 Not Modified responses.
+
+Entity representations are assembled from many tables (tags, status, qualities, ...),
+so there is no single version column or modification time to derive a validator from.
+Instead, the ETag is a hash of the response body, and no Last-Modified header is sent.
+The response is still built from the database before it is compared, so a 304 response
+only saves sending the body to clients polling for changes, not any database work.
+"""
+
+import hashlib
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import Headers, MutableHeaders
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers a 304 response repeats from the 200 response it stands in for, see RFC 9110 15.4.5.
+_NOT_MODIFIED_HEADERS = (
+    "cache-control",
+    "content-location",
+    "date",
+    "etag",
+    "expires",
+    "vary",
+)
+
+
+def entity_tag(body: bytes) -> str:
+    """Return a strong ETag for the response `body`."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def is_not_modified(request_headers: Headers, etag: str) -> bool:
+    """Whether the client's copy, described by its If-None-Match header, is still current.
+
+    If-Modified-Since is ignored, as responses have no Last-Modified time to compare with.
+    """
+    if not (if_none_match := request_headers.get("if-none-match")):
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags
+
+
+class ConditionalRequestMiddleware:
+    """Add an ETag to entity GET responses, and answer 304 if the client's copy is current.
+
+    Only successful GET responses of routes in `cache_control` are handled, by their
+    path template, e.g., `/datasets/{dataset_id}`. Their bodies are buffered to compute
+    the ETag, so do not include routes with large (streamed) responses.
+    """
+
+    def __init__(self, app: ASGIApp, cache_control: dict[str, str]) -> None:
+        """Wrap `app`, `cache_control` is the Cache-Control header value by path template."""
+        self.app = app
+        self.cache_control = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle the request with `app`, validating its response where applicable."""
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        body = bytearray()
+
+        async def validate_response(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # The router has set the route on the (shared) scope by now.
+                route = getattr(scope.get("route"), "path", None)
+                if message["status"] == HTTPStatus.OK and route in self.cache_control:
+                    start = message
+                    MutableHeaders(scope=start)["Cache-Control"] = self.cache_control[route]
+                    return
+            elif start is not None and message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await self._send_validated(scope, start, bytes(body), send)
+                return
+            await send(message)
+
+        await self.app(scope, receive, validate_response)
+
+    async def _send_validated(self, scope: Scope, start: Message, body: bytes, send: Send) -> None:
+        etag = entity_tag(body)
+        MutableHeaders(scope=start)["ETag"] = etag
+
+        if is_not_modified(Headers(scope=scope), etag):
+            not_modified = [
+                (name, value)
+                for name, value in start["headers"]
+                if name.decode("latin-1").lower() in _NOT_MODIFIED_HEADERS
+            ]
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": HTTPStatus.NOT_MODIFIED,
+                    "headers": not_modified,
+                },
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
@@ -64,6 +64,20 @@ class ProblemDetailError(Exception):
             return self._code_override
         return self._default_code
 
+    def content(self) -> dict[str, str | int]:
+        """Return the RFC 9457 compliant body of the response for this error."""
+        content: dict[str, str | int] = {
+            "type": self.uri,
+            "title": self.title,
+            "status": int(self.status_code),
+            "detail": self.detail,
+        }
+        if self.code is not None:
+            content["code"] = str(self.code)
+        if self.instance is not None:
+            content["instance"] = self.instance
+        return content
+
 
 def problem_detail_exception_handler(
     request: Request,  # noqa: ARG001
@@ -75,20 +89,9 @@ def problem_detail_exception_handler(
     - Content-Type: application/problem+json
     - RFC 9457 compliant JSON body
     """
-    content: dict[str, str | int] = {
-        "type": exc.uri,
-        "title": exc.title,
-        "status": int(exc.status_code),
-        "detail": exc.detail,
-    }
-    if exc.code is not None:
-        content["code"] = str(exc.code)
-    if exc.instance is not None:
-        content["instance"] = exc.instance
-
     return JSONResponse(
         status_code=int(exc.status_code),
-        content=content,
+        content=exc.content(),
         media_type="application/problem+json",
     )
 
@@ -418,6 +421,46 @@ class ServiceNotFoundError(ProblemDetailError):
     _default_status_code = HTTPStatus.NOT_FOUND
 
 
+class ServiceNotReadyError(ProblemDetailError):
+    """Raised when the service cannot handle requests yet, e.g., databases are unreachable."""
+
+    uri = "https://openml.org/problems/service-not-ready"
+    title = "Service Not Ready"
+    _default_status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+
+class CacheNotFoundError(ProblemDetailError):
+    """Raised when a cache with the given name does not exist."""
+
+    uri = "https://openml.org/problems/cache-not-found"
+    title = "Cache Not Found"
+    _default_status_code = HTTPStatus.NOT_FOUND
+
+
+class CacheInvalidationError(ProblemDetailError):
+    """Raised when a cache could not be cleared in all workers, as the shared cache failed."""
+
+    uri = "https://openml.org/problems/cache-invalidation-failed"
+    title = "Cache Invalidation Failed"
+    _default_status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+
+class QueryTimeoutError(ProblemDetailError):
+    """Raised when a database query exceeded the execution time budget of its route."""
+
+    uri = "https://openml.org/problems/query-timeout"
+    title = "Query Timeout"
+    _default_status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+
+class ServiceOverloadedError(ProblemDetailError):
+    """Raised when too many requests are being handled to accept another one."""
+
+    uri = "https://openml.org/problems/service-overloaded"
+    title = "Service Overloaded"
+    _default_status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+
 # =============================================================================
 # Quality Errors
 # =============================================================================
@@ -0,0 +1,137 @@
+"""Serve responses of entity GET endpoints from the shared cache.
+
+Responses are stored in the shared cache with the tags of their route, e.g., the
+response of `/datasets/61` with tag `dataset:61`. Endpoints that change an entity
+invalidate its tag through `core.shared_cache.invalidate`, so all workers build the
+response anew on the next request. Until then, any worker can serve it without
+touching the database.
+"""
+
+import json
+from collections.abc import Iterator, Sequence
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs
+
+from loguru import logger
+from starlette.routing import BaseRoute, Match
+
+from core.shared_cache import RedisError, shared_cache
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from config import ResponseCacheConfiguration
+
+
+def encode_response(start: Message, body: bytes) -> bytes:
+    """Serialize the response, consisting of its start message and `body`, for the cache."""
+    headers = [
+        [name.decode("latin-1"), value.decode("latin-1")] for name, value in start["headers"]
+    ]
+    head = json.dumps({"status": start["status"], "headers": headers})
+    return head.encode() + b"\n" + body
+
+
+def decode_response(value: bytes) -> tuple[Message, bytes]:
+    """Restore the start message and body of a response serialized by `encode_response`."""
+    head, _, body = value.partition(b"\n")
+    response = json.loads(head)
+    start = {
+        "type": "http.response.start",
+        "status": response["status"],
+        "headers": [
+            (name.encode("latin-1"), value.encode("latin-1")) for name, value in response["headers"]
+        ],
+    }
+    return start, body
+
+
+def _routes(routes: Sequence[BaseRoute]) -> Iterator[BaseRoute]:
+    """Yield the routes in the order the router tries them, including those of included routers."""
+    for route in routes:
+        # Recent FastAPI versions keep the routes of an included router in a wrapper route.
+        if (included := getattr(route, "original_router", None)) is not None:
+            yield from _routes(included.routes)
+        else:
+            yield route
+
+
+class ResponseCacheMiddleware:
+    """Answer GET requests of the routes in `configuration` from the shared cache.
+
+    Only successful responses of requests without an API key are cached. If the cache
+    is unavailable, requests are handled as if nothing was cached.
+    """
+
+    def __init__(self, app: ASGIApp, configuration: ResponseCacheConfiguration) -> None:
+        """Wrap `app`, caching the responses of the routes in `configuration`."""
+        self.app = app
+        self.configuration = configuration
+
+    def _match(self, scope: Scope) -> tuple[str, dict[str, Any]] | None:
+        """Return the path template and route scope of the cached route `scope` is for."""
+        for route in _routes(scope["app"].routes):
+            match, child_scope = route.matches(scope)
+            if match != Match.FULL:
+                continue
+            # Like the router, the first route to match handles the request, e.g.,
+            # `/datasets/list` rather than `/datasets/{dataset_id}`.
+            path = getattr(route, "path", None)
+            if path not in self.configuration.routes:
+                return None
+            return path, child_scope
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request from the cache, or handle it with `app` and cache the response."""
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not self.configuration.routes
+            or "api_key" in parse_qs(scope["query_string"].decode("latin-1"))
+            or (matched := self._match(scope)) is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        path, child_scope = matched
+        key = f"response:{scope['path']}?{scope['query_string'].decode('latin-1')}"
+        try:
+            cached = await shared_cache().get(key)
+        except OSError, RedisError:
+            logger.exception("Shared cache unavailable, not caching the response.")
+            await self.app(scope, receive, send)
+            return
+
+        if cached is not None:
+            # The middlewares in front expect the scope the router would have set up.
+            scope.update(child_scope)
+            cached_start, cached_body = decode_response(cached)
+            await send(cached_start)
+            await send({"type": "http.response.body", "body": cached_body})
+            return
+
+        tags = [tag.format(**child_scope["path_params"]) for tag in self.configuration.routes[path]]
+        start: Message | None = None
+        body = bytearray()
+
+        async def send_and_store(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start" and message["status"] == HTTPStatus.OK:
+                # Copied, as the middlewares in front may add headers to the message.
+                start = {**message, "headers": list(message["headers"])}
+            elif start is not None and message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+            await send(message)
+            is_last = message["type"] == "http.response.body" and not message.get("more_body")
+            if start is not None and is_last:
+                await self._store(key, encode_response(start, bytes(body)), tags)
+
+        await self.app(scope, receive, send_and_store)
+
+    async def _store(self, key: str, value: bytes, tags: list[str]) -> None:
+        try:
+            await shared_cache().set(key, value, ttl=self.configuration.ttl, tags=tags)
+        except OSError, RedisError:
+            logger.exception("Shared cache unavailable, could not cache the response.")
@@ -0,0 +1,276 @@
+"""A cache shared by all workers, with invalidation by tag.
+
+Entries are stored with tags naming the entities they contain, e.g., `dataset:61`.
+Write endpoints invalidate the tags of the entities they change, which removes the
+entries of every worker at once, see `invalidate`. Two backends are available:
+
+ - `MemoryCacheBackend`: local to the worker, for single-worker deployments and tests.
+ - `RedisCacheBackend`: any server that speaks the Redis protocol (RESP), e.g., Redis
+   or Valkey. For each tag a set of the keys stored with it is kept, so that
+   invalidating a tag deletes exactly those keys. Requires Redis 7.0 or later (or
+   Valkey), for the `GT` and `NX` options of `PEXPIRE`.
+
+A server that does not reply within the configured timeout raises a `TimeoutError`,
+which is an `OSError`, so callers serve the request without the cache in either case.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator, Iterable
+from typing import Protocol
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from config import SharedCacheConfiguration, get_config
+
+_TAG_PREFIX = "tag:"
+
+
+class CacheBackend(Protocol):
+    """Storage for the shared cache, values are opaque bytes."""
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the value stored for `key`, if it has not expired or been invalidated."""
+        ...
+
+    async def set(self, key: str, value: bytes, *, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Store `value` for `key` for `ttl` seconds, invalidated along with any of `tags`."""
+        ...
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Remove all entries stored with any of `tags`."""
+        ...
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        ...
+
+    async def close(self) -> None:
+        """Release the resources of the backend, such as connections."""
+        ...
+
+
+class MemoryCacheBackend:
+    """Cache backend that keeps entries in the memory of the worker."""
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._entries: dict[str, tuple[float, bytes]] = {}
+        self._keys_by_tag: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the value stored for `key`, if it has not expired or been invalidated."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, *, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Store `value` for `key` for `ttl` seconds, invalidated along with any of `tags`."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Remove all entries stored with any of `tags`."""
+        for tag in tags:
+            for key in self._keys_by_tag.pop(tag, set()):
+                self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    async def close(self) -> None:
+        """Remove all entries, nothing else is held."""
+        await self.clear()
+
+
+class RedisError(Exception):
+    """Raised when the server replies with an error."""
+
+
+type _Reply = bytes | int | list[_Reply] | None
+
+
+class _RedisConnection:
+    """A connection that sends commands and reads replies in RESP2, one at a time."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        timeout: float,
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._timeout = timeout
+
+    async def execute(self, *command: str | bytes) -> _Reply:
+        encoded = [part.encode() if isinstance(part, str) else part for part in command]
+        message = [f"*{len(encoded)}\r\n".encode()]
+        for part in encoded:
+            message += [f"${len(part)}\r\n".encode(), part, b"\r\n"]
+        async with asyncio.timeout(self._timeout):
+            self._writer.write(b"".join(message))
+            await self._writer.drain()
+            return await self._read_reply()
+
+    async def _read_reply(self) -> _Reply:
+        line = await self._reader.readuntil(b"\r\n")
+        kind, content = line[:1], line[1:-2]
+        match kind:
+            case b"+":
+                return content
+            case b"-":
+                raise RedisError(content.decode())
+            case b":":
+                return int(content)
+            case b"$":
+                if (length := int(content)) < 0:
+                    return None
+                return (await self._reader.readexactly(length + 2))[:-2]
+            case b"*":
+                if (length := int(content)) < 0:
+                    return None
+                return [await self._read_reply() for _ in range(length)]
+        msg = f"Unexpected reply from server: {line!r}"
+        raise RedisError(msg)
+
+    async def close(self) -> None:
+        self._writer.close()
+        with contextlib.suppress(OSError):
+            await self._writer.wait_closed()
+
+
+class RedisCacheBackend:
+    """Cache backend on a server that speaks the Redis protocol, shared by all workers.
+
+    `url` has the form `redis://[:password@]host[:port][/database]`. Connections are
+    opened as needed and reused, at most `max_connections` at a time. Connecting and
+    each command may take at most `timeout` seconds, a connection that timed out is
+    closed rather than reused.
+    """
+
+    def __init__(self, url: str, *, max_connections: int = 10, timeout: float = 0.5) -> None:
+        """Prepare to connect to the server at `url`, without doing so yet."""
+        parts = urlsplit(url)
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port or 6379
+        self._password = parts.password
+        self._database = parts.path.strip("/") or "0"
+        self._idle: list[_RedisConnection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self._timeout = timeout
+
+    async def _connect(self) -> _RedisConnection:
+        async with asyncio.timeout(self._timeout):
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+        connection = _RedisConnection(reader, writer, timeout=self._timeout)
+        try:
+            if self._password:
+                await connection.execute("AUTH", self._password)
+            if self._database != "0":
+                await connection.execute("SELECT", self._database)
+        except BaseException:
+            await connection.close()
+            raise
+        return connection
+
+    @contextlib.asynccontextmanager
+    async def _connection(self) -> AsyncIterator[_RedisConnection]:
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else await self._connect()
+            try:
+                yield connection
+            except BaseException:
+                # The reply may not have been read, so the connection can not be reused.
+                await connection.close()
+                raise
+            self._idle.append(connection)
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the value stored for `key`, if it has not expired or been invalidated."""
+        async with self._connection() as connection:
+            value = await connection.execute("GET", key)
+        return value if isinstance(value, bytes) else None
+
+    async def set(self, key: str, value: bytes, *, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Store `value` for `key` for `ttl` seconds, invalidated along with any of `tags`."""
+        milliseconds = str(max(1, round(ttl * 1000)))
+        async with self._connection() as connection:
+            await connection.execute("SET", key, value, "PX", milliseconds)
+            for tag in tags:
+                await connection.execute("SADD", f"{_TAG_PREFIX}{tag}", key)
+                # The key set only needs to outlive the keys added to it.
+                await connection.execute("PEXPIRE", f"{_TAG_PREFIX}{tag}", milliseconds, "GT")
+                await connection.execute("PEXPIRE", f"{_TAG_PREFIX}{tag}", milliseconds, "NX")
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Remove all entries stored with any of `tags`."""
+        async with self._connection() as connection:
+            for tag in tags:
+                keys = await connection.execute("SMEMBERS", f"{_TAG_PREFIX}{tag}")
+                await connection.execute("DEL", f"{_TAG_PREFIX}{tag}", *(keys or []))  # type: ignore[misc]
+
+    async def clear(self) -> None:
+        """Remove all entries, along with anything else in the database."""
+        async with self._connection() as connection:
+            await connection.execute("FLUSHDB")
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        while self._idle:
+            await self._idle.pop().close()
+
+
+_backend: CacheBackend | None = None
+
+
+def create_backend(configuration: SharedCacheConfiguration) -> CacheBackend:
+    """Create the backend described by `configuration`."""
+    if configuration.backend == "redis":
+        return RedisCacheBackend(
+            configuration.url,
+            max_connections=configuration.max_connections,
+            timeout=configuration.timeout,
+        )
+    return MemoryCacheBackend()
+
+
+def shared_cache() -> CacheBackend:
+    """Return the shared cache backend of this worker, see the `shared_cache` configuration."""
+    global _backend  # noqa: PLW0603
+    if _backend is None:
+        _backend = create_backend(get_config().shared_cache)
+    return _backend
+
+
+async def close_shared_cache() -> None:
+    """Close the backend, a new one is created if the cache is used again."""
+    global _backend  # noqa: PLW0603
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+async def invalidate(*tags: str) -> None:
+    """Remove the cache entries of all workers that are tagged with any of `tags`.
+
+    Call this from endpoints that change the entities named by `tags`, once the change
+    is committed (see `database.connection.after_commit`). Otherwise, a concurrent
+    request may cache the state from before the change again. Failures are logged
+    rather than raised, entries then expire after their time-to-live instead.
+    """
+    try:
+        await shared_cache().invalidate_tags(tags)
+    except OSError, RedisError:
+        logger.exception("Could not invalidate cache tags {tags}.", tags=tags)
@@ -0,0 +1,34 @@
+"""Serialize responses incrementally, so large results need not be held in memory."""
+
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def json_object_with_array(
+    fields: dict[str, Any],
+    array_field: str,
+    items: AsyncIterable[BaseModel],
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Serialize `{**fields, array_field: [*items]}` as JSON, reading `items` lazily.
+
+    Serialized items are buffered into chunks of about `chunk_size` bytes, so that the
+    response is not sent in a separate message per item.
+    """
+    head = json.dumps({**fields, array_field: []}, separators=(",", ":")).encode()
+    buffer = bytearray(head.removesuffix(b"]}"))
+    separator = b""
+    async for item in items:
+        buffer += separator + item.model_dump_json().encode()
+        separator = b","
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]}"
+    yield bytes(buffer)
@@ -0,0 +1,57 @@
+"""Database maintenance commands, run from `src`: `python -m database --help`."""
+
+import argparse
+import asyncio
+
+from loguru import logger
+
+import database.datasets
+import database.qualities
+from database.setup import close_databases, expdb_database
+
+
+async def _repair_status() -> None:
+    try:
+        async with expdb_database().begin() as connection:
+            await database.datasets.create_current_status_table(connection)
+            datasets = await database.datasets.repair_current_status(connection)
+        logger.info("Rebuilt the current status of {n} datasets.", n=datasets)
+    finally:
+        await close_databases()
+
+
+async def _repair_qualities() -> None:
+    try:
+        async with expdb_database().begin() as connection:
+            await database.qualities.create_summary_table(connection)
+            datasets = await database.qualities.repair_summary(connection)
+        logger.info("Rebuilt the quality summary of {n} datasets.", n=datasets)
+    finally:
+        await close_databases()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    _ = commands.add_parser(
+        "repair-status",
+        help="Create or rebuild `dataset_current_status` and its triggers from `dataset_status`.",
+    )
+    _ = commands.add_parser(
+        "repair-qualities",
+        help="Create or rebuild `dataset_quality_summary` and its triggers from `data_quality`.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the database maintenance command given on the command line."""
+    args = _parse_args()
+    if args.command == "repair-status":
+        asyncio.run(_repair_status())
+    elif args.command == "repair-qualities":
+        asyncio.run(_repair_qualities())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Caches for query results, see `core.cache` and the `caches` configuration section."""
+
+from core.cache import TTLCache
+
+# Task types, estimation procedures and evaluation measures change about once a year.
+reference_data = TTLCache("reference_data", ttl=3600, max_size=256)
+
+# Users by API key, with their groups. Invalid keys are remembered for a shorter time.
+# Groups are changed outside this service, so a user gains or loses administrator rights
+# up to `ttl` seconds after the change. Deleted users are forgotten by all workers.
+api_keys = TTLCache("api_keys", ttl=30, max_size=10_000, negative_ttl=5)
+
+# Names of the qualities stored for at least one dataset, see `list_all_qualities`.
+# Qualities added to or removed from `data_quality` are listed after at most `ttl`.
+quality_names = TTLCache("quality_names", ttl=300, max_size=1)
+
+# Parsed input and output templates of task types, see `routers.openml.tasks.TaskTemplate`.
+task_templates = TTLCache("task_templates", ttl=3600, max_size=64)
+
+# Parameters and components of flows, which do not change after upload.
+flows = TTLCache("flows", ttl=3600, max_size=30_000, negative_ttl=0)
+# Flows themselves. Flows can be deleted through the PHP API, which does not invalidate
+# this cache, so a deleted flow (and thereby its cached parts) is served for up to `ttl`.
+# Their tags do change, and are not cached. A flow that is not found may be uploaded later.
+flow_rows = TTLCache("flow_rows", ttl=60, max_size=30_000, negative_ttl=0)
+
+# The largest id of each kind of entity, see `database.existence`.
+max_ids = TTLCache("max_ids", ttl=10, max_size=16)
+
+# Whether the tables this service adds to the database are set up, see `python -m database`.
+schema = TTLCache("schema", ttl=60, max_size=16)
@@ -0,0 +1,168 @@
+"""Database connections which are only checked out of the pool once they are needed."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+import anyio
+
+from database.deadlines import kill_query_on_cancel
+from database.setup import connect, has_idle_connection, is_autocommit
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import CursorResult
+    from sqlalchemy.engine.interfaces import _CoreAnyExecuteParams
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncResult
+    from sqlalchemy.sql.base import Executable
+
+
+class LazyConnection:
+    """Stand-in for an `AsyncConnection` that checks out a connection on first use.
+
+    Requests which never reach the database, e.g., because input validation failed or
+    no API key was provided, then never wait on (or occupy) a pooled connection.
+    Once checked out, the connection stays in a transaction until the `LazyConnection`
+    is closed, at which point it is committed, or rolled back if an exception occurred.
+    Connections of an autocommit (read) engine do not start a transaction at all.
+    """
+
+    def __init__(self, engine: AsyncEngine, *, max_parallel_queries: int = 1) -> None:
+        """Prepare to check out a connection from `engine`, without doing so yet.
+
+        `max_parallel_queries` bounds the number of additional connections a
+        `QueryFanOut` may borrow from `engine` on behalf of this connection.
+        """
+        self.engine = engine
+        self.max_parallel_queries = max_parallel_queries
+        self.parallel_queries = asyncio.Semaphore(max_parallel_queries)
+        self._connection: AsyncConnection | None = None
+        self._resources = contextlib.AsyncExitStack()
+        # Endpoints may `asyncio.gather` queries, make sure only one checks out a connection.
+        self._checkout_lock = asyncio.Lock()
+        self._on_commit: list[Callable[[], Awaitable[None]]] = []
+
+    def on_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Await `callback` once the transaction is committed, not if it is rolled back."""
+        self._on_commit.append(callback)
+
+    @property
+    def checked_out(self) -> bool:
+        """Whether a connection has been checked out of the pool."""
+        return self._connection is not None
+
+    async def _get_connection(self) -> AsyncConnection:
+        async with self._checkout_lock:
+            if self._connection is None:
+                connection = await self._resources.enter_async_context(connect(self.engine))
+                if not is_autocommit(self.engine):
+                    await self._resources.enter_async_context(connection.begin())
+                self._connection = connection
+        return self._connection
+
+    async def execute(
+        self,
+        statement: Executable,
+        parameters: _CoreAnyExecuteParams | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> CursorResult[Any]:
+        """Execute the statement, see `AsyncConnection.execute`."""
+        connection = await self._get_connection()
+        with kill_query_on_cancel(connection):
+            return await connection.execute(statement, parameters, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self,
+        statement: Executable,
+        parameters: _CoreAnyExecuteParams | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> AsyncIterator[AsyncResult[Any]]:
+        """Execute the statement with a server-side cursor, see `AsyncConnection.stream`.
+
+        Only the `async with connection.stream(...) as result:` form is supported.
+        """
+        connection = await self._get_connection()
+        with kill_query_on_cancel(connection):
+            async with connection.stream(statement, parameters, **kwargs) as result:
+                yield result
+
+    async def __aenter__(self) -> Self:
+        """Return the lazy connection itself, nothing is checked out yet."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """End the transaction and return the connection to the pool, if one was used.
+
+        This is shielded from cancellation, e.g., by `CancelOnDisconnectMiddleware`, which
+        would otherwise also cancel the rollback and leave the connection checked out.
+        """
+        callbacks, self._on_commit = self._on_commit, []
+        with anyio.CancelScope(shield=True):
+            await self._resources.__aexit__(exc_type, exc_value, traceback)
+        self._connection = None
+        if exc_type is None:
+            for callback in callbacks:
+                await callback()
+
+
+async def after_commit(
+    connection: AsyncConnection,
+    callback: Callable[[], Awaitable[None]],
+) -> None:
+    """Await `callback` once the changes made through `connection` are committed.
+
+    Use this to invalidate cached copies of what changed, so that no concurrent request
+    caches the state from before the commit again. A connection other than a
+    `LazyConnection` (e.g., the one shared with the test suite) is not committed by the
+    request, so `callback` is awaited right away.
+    """
+    if isinstance(connection, LazyConnection):
+        connection.on_commit(callback)
+    else:
+        await callback()
+
+
+class QueryFanOut:
+    """Run independent read queries in parallel, each on its own pooled connection.
+
+    A single connection executes one statement at a time, so gathering queries on the
+    same connection does not make them run concurrently. When the request connection
+    is a `LazyConnection`, each query wrapped by a `QueryFanOut` instead borrows a
+    connection from the same engine, with at most `max_parallel_queries` borrowed at once.
+    Only idle connections are borrowed: a query for which none is idle runs on the request
+    connection instead, as waiting for one could starve the pool when every connection is
+    held by a request that waits to borrow another. Any other connection (e.g., the one
+    shared with the test suite) runs all queries itself.
+
+    Borrowed connections do not see uncommitted changes of the request connection,
+    so only use this for reads:
+
+        fan_out = QueryFanOut(expdb)
+        tags, status = await asyncio.gather(
+            fan_out(lambda connection: database.datasets.get_tags_for(id_, connection)),
+            fan_out(lambda connection: database.datasets.get_status(id_, connection)),
+        )
+    """
+
+    def __init__(self, connection: AsyncConnection) -> None:
+        """Fan out queries for the request that uses `connection`."""
+        self._connection = connection
+
+    async def __call__[T](self, query: Callable[[AsyncConnection], Awaitable[T]]) -> T:
+        """Await `query` with a connection it may use exclusively, if possible."""
+        lazy = self._connection
+        if not isinstance(lazy, LazyConnection) or lazy.max_parallel_queries == 1:
+            return await query(self._connection)
+        async with lazy.parallel_queries:
+            if has_idle_connection(lazy.engine):
+                async with connect(lazy.engine) as connection:
+                    with kill_query_on_cancel(connection):
+                        return await query(connection)
+        return await query(self._connection)
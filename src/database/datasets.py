@@ -4,9 +4,12 @@ import datetime
 from collections import defaultdict
 from typing import TYPE_CHECKING, Literal
 
-from sqlalchemy import text
+from loguru import logger
+from sqlalchemy import bindparam, text
 from sqlalchemy.exc import IntegrityError
 
+from core.cache import cached
+from database.caches import schema
 from database.exceptions import (
     _DUPLICATE_ENTRY,
     _FOREIGN_KEY_CONSTRAINT_FAILED,
@@ -17,38 +20,89 @@ from routers.types import Identifier, TagString
 from schemas.datasets.openml import DatasetStatus, Feature
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from sqlalchemy.engine import Row
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
-async def get(id_: Identifier, connection: AsyncConnection) -> Row | None:
-    row = await connection.execute(
-        text(
-            """
+_GET_QUERY = text(
+    """
     SELECT *
     FROM dataset
     WHERE did = :dataset_id
     """,
-        ),
+)
+
+
+async def get(id_: Identifier, connection: AsyncConnection) -> Row | None:
+    row = await connection.execute(
+        _GET_QUERY,
         parameters={"dataset_id": id_},
     )
     return row.one_or_none()
 
 
-async def get_file(*, file_id: Identifier, connection: AsyncConnection) -> Row | None:
-    row = await connection.execute(
-        text(
-            """
+_GET_MANY_QUERY = text(
+    """
+    SELECT *
+    FROM dataset
+    WHERE did IN :dataset_ids
+    """,
+).bindparams(bindparam("dataset_ids", expanding=True))
+
+
+async def get_many(ids: Sequence[Identifier], connection: AsyncConnection) -> dict[int, Row]:
+    """Return the datasets that exist by id, see `get`."""
+    rows = await connection.execute(_GET_MANY_QUERY, parameters={"dataset_ids": ids})
+    return {row.did: row for row in rows.all()}
+
+
+_GET_FILE_QUERY = text(
+    """
     SELECT *
     FROM file
     WHERE id = :file_id
     """,
-        ),
+)
+
+
+async def get_file(*, file_id: Identifier, connection: AsyncConnection) -> Row | None:
+    row = await connection.execute(
+        _GET_FILE_QUERY,
         parameters={"file_id": file_id},
     )
     return row.one_or_none()
 
 
+_GET_FILES_QUERY = text(
+    """
+    SELECT *
+    FROM file
+    WHERE id IN :file_ids
+    """,
+).bindparams(bindparam("file_ids", expanding=True))
+
+
+async def get_files(
+    *,
+    file_ids: Sequence[Identifier],
+    connection: AsyncConnection,
+) -> dict[int, Row]:
+    """Return the files that exist by id, see `get_file`."""
+    rows = await connection.execute(_GET_FILES_QUERY, parameters={"file_ids": file_ids})
+    return {row.id: row for row in rows.all()}
+
+
+_GET_TAG_QUERY = text(
+    """
+    SELECT *
+    FROM dataset_tag
+    WHERE id = :dataset_id AND tag = :tag
+    """,
+)
+
+
 async def get_tag(
     dataset_id: Identifier,
     tag: TagString,
@@ -56,54 +110,78 @@ async def get_tag(
 ) -> Row | None:
     return (
         await connection.execute(
-            text(
-                """
-    SELECT *
-    FROM dataset_tag
-    WHERE id = :dataset_id AND tag = :tag
-    """,
-            ),
+            _GET_TAG_QUERY,
             parameters={"dataset_id": dataset_id, "tag": tag},
         )
     ).first()
 
 
-async def delete_tag(dataset_id: Identifier, tag: TagString, connection: AsyncConnection) -> None:
-    await connection.execute(
-        text(
-            """
+_DELETE_TAG_QUERY = text(
+    """
     DELETE FROM dataset_tag
     WHERE id = :dataset_id AND tag = :tag
     """,
-        ),
+)
+
+
+async def delete_tag(dataset_id: Identifier, tag: TagString, connection: AsyncConnection) -> None:
+    await connection.execute(
+        _DELETE_TAG_QUERY,
         parameters={"dataset_id": dataset_id, "tag": tag},
     )
 
 
-async def get_tags_for(id_: Identifier, connection: AsyncConnection) -> list[str]:
-    row = await connection.execute(
-        text(
-            """
+_GET_TAGS_FOR_QUERY = text(
+    """
     SELECT *
     FROM dataset_tag
     WHERE id = :dataset_id
     """,
-        ),
+)
+
+
+async def get_tags_for(id_: Identifier, connection: AsyncConnection) -> list[str]:
+    row = await connection.execute(
+        _GET_TAGS_FOR_QUERY,
         parameters={"dataset_id": id_},
     )
     rows = row.all()
     return [row.tag for row in rows]
 
 
+_GET_TAGS_FOR_MANY_QUERY = text(
+    """
+    SELECT `id`, `tag`
+    FROM dataset_tag
+    WHERE id IN :dataset_ids
+    """,
+).bindparams(bindparam("dataset_ids", expanding=True))
+
+
+async def get_tags_for_many(
+    ids: Sequence[Identifier],
+    connection: AsyncConnection,
+) -> dict[int, list[str]]:
+    """Return the tags of each of the datasets, datasets without tags are omitted."""
+    rows = await connection.execute(_GET_TAGS_FOR_MANY_QUERY, parameters={"dataset_ids": ids})
+    tags: dict[int, list[str]] = {}
+    for row in rows.all():
+        tags.setdefault(row.id, []).append(row.tag)
+    return tags
+
+
+_TAG_QUERY = text(
+    """
+    INSERT INTO dataset_tag(`id`, `tag`, `uploader`)
+    VALUES (:dataset_id, :tag, :user_id)
+    """,
+)
+
+
 async def tag(id_: int, tag_: str, *, user_id: int, connection: AsyncConnection) -> None:
     try:
         await connection.execute(
-            text(
-                """
-        INSERT INTO dataset_tag(`id`, `tag`, `uploader`)
-        VALUES (:dataset_id, :tag, :user_id)
-        """,
-            ),
+            _TAG_QUERY,
             parameters={
                 "dataset_id": id_,
                 "user_id": user_id,
@@ -119,90 +197,250 @@ async def tag(id_: int, tag_: str, *, user_id: int, connection: AsyncConnection)
         raise
 
 
+_GET_DESCRIPTION_QUERY = text(
+    """
+    SELECT *
+    FROM dataset_description
+    WHERE did = :dataset_id
+    ORDER BY version DESC
+    """,
+)
+
+
 async def get_description(
     id_: Identifier,
     connection: AsyncConnection,
 ) -> Row | None:
     """Get the most recent description for the dataset."""
     row = await connection.execute(
-        text(
-            """
-    SELECT *
-    FROM dataset_description
-    WHERE did = :dataset_id
-    ORDER BY version DESC
-    """,
-        ),
+        _GET_DESCRIPTION_QUERY,
         parameters={"dataset_id": id_},
     )
     return row.first()
 
 
-async def get_status(id_: Identifier, connection: AsyncConnection) -> DatasetStatus:
-    """Get most recent status for the dataset."""
-    row = (
-        await connection.execute(
-            text(
-                """
+_GET_DESCRIPTIONS_QUERY = text(
+    """
+    SELECT *
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY did ORDER BY version DESC) AS `recency`
+        FROM dataset_description
+        WHERE did IN :dataset_ids
+    ) AS descriptions
+    WHERE `recency` = 1
+    """,
+).bindparams(bindparam("dataset_ids", expanding=True))
+
+
+async def get_descriptions(
+    ids: Sequence[Identifier],
+    connection: AsyncConnection,
+) -> dict[int, Row]:
+    """Get the most recent description for each of the datasets that has one."""
+    rows = await connection.execute(_GET_DESCRIPTIONS_QUERY, parameters={"dataset_ids": ids})
+    return {row.did: row for row in rows.all()}
+
+
+_CURRENT_STATUS_TRIGGERS = (
+    "dataset_current_status_insert",
+    "dataset_current_status_update",
+    "dataset_current_status_delete",
+)
+_COUNT_CURRENT_STATUS_TRIGGERS_QUERY = text(
+    """
+    SELECT COUNT(*)
+    FROM information_schema.TRIGGERS
+    WHERE `TRIGGER_SCHEMA` = DATABASE() AND `TRIGGER_NAME` IN :triggers
+    """,
+).bindparams(bindparam("triggers", expanding=True))
+
+
+@cached(schema)
+async def has_current_status_table(connection: AsyncConnection) -> bool:
+    """Whether `dataset_current_status` exists and is maintained by its triggers.
+
+    Until `python -m database repair-status` created them, the latest status is found
+    from `dataset_status` instead, which is slower for lists of datasets.
+    """
+    result = await connection.execute(
+        _COUNT_CURRENT_STATUS_TRIGGERS_QUERY,
+        parameters={"triggers": _CURRENT_STATUS_TRIGGERS},
+    )
+    if result.scalar_one() == len(_CURRENT_STATUS_TRIGGERS):
+        return True
+    logger.warning(
+        "`dataset_current_status` is not set up, run `python -m database repair-status`.",
+    )
+    return False
+
+
+# The latest status of each dataset as found from `dataset_status` directly.
+_LATEST_STATUS_SUBQUERY = """
+    SELECT ds1.`did`, ds1.`status`
+    FROM dataset_status AS ds1
+    WHERE ds1.`status_date`=(
+        SELECT MAX(ds2.`status_date`)
+        FROM dataset_status AS ds2
+        WHERE ds1.`did`=ds2.`did`
+    )
+"""
+
+
+async def current_status_table(connection: AsyncConnection) -> str:
+    """Return a table expression with the `status` by `did` of datasets with a status.
+
+    This is `dataset_current_status`, or a subquery on `dataset_status` if that table
+    is not set up, see `has_current_status_table`.
+    """
+    if await has_current_status_table(connection):
+        return "dataset_current_status"
+    return f"({_LATEST_STATUS_SUBQUERY})"
+
+
+_GET_STATUS_QUERY = text(
+    """
+    SELECT status
+    FROM dataset_current_status
+    WHERE did = :dataset_id
+    """,
+)
+_GET_LATEST_STATUS_QUERY = text(
+    """
     SELECT status
     FROM dataset_status
     WHERE did = :dataset_id
     ORDER BY status_date DESC
     LIMIT 1
     """,
-            ),
+)
+
+
+async def get_status(id_: Identifier, connection: AsyncConnection) -> DatasetStatus:
+    """Get most recent status for the dataset, see `repair_current_status`."""
+    query = (
+        _GET_STATUS_QUERY
+        if await has_current_status_table(connection)
+        else _GET_LATEST_STATUS_QUERY
+    )
+    row = (
+        await connection.execute(
+            query,
             parameters={"dataset_id": id_},
         )
     ).first()
     return DatasetStatus(row.status) if row else DatasetStatus.IN_PREPARATION
 
 
-async def get_latest_processing_update(
-    dataset_id: Identifier,
+_GET_STATUSES_QUERY = text(
+    """
+    SELECT did, status
+    FROM dataset_current_status
+    WHERE did IN :dataset_ids
+    """,
+).bindparams(bindparam("dataset_ids", expanding=True))
+_GET_LATEST_STATUSES_QUERY = text(
+    f"""
+    {_LATEST_STATUS_SUBQUERY}
+    AND ds1.`did` IN :dataset_ids
+    """,
+).bindparams(bindparam("dataset_ids", expanding=True))
+
+
+async def get_statuses(
+    ids: Sequence[Identifier],
     connection: AsyncConnection,
-) -> Row | None:
-    row = await connection.execute(
-        text(
-            """
+) -> dict[int, DatasetStatus]:
+    """Get the most recent status for each of the datasets, see `get_status`."""
+    query = (
+        _GET_STATUSES_QUERY
+        if await has_current_status_table(connection)
+        else _GET_LATEST_STATUSES_QUERY
+    )
+    rows = await connection.execute(query, parameters={"dataset_ids": ids})
+    statuses = {row.did: DatasetStatus(row.status) for row in rows.all()}
+    return {id_: statuses.get(id_, DatasetStatus.IN_PREPARATION) for id_ in ids}
+
+
+_GET_LATEST_PROCESSING_UPDATE_QUERY = text(
+    """
     SELECT *
     FROM data_processed
     WHERE did = :dataset_id
     ORDER BY processing_date DESC
     """,
-        ),
+)
+
+
+async def get_latest_processing_update(
+    dataset_id: Identifier,
+    connection: AsyncConnection,
+) -> Row | None:
+    row = await connection.execute(
+        _GET_LATEST_PROCESSING_UPDATE_QUERY,
         parameters={"dataset_id": dataset_id},
     )
     return row.first()
 
 
+_GET_LATEST_PROCESSING_UPDATES_QUERY = text(
+    """
+    SELECT *
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY did ORDER BY processing_date DESC) AS `recency`
+        FROM data_processed
+        WHERE did IN :dataset_ids
+    ) AS updates
+    WHERE `recency` = 1
+    """,
+).bindparams(bindparam("dataset_ids", expanding=True))
+
+
+async def get_latest_processing_updates(
+    dataset_ids: Sequence[Identifier],
+    connection: AsyncConnection,
+) -> dict[int, Row]:
+    """Get the latest processing update for each of the datasets that has been processed."""
+    rows = await connection.execute(
+        _GET_LATEST_PROCESSING_UPDATES_QUERY,
+        parameters={"dataset_ids": dataset_ids},
+    )
+    return {row.did: row for row in rows.all()}
+
+
+_GET_FEATURES_QUERY = text(
+    """
+    SELECT `index`,`name`,`data_type`,`is_target`,
+    `is_row_identifier`,`is_ignore`,`NumberOfMissingValues` as `number_of_missing_values`
+    FROM data_feature
+    WHERE `did` = :dataset_id
+    """,
+)
+
+
 async def get_features(dataset_id: Identifier, connection: AsyncConnection) -> list[Feature]:
     row = await connection.execute(
-        text(
-            """
-            SELECT `index`,`name`,`data_type`,`is_target`,
-            `is_row_identifier`,`is_ignore`,`NumberOfMissingValues` as `number_of_missing_values`
-            FROM data_feature
-            WHERE `did` = :dataset_id
-            """,
-        ),
+        _GET_FEATURES_QUERY,
         parameters={"dataset_id": dataset_id},
     )
     rows = row.mappings().all()
     return [Feature(**row, nominal_values=None) for row in rows]
 
 
+_GET_FEATURE_ONTOLOGIES_QUERY = text(
+    """
+    SELECT `index`, `value`
+    FROM data_feature_description
+    WHERE `did` = :dataset_id AND `description_type` = 'ontology'
+    """,
+)
+
+
 async def get_feature_ontologies(
     dataset_id: Identifier,
     connection: AsyncConnection,
 ) -> dict[int, list[str]]:
     rows = await connection.execute(
-        text(
-            """
-            SELECT `index`, `value`
-            FROM data_feature_description
-            WHERE `did` = :dataset_id AND `description_type` = 'ontology'
-            """,
-        ),
+        _GET_FEATURE_ONTOLOGIES_QUERY,
         parameters={"dataset_id": dataset_id},
     )
     ontologies: dict[int, list[str]] = defaultdict(list)
@@ -211,24 +449,36 @@ async def get_feature_ontologies(
     return ontologies
 
 
+_GET_FEATURE_VALUES_QUERY = text(
+    """
+    SELECT `index`, `value`
+    FROM data_feature_value
+    WHERE `did` = :dataset_id
+    """,
+)
+
+
 async def get_feature_values(
     dataset_id: Identifier,
-    *,
-    feature_index: int,
     connection: AsyncConnection,
-) -> list[str]:
-    row = await connection.execute(
-        text(
-            """
-            SELECT `value`
-            FROM data_feature_value
-            WHERE `did` = :dataset_id AND `index` = :feature_index
-            """,
-        ),
-        parameters={"dataset_id": dataset_id, "feature_index": feature_index},
+) -> dict[int, list[str]]:
+    """Return the values of each nominal feature of the dataset, by feature index."""
+    rows = await connection.execute(
+        _GET_FEATURE_VALUES_QUERY,
+        parameters={"dataset_id": dataset_id},
     )
-    rows = row.all()
-    return [row.value for row in rows]
+    values: dict[int, list[str]] = defaultdict(list)
+    for row in rows.mappings():
+        values[row["index"]].append(row["value"])
+    return values
+
+
+_UPDATE_STATUS_QUERY = text(
+    """
+    INSERT INTO dataset_status(`did`,`status`,`status_date`,`user_id`)
+    VALUES (:dataset, :status, :date, :user)
+    """,
+)
 
 
 async def update_status(
@@ -238,29 +488,126 @@ async def update_status(
     user_id: Identifier,
     connection: AsyncConnection,
 ) -> None:
-    await connection.execute(
-        text(
-            """
-            INSERT INTO dataset_status(`did`,`status`,`status_date`,`user_id`)
-            VALUES (:dataset, :status, :date, :user)
-            """,
-        ),
-        parameters={
-            "dataset": dataset_id,
-            "status": status,
-            "date": datetime.datetime.now(datetime.UTC),
-            "user": user_id,
-        },
-    )
+    parameters = {
+        "dataset": dataset_id,
+        "status": status,
+        "date": datetime.datetime.now(datetime.UTC),
+        "user": user_id,
+    }
+    await connection.execute(_UPDATE_STATUS_QUERY, parameters=parameters)
+
+
+_REMOVE_DEACTIVATED_STATUS_QUERY = text(
+    """
+    DELETE FROM dataset_status
+    WHERE `did` = :data AND `status`='deactivated'
+    """,
+)
 
 
 async def remove_deactivated_status(dataset_id: Identifier, connection: AsyncConnection) -> None:
     await connection.execute(
-        text(
-            """
-            DELETE FROM dataset_status
-            WHERE `did` = :data AND `status`='deactivated'
-            """,
-        ),
+        _REMOVE_DEACTIVATED_STATUS_QUERY,
         parameters={"data": dataset_id},
     )
+
+
+# `dataset_status` holds the status changes of each dataset, see `update_status`.
+# To avoid finding the latest change of every dataset for each list query, the latest
+# status of each dataset is maintained in `dataset_current_status` by triggers on
+# `dataset_status`, whichever application changes it. Datasets without status
+# changes are in preparation, and have no row in either table.
+_CREATE_CURRENT_STATUS_QUERY = text(
+    """
+    CREATE TABLE IF NOT EXISTS dataset_current_status (
+        `did` int unsigned NOT NULL,
+        `status` enum('active','deactivated') NOT NULL,
+        `status_date` datetime NOT NULL,
+        PRIMARY KEY (`did`),
+        KEY `status` (`status`, `did`)
+    )
+    """,
+)
+_DROP_CURRENT_STATUS_ROUTINES_QUERIES = [
+    *(text(f"DROP TRIGGER IF EXISTS {trigger}") for trigger in _CURRENT_STATUS_TRIGGERS),
+    text("DROP PROCEDURE IF EXISTS refresh_dataset_current_status"),
+]
+_CREATE_CURRENT_STATUS_ROUTINES_QUERIES = [
+    text(
+        """
+        CREATE PROCEDURE refresh_dataset_current_status(IN dataset_id int unsigned)
+        BEGIN
+            DELETE FROM dataset_current_status WHERE `did` = dataset_id;
+            INSERT INTO dataset_current_status(`did`,`status`,`status_date`)
+            SELECT `did`, `status`, `status_date`
+            FROM dataset_status
+            WHERE `did` = dataset_id
+            ORDER BY `status_date` DESC
+            LIMIT 1;
+        END
+        """,
+    ),
+    text(
+        """
+        CREATE TRIGGER dataset_current_status_insert AFTER INSERT ON dataset_status
+        FOR EACH ROW
+        CALL refresh_dataset_current_status(NEW.`did`)
+        """,
+    ),
+    text(
+        """
+        CREATE TRIGGER dataset_current_status_update AFTER UPDATE ON dataset_status
+        FOR EACH ROW
+        BEGIN
+            CALL refresh_dataset_current_status(NEW.`did`);
+            IF OLD.`did` <> NEW.`did` THEN
+                CALL refresh_dataset_current_status(OLD.`did`);
+            END IF;
+        END
+        """,
+    ),
+    text(
+        """
+        CREATE TRIGGER dataset_current_status_delete AFTER DELETE ON dataset_status
+        FOR EACH ROW
+        CALL refresh_dataset_current_status(OLD.`did`)
+        """,
+    ),
+]
+_CLEAR_CURRENT_STATUS_QUERY = text("DELETE FROM dataset_current_status")
+_COPY_CURRENT_STATUS_QUERY = text(
+    """
+    INSERT INTO dataset_current_status(`did`,`status`,`status_date`)
+    SELECT `did`, `status`, `status_date`
+    FROM (
+        SELECT `did`, `status`, `status_date`, ROW_NUMBER() OVER (
+            PARTITION BY `did` ORDER BY `status_date` DESC
+        ) AS `recency`
+        FROM dataset_status
+    ) AS latest
+    WHERE `recency` = 1
+    """,
+)
+
+
+async def create_current_status_table(connection: AsyncConnection) -> None:
+    """Create `dataset_current_status` and the triggers that maintain it.
+
+    Triggers are replaced if they exist. This commits the transaction. Workers use the
+    table once they find its triggers, see `has_current_status_table`.
+    """
+    await connection.execute(_CREATE_CURRENT_STATUS_QUERY)
+    for query in [*_DROP_CURRENT_STATUS_ROUTINES_QUERIES, *_CREATE_CURRENT_STATUS_ROUTINES_QUERIES]:
+        await connection.execute(query)
+
+
+async def repair_current_status(connection: AsyncConnection) -> int:
+    """Rebuild `dataset_current_status` from `dataset_status`.
+
+    Triggers on `dataset_status` keep the table up to date for any application that
+    changes the status, so this is only needed to backfill the table. Returns the
+    number of datasets with a status.
+    """
+    await connection.execute(_CLEAR_CURRENT_STATUS_QUERY)
+    result = await connection.execute(_COPY_CURRENT_STATUS_QUERY)
+    return result.rowcount
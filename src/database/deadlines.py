@@ -0,0 +1,111 @@
+"""Bound and cancel the execution of statements on behalf of a request.
+
+MySQL enforces the budget itself through the `MAX_EXECUTION_TIME` optimizer hint, which
+only applies to (top-level) SELECT statements. Statements that are cancelled on the
+client side, e.g., because the client disconnected, are killed on the server as well.
+"""
+
+import asyncio
+import contextlib
+import re
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+from sqlalchemy import text
+
+from core.errors import QueryTimeoutError, problem_detail_exception_handler
+from database.exceptions import _QUERY_TIMEOUT
+
+if TYPE_CHECKING:
+    from fastapi import Request
+    from fastapi.responses import JSONResponse
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine.interfaces import DBAPICursor, ExecutionContext
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+_statement_deadline: ContextVar[float] = ContextVar("statement_deadline", default=0)
+_SELECT = re.compile(r"^(\s*)SELECT\b", flags=re.IGNORECASE)
+_KILL_QUERY = text("KILL QUERY :thread_id")
+# References to the tasks that kill queries, so they are not garbage collected early.
+_kill_tasks: set[asyncio.Task[None]] = set()
+
+
+@contextlib.contextmanager
+def statement_deadline(seconds: float) -> Iterator[None]:
+    """Limit each SELECT statement executed within the context to `seconds`, 0 means no limit."""
+    token = _statement_deadline.set(seconds)
+    try:
+        yield
+    finally:
+        _statement_deadline.reset(token)
+
+
+def add_execution_time_hint(  # noqa: PLR0913, PLR0917
+    conn: Connection,  # noqa: ARG001
+    cursor: DBAPICursor,  # noqa: ARG001
+    statement: str,
+    parameters: Any,  # noqa: ANN401
+    context: ExecutionContext | None,  # noqa: ARG001
+    executemany: bool,  # noqa: ARG001, FBT001
+) -> tuple[str, Any]:
+    """Add a `MAX_EXECUTION_TIME` hint for the current deadline to SELECT statements.
+
+    Listener for the `before_cursor_execute` event, registered with `retval=True`.
+    """
+    if (seconds := _statement_deadline.get()) > 0:
+        milliseconds = max(1, round(seconds * 1000))
+        hint = f"/*+ MAX_EXECUTION_TIME({milliseconds}) */"
+        statement = _SELECT.sub(rf"\1SELECT {hint}", statement, 1)
+    return statement, parameters
+
+
+def is_query_timeout(error: OperationalError) -> bool:
+    """Whether the statement was interrupted because it exceeded its execution time."""
+    return bool(error.orig and error.orig.args and error.orig.args[0] == _QUERY_TIMEOUT)
+
+
+def operational_error_handler(
+    request: Request,
+    exc: OperationalError,
+) -> JSONResponse:
+    """FastAPI exception handler for database errors, only handles query timeouts.
+
+    Other errors are re-raised, so they are treated as any other unexpected error.
+    """
+    if not is_query_timeout(exc):
+        raise exc
+    msg = "The request took too long to process, consider making it more specific."
+    return problem_detail_exception_handler(request, QueryTimeoutError(msg))
+
+
+async def _kill_query(connection: AsyncConnection, thread_id: int) -> None:
+    try:
+        async with connection.engine.connect() as killer:
+            await killer.execute(_KILL_QUERY, parameters={"thread_id": thread_id})
+    except Exception:  # noqa: BLE001
+        logger.exception("Could not kill query of connection {thread_id}.", thread_id=thread_id)
+    else:
+        logger.info("Killed query of cancelled connection {thread_id}.", thread_id=thread_id)
+
+
+@contextlib.contextmanager
+def kill_query_on_cancel(connection: AsyncConnection) -> Iterator[None]:
+    """Kill the statement running on `connection` if the context is cancelled.
+
+    Cancelling only stops waiting for the result, the server would otherwise keep
+    executing the statement. The kill runs in its own task, as the cancelled task may
+    not be able to await anything anymore.
+    """
+    try:
+        yield
+    except asyncio.CancelledError:
+        fairy = connection.sync_connection.connection if connection.sync_connection else None
+        if fairy is not None and fairy.driver_connection is not None:
+            thread_id = fairy.driver_connection.thread_id()
+            task = asyncio.create_task(_kill_query(connection, thread_id))
+            _kill_tasks.add(task)
+            task.add_done_callback(_kill_tasks.discard)
+        raise
@@ -3,22 +3,28 @@ from typing import TYPE_CHECKING, cast
 
 from sqlalchemy import Row, text
 
+from core.cache import cached
 from core.formatting import _str_to_bool
+from database.caches import reference_data
 from schemas.datasets.openml import EstimationProcedure
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_GET_MATH_FUNCTIONS_QUERY = text(
+    """
+    SELECT *
+    FROM math_function
+    WHERE `functionType` = :function_type
+    """,
+)
+
+
+@cached(reference_data)
 async def get_math_functions(function_type: str, connection: AsyncConnection) -> Sequence[Row]:
     rows = await connection.execute(
-        text(
-            """
-            SELECT *
-            FROM math_function
-            WHERE `functionType` = :function_type
-            """,
-        ),
+        _GET_MATH_FUNCTIONS_QUERY,
         parameters={"function_type": function_type},
     )
     return cast(
@@ -27,15 +33,19 @@ async def get_math_functions(function_type: str, connection: AsyncConnection) ->
     )
 
 
+_GET_ESTIMATION_PROCEDURES_QUERY = text(
+    """
+    SELECT `id` as 'id_', `ttid` as 'task_type_id', `name`, `type` as 'type_',
+           `repeats`, `folds`, `stratified_sampling`, `percentage`
+    FROM estimation_procedure
+    """,
+)
+
+
+@cached(reference_data)
 async def get_estimation_procedures(connection: AsyncConnection) -> list[EstimationProcedure]:
     row = await connection.execute(
-        text(
-            """
-            SELECT `id` as 'id_', `ttid` as 'task_type_id', `name`, `type` as 'type_',
-                   `repeats`, `folds`, `stratified_sampling`, `percentage`
-            FROM estimation_procedure
-            """,
-        ),
+        _GET_ESTIMATION_PROCEDURES_QUERY,
     )
     rows = row.mappings().all()
     typed_rows = [
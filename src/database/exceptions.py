@@ -2,6 +2,7 @@
 
 _FOREIGN_KEY_CONSTRAINT_FAILED = 1452
 _DUPLICATE_ENTRY = 1062
+_QUERY_TIMEOUT = 3024
 
 
 class ForeignKeyConstraintError(Exception):
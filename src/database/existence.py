@@ -0,0 +1,41 @@
+"""Reject ids of entities that do not exist, without querying for them.
+
+Crawlers and misconfigured clients request many ids that do not exist. Ids above the
+largest id of the entity (its watermark) are rejected from memory, see the `max_ids`
+cache. Entities are created by other services (e.g., the PHP API), and the watermark is
+refreshed when it expires, so a new entity is found at most that long after its creation.
+Code that inserts entities in-process, such as test fixtures, can call `entity_created`
+to make them visible immediately.
+"""
+
+from typing import TYPE_CHECKING, Literal
+
+from sqlalchemy import text
+
+from database.caches import max_ids
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+type Entity = Literal["dataset", "task", "run", "flow"]
+
+_MAX_ID_QUERIES = {
+    "dataset": text("SELECT MAX(`did`) FROM `dataset`"),
+    "task": text("SELECT MAX(`task_id`) FROM `task`"),
+    "run": text("SELECT MAX(`rid`) FROM `run`"),
+    "flow": text("SELECT MAX(`id`) FROM `implementation`"),
+}
+
+
+async def may_exist(entity: Entity, id_: int, connection: AsyncConnection) -> bool:
+    """Whether the entity with `id_` may exist, `False` if it is known not to exist."""
+    if (watermark := max_ids.get(entity)) is None:
+        result = await connection.execute(_MAX_ID_QUERIES[entity])
+        watermark = result.scalar_one() or 0
+        max_ids.set(entity, watermark)
+    return id_ <= watermark
+
+
+def entity_created(entity: Entity) -> None:
+    """Forget the watermark of `entity`, as one was created."""
+    max_ids.invalidate(entity)
@@ -1,23 +1,29 @@
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, cast
 
-from sqlalchemy import Row, text
+from sqlalchemy import Row, bindparam, text
 
+from core.cache import cached
+from database.caches import flow_rows, flows
 from routers.types import Identifier
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_GET_SUBFLOWS_QUERY = text(
+    """
+    SELECT child as child_id, identifier
+    FROM implementation_component
+    WHERE parent = :flow_id
+    """,
+)
+
+
+@cached(flows)
 async def get_subflows(for_flow: Identifier, expdb: AsyncConnection) -> Sequence[Row]:
     rows = await expdb.execute(
-        text(
-            """
-            SELECT child as child_id, identifier
-            FROM implementation_component
-            WHERE parent = :flow_id
-            """,
-        ),
+        _GET_SUBFLOWS_QUERY,
         parameters={"flow_id": for_flow},
     )
     return cast(
@@ -26,30 +32,43 @@ async def get_subflows(for_flow: Identifier, expdb: AsyncConnection) -> Sequence
     )
 
 
-async def get_tags(flow_id: Identifier, expdb: AsyncConnection) -> list[str]:
+_GET_TAGS_FOR_QUERY = text(
+    """
+    SELECT id, tag
+    FROM implementation_tag
+    WHERE id IN :flow_ids
+    """,
+).bindparams(bindparam("flow_ids", expanding=True))
+
+
+async def get_tags_for(
+    flow_ids: Sequence[Identifier],
+    expdb: AsyncConnection,
+) -> dict[int, list[str]]:
+    """Return the tags of each of the flows, flows without tags are omitted."""
     rows = await expdb.execute(
-        text(
-            """
-            SELECT tag
-            FROM implementation_tag
-            WHERE id = :flow_id
-            """,
-        ),
-        parameters={"flow_id": flow_id},
+        _GET_TAGS_FOR_QUERY,
+        parameters={"flow_ids": flow_ids},
     )
-    tag_rows = rows.all()
-    return [tag.tag for tag in tag_rows]
+    tags: dict[int, list[str]] = {}
+    for row in rows.all():
+        tags.setdefault(row.id, []).append(row.tag)
+    return tags
+
 
+_GET_PARAMETERS_QUERY = text(
+    """
+    SELECT *, defaultValue as default_value, dataType as data_type
+    FROM input
+    WHERE implementation_id = :flow_id
+    """,
+)
 
+
+@cached(flows)
 async def get_parameters(flow_id: Identifier, expdb: AsyncConnection) -> Sequence[Row]:
     rows = await expdb.execute(
-        text(
-            """
-            SELECT *, defaultValue as default_value, dataType as data_type
-            FROM input
-            WHERE implementation_id = :flow_id
-            """,
-        ),
+        _GET_PARAMETERS_QUERY,
         parameters={"flow_id": flow_id},
     )
     return cast(
@@ -58,30 +77,37 @@ async def get_parameters(flow_id: Identifier, expdb: AsyncConnection) -> Sequenc
     )
 
 
+_GET_BY_NAME_QUERY = text(
+    """
+    SELECT *, uploadDate as upload_date
+    FROM implementation
+    WHERE name = :name AND external_version = :external_version
+    """,
+)
+
+
 async def get_by_name(name: str, external_version: str, expdb: AsyncConnection) -> Row | None:
     """Get flow by name and external version."""
     row = await expdb.execute(
-        text(
-            """
-            SELECT *, uploadDate as upload_date
-            FROM implementation
-            WHERE name = :name AND external_version = :external_version
-            """,
-        ),
+        _GET_BY_NAME_QUERY,
         parameters={"name": name, "external_version": external_version},
     )
     return row.one_or_none()
 
 
+_GET_QUERY = text(
+    """
+    SELECT *, uploadDate as upload_date, fullName AS full_name
+    FROM implementation
+    WHERE id = :flow_id
+    """,
+)
+
+
+@cached(flow_rows)
 async def get(id_: Identifier, expdb: AsyncConnection) -> Row | None:
     row = await expdb.execute(
-        text(
-            """
-            SELECT *, uploadDate as upload_date, fullName AS full_name
-            FROM implementation
-            WHERE id = :flow_id
-            """,
-        ),
+        _GET_QUERY,
         parameters={"flow_id": id_},
     )
     return row.one_or_none()
@@ -1,65 +1,291 @@
+import re
 from collections import defaultdict
-from collections.abc import Iterable
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import text
+from loguru import logger
+from sqlalchemy import bindparam, text
 
-from routers.types import Identifier
+from core.cache import cached
+from database.caches import quality_names, schema
+from routers.types import Identifier, number_range_regex
 from schemas.datasets.openml import Quality
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.engine import RowMapping
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_GET_FOR_DATASET_QUERY = text(
+    """
+    SELECT `quality`,`value`
+    FROM data_quality
+    WHERE `data`=:dataset_id
+    """,
+)
+
+
 async def get_for_dataset(dataset_id: Identifier, connection: AsyncConnection) -> list[Quality]:
     row = await connection.execute(
-        text(
-            """
-        SELECT `quality`,`value`
-        FROM data_quality
-        WHERE `data`=:dataset_id
-        """,
-        ),
+        _GET_FOR_DATASET_QUERY,
         parameters={"dataset_id": dataset_id},
     )
     rows = row.all()
     return [Quality(name=row.quality, value=row.value) for row in rows]
 
 
+_GET_FOR_DATASETS_QUERY = text(
+    """
+    SELECT `data`, `quality`, `value`
+    FROM data_quality
+    WHERE `data` IN :dataset_ids AND `quality` IN :quality_names
+    """,
+).bindparams(
+    bindparam("dataset_ids", expanding=True),
+    bindparam("quality_names", expanding=True),
+)
+
+
 async def get_for_datasets(
     dataset_ids: Iterable[Identifier],
     quality_names: Iterable[str],
     connection: AsyncConnection,
 ) -> dict[int, list[Quality]]:
-    """Don't call with user-provided input, as query is not parameterized."""
-    qualities_filter = ",".join(f"'{q}'" for q in quality_names)
-    dids = ",".join(str(did) for did in dataset_ids)
-    qualities_query = text(
-        f"""
-        SELECT `data`, `quality`, `value`
-        FROM data_quality
-        WHERE `data` in ({dids}) AND `quality` IN ({qualities_filter})
-        """,  # noqa: S608 - dids and qualities are not user-provided
+    """Return the qualities named `quality_names` that have a value, for each dataset."""
+    rows = await connection.execute(
+        _GET_FOR_DATASETS_QUERY,
+        parameters={"dataset_ids": list(dataset_ids), "quality_names": list(quality_names)},
     )
-    row = await connection.execute(qualities_query)
-    rows = row.all()
     qualities_by_id = defaultdict(list)
-    for did, quality, value in rows:
+    for did, quality, value in rows.all():
         if value is not None:
             qualities_by_id[did].append(Quality(name=quality, value=value))
     return dict(qualities_by_id)
 
 
+_LIST_ALL_QUALITIES_QUERY = text(
+    """
+    SELECT DISTINCT(`quality`)
+    FROM data_quality
+    """,
+)
+
+
+@cached(quality_names)
 async def list_all_qualities(connection: AsyncConnection) -> list[str]:
+    """Return the names of the qualities stored for at least one dataset, sorted.
+
+    This scans `data_quality`, so the names are cached in `quality_names`. Qualities
+    that are added or removed are listed accordingly once the cache expires.
+    """
     # The current implementation only fetches *used* qualities, otherwise you should
     # query: SELECT `name` FROM `quality` WHERE `type`='DataQuality'
-    rows = await connection.execute(
-        text(
-            """
-        SELECT DISTINCT(`quality`)
-        FROM data_quality
+    rows = await connection.execute(_LIST_ALL_QUALITIES_QUERY)
+    return sorted(row.quality for row in rows.all())
+
+
+# The qualities shown in dataset and task lists, which may also be used to filter them.
+# Each has a column in `dataset_quality_summary`, the filterable ones are indexed.
+SUMMARY_QUALITIES = (
+    "MajorityClassSize",
+    "MaxNominalAttDistinctValues",
+    "MinorityClassSize",
+    "NumberOfClasses",
+    "NumberOfFeatures",
+    "NumberOfInstances",
+    "NumberOfInstancesWithMissingValues",
+    "NumberOfMissingValues",
+    "NumberOfNumericFeatures",
+    "NumberOfSymbolicFeatures",
+)
+FILTER_QUALITIES = (
+    "NumberOfClasses",
+    "NumberOfFeatures",
+    "NumberOfInstances",
+    "NumberOfMissingValues",
+)
+
+_SUMMARY_COLUMNS = ", ".join(f"`{quality}`" for quality in SUMMARY_QUALITIES)
+_SUMMARY_QUALITY_NAMES = ", ".join(f"'{quality}'" for quality in SUMMARY_QUALITIES)
+# `value` is a varchar, only numbers are copied as other values fail to convert.
+_NUMBER_PATTERN = "^[-+]?[0-9]*[.]?[0-9]+([eE][-+]?[0-9]+)?$"
+_PIVOT_COLUMNS = ", ".join(
+    f"MAX(CASE WHEN `quality`='{quality}' AND `value` REGEXP '{_NUMBER_PATTERN}' "
+    "THEN CAST(`value` AS DOUBLE) END)"
+    for quality in SUMMARY_QUALITIES
+)
+_PIVOT_SELECT = f"""
+    SELECT `data`, {_PIVOT_COLUMNS}
+    FROM data_quality
+    WHERE `quality` IN ({_SUMMARY_QUALITY_NAMES})
+"""  # noqa: S608 - no user input
+
+_CREATE_SUMMARY_TABLE_QUERY = text(
+    f"""
+    CREATE TABLE IF NOT EXISTS dataset_quality_summary (
+        `did` int unsigned NOT NULL,
+        {"".join(f"`{quality}` double DEFAULT NULL," for quality in SUMMARY_QUALITIES)}
+        PRIMARY KEY (`did`),
+        {",".join(f"KEY `{quality}` (`{quality}`)" for quality in FILTER_QUALITIES)}
+    )
+    """,
+)
+_SUMMARY_TRIGGERS = (
+    "data_quality_summary_insert",
+    "data_quality_summary_update",
+    "data_quality_summary_delete",
+)
+_DROP_SUMMARY_ROUTINES_QUERIES = [
+    *(text(f"DROP TRIGGER IF EXISTS {trigger}") for trigger in _SUMMARY_TRIGGERS),
+    text("DROP PROCEDURE IF EXISTS refresh_dataset_quality_summary"),
+]
+_CREATE_SUMMARY_ROUTINES_QUERIES = [
+    text(
+        f"""
+        CREATE PROCEDURE refresh_dataset_quality_summary(IN dataset_id int unsigned)
+        BEGIN
+            DELETE FROM dataset_quality_summary WHERE `did` = dataset_id;
+            INSERT INTO dataset_quality_summary(`did`, {_SUMMARY_COLUMNS})
+            {_PIVOT_SELECT} AND `data` = dataset_id
+            GROUP BY `data`;
+        END
+        """,  # noqa: S608 - no user input
+    ),
+    text(
+        f"""
+        CREATE TRIGGER data_quality_summary_insert AFTER INSERT ON data_quality
+        FOR EACH ROW
+        IF NEW.`quality` IN ({_SUMMARY_QUALITY_NAMES}) THEN
+            CALL refresh_dataset_quality_summary(NEW.`data`);
+        END IF
         """,
-        ),
+    ),
+    text(
+        f"""
+        CREATE TRIGGER data_quality_summary_update AFTER UPDATE ON data_quality
+        FOR EACH ROW
+        BEGIN
+            IF NEW.`quality` IN ({_SUMMARY_QUALITY_NAMES}) THEN
+                CALL refresh_dataset_quality_summary(NEW.`data`);
+            END IF;
+            IF OLD.`quality` IN ({_SUMMARY_QUALITY_NAMES})
+                AND (OLD.`data` <> NEW.`data` OR OLD.`quality` <> NEW.`quality`) THEN
+                CALL refresh_dataset_quality_summary(OLD.`data`);
+            END IF;
+        END
+        """,
+    ),
+    text(
+        f"""
+        CREATE TRIGGER data_quality_summary_delete AFTER DELETE ON data_quality
+        FOR EACH ROW
+        IF OLD.`quality` IN ({_SUMMARY_QUALITY_NAMES}) THEN
+            CALL refresh_dataset_quality_summary(OLD.`data`);
+        END IF
+        """,
+    ),
+]
+_CLEAR_SUMMARY_QUERY = text("DELETE FROM dataset_quality_summary")
+_FILL_SUMMARY_QUERY = text(
+    f"""
+    INSERT INTO dataset_quality_summary(`did`, {_SUMMARY_COLUMNS})
+    {_PIVOT_SELECT}
+    GROUP BY `data`
+    """,
+)
+
+
+async def create_summary_table(connection: AsyncConnection) -> None:
+    """Create `dataset_quality_summary` and the triggers that maintain it.
+
+    Triggers are replaced, so they match `SUMMARY_QUALITIES`. This commits the transaction.
+    Workers use the table once they find its triggers, see `has_summary_table`.
+    """
+    await connection.execute(_CREATE_SUMMARY_TABLE_QUERY)
+    for query in [*_DROP_SUMMARY_ROUTINES_QUERIES, *_CREATE_SUMMARY_ROUTINES_QUERIES]:
+        await connection.execute(query)
+
+
+async def repair_summary(connection: AsyncConnection) -> int:
+    """Rebuild `dataset_quality_summary` from `data_quality`.
+
+    Triggers on `data_quality` keep the table up to date for any application that
+    changes qualities, so this is only needed to backfill the table. Returns the number
+    of datasets with any of the summary qualities.
+    """
+    await connection.execute(_CLEAR_SUMMARY_QUERY)
+    result = await connection.execute(_FILL_SUMMARY_QUERY)
+    return result.rowcount
+
+
+_COUNT_SUMMARY_TRIGGERS_QUERY = text(
+    """
+    SELECT COUNT(*)
+    FROM information_schema.TRIGGERS
+    WHERE `TRIGGER_SCHEMA` = DATABASE() AND `TRIGGER_NAME` IN :triggers
+    """,
+).bindparams(bindparam("triggers", expanding=True))
+
+
+@cached(schema)
+async def has_summary_table(connection: AsyncConnection) -> bool:
+    """Whether `dataset_quality_summary` exists and is maintained by its triggers.
+
+    Until `python -m database repair-qualities` created them, lists are filtered on and
+    show qualities from `data_quality` instead, which is slower.
+    """
+    result = await connection.execute(
+        _COUNT_SUMMARY_TRIGGERS_QUERY,
+        parameters={"triggers": _SUMMARY_TRIGGERS},
+    )
+    if result.scalar_one() == len(_SUMMARY_TRIGGERS):
+        return True
+    logger.warning(
+        "`dataset_quality_summary` is not set up, run `python -m database repair-qualities`.",
     )
-    qualities_ = rows.all()
-    return [quality.quality for quality in qualities_]
+    return False
+
+
+def summary_to_qualities(row: RowMapping) -> list[Quality]:
+    """Return the qualities of a `dataset_quality_summary` row, omitting missing ones."""
+    return [
+        Quality(name=quality, value=row[quality])
+        for quality in SUMMARY_QUALITIES
+        if row[quality] is not None
+    ]
+
+
+def range_clause(
+    quality: str,
+    range_: str | None,
+    parameters: dict[str, Any],
+    *,
+    summary: bool,
+) -> str:
+    """Return a WHERE clause fragment filtering datasets on the range_ of a quality.
+
+    With `summary`, it filters `dataset_quality_summary` AS `qs`, and otherwise the
+    `did` of `dataset` AS `d` with a subquery on `data_quality`, see `has_summary_table`.
+    The bounds of the range are added to `parameters`.
+    """
+    if not range_:
+        return ""
+    if quality not in FILTER_QUALITIES:
+        msg = f"Can not filter on quality {quality}, it is not indexed."
+        raise ValueError(msg)
+    if not (match := re.match(number_range_regex, range_)):
+        msg = f"`range_` not a valid range: {range_}"
+        raise ValueError(msg)
+    low, high = match.groups()
+    parameters[f"{quality}_low"] = float(low)
+    parameters[f"{quality}_high"] = float(high or low)
+    if summary:
+        return f"AND qs.`{quality}` BETWEEN :{quality}_low AND :{quality}_high"
+    return f"""
+        AND d.`did` IN (
+            SELECT `data`
+            FROM data_quality
+            WHERE `quality`='{quality}' AND `value` BETWEEN :{quality}_low AND :{quality}_high
+        )
+    """  # noqa: S608 - `quality` is one of FILTER_QUALITIES
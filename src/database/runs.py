@@ -1,6 +1,6 @@
 """Database queries for run-related data."""
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy import Row, bindparam, text
@@ -11,21 +11,33 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_EXIST_QUERY = text(
+    """
+    SELECT 1
+    FROM `run`
+    WHERE `rid` = :run_id
+    """,
+)
+
+
 async def exist(id_: Identifier, expdb: AsyncConnection) -> bool:
     """Check if a run exists by ID."""
     row = await expdb.execute(
-        text(
-            """
-            SELECT 1
-            FROM `run`
-            WHERE `rid` = :run_id
-            """,
-        ),
+        _EXIST_QUERY,
         parameters={"run_id": id_},
     )
     return bool(row.one_or_none())
 
 
+_GET_QUERY = text(
+    """
+    SELECT `rid`, `uploader`, `setup`, `task_id`, `error_message`
+    FROM `run`
+    WHERE `rid` = :run_id
+    """,
+)
+
+
 async def get(run_id: Identifier, expdb: AsyncConnection) -> Row | None:
     """Fetch the core run row from the `run` table.
 
@@ -33,55 +45,64 @@ async def get(run_id: Identifier, expdb: AsyncConnection) -> Row | None:
     The `error_message` column is NULL when the run completed without errors.
     """
     row = await expdb.execute(
-        text(
-            """
-            SELECT `rid`, `uploader`, `setup`, `task_id`, `error_message`
-            FROM `run`
-            WHERE `rid` = :run_id
-            """,
-        ),
+        _GET_QUERY,
         parameters={"run_id": run_id},
     )
     return row.one_or_none()
 
 
+_GET_TAGS_QUERY = text(
+    """
+    SELECT `tag`
+    FROM `run_tag`
+    WHERE `id` = :run_id
+    """,
+)
+
+
 async def get_tags(run_id: int, expdb: AsyncConnection) -> list[str]:
     """Fetch all tags associated with a run from the `run_tag` table.
 
     The `id` column in `run_tag` refers to the run ID
     """
     rows = await expdb.execute(
-        text(
-            """
-            SELECT `tag`
-            FROM `run_tag`
-            WHERE `id` = :run_id
-            """,
-        ),
+        _GET_TAGS_QUERY,
         parameters={"run_id": run_id},
     )
     return [row.tag for row in rows.all()]
 
 
+_GET_INPUT_DATA_QUERY = text(
+    """
+    SELECT `id`.`data` AS `did`, `d`.`name`, `d`.`url`
+    FROM `input_data` `id`
+    JOIN `dataset` `d` ON `id`.`data` = `d`.`did`
+    WHERE `id`.`run` = :run_id
+    """,
+)
+
+
 async def get_input_data(run_id: int, expdb: AsyncConnection) -> list[Row]:
     """Fetch the dataset(s) used as input for a run, with name and url.
 
     Joins `input_data` with `dataset` to include the dataset name and ARFF URL.
     """
     rows = await expdb.execute(
-        text(
-            """
-            SELECT `id`.`data` AS `did`, `d`.`name`, `d`.`url`
-            FROM `input_data` `id`
-            JOIN `dataset` `d` ON `id`.`data` = `d`.`did`
-            WHERE `id`.`run` = :run_id
-            """,
-        ),
+        _GET_INPUT_DATA_QUERY,
         parameters={"run_id": run_id},
     )
     return cast("list[Row]", rows.all())
 
 
+_GET_OUTPUT_FILES_QUERY = text(
+    """
+    SELECT `file_id`, `field`
+    FROM `runfile`
+    WHERE `source` = :run_id
+    """,
+)
+
+
 async def get_output_files(run_id: int, expdb: AsyncConnection) -> list[Row]:
     """Fetch output files attached to a run from the `runfile` table.
 
@@ -89,18 +110,29 @@ async def get_output_files(run_id: int, expdb: AsyncConnection) -> list[Row]:
     The `field` column holds the file label (e.g. "description", "predictions").
     """
     rows = await expdb.execute(
-        text(
-            """
-            SELECT `file_id`, `field`
-            FROM `runfile`
-            WHERE `source` = :run_id
-            """,
-        ),
+        _GET_OUTPUT_FILES_QUERY,
         parameters={"run_id": run_id},
     )
     return cast("list[Row]", rows.all())
 
 
+_GET_EVALUATIONS_QUERY = text(
+    """
+    SELECT `m`.`name`, `e`.`value`, `e`.`array_data`, NULL as `repeat`, NULL as `fold`
+    FROM `evaluation` `e`
+    JOIN `math_function` `m` ON `e`.`function_id` = `m`.`id`
+    WHERE `e`.`source` = :run_id
+      AND `e`.`evaluation_engine_id` IN :engine_ids
+    UNION ALL
+    SELECT `m`.`name`, `ef`.`value`, `ef`.`array_data`, `ef`.`repeat`, `ef`.`fold`
+    FROM `evaluation_fold` `ef`
+    JOIN `math_function` `m` ON `ef`.`function_id` = `m`.`id`
+    WHERE `ef`.`source` = :run_id
+      AND `ef`.`evaluation_engine_id` IN :engine_ids
+    """,
+).bindparams(bindparam("engine_ids", expanding=True))
+
+
 async def get_evaluations(
     run_id: int,
     expdb: AsyncConnection,
@@ -119,41 +151,28 @@ async def get_evaluations(
     if not evaluation_engine_ids:
         return []
 
-    query = text(
-        """
-        SELECT `m`.`name`, `e`.`value`, `e`.`array_data`, NULL as `repeat`, NULL as `fold`
-        FROM `evaluation` `e`
-        JOIN `math_function` `m` ON `e`.`function_id` = `m`.`id`
-        WHERE `e`.`source` = :run_id
-          AND `e`.`evaluation_engine_id` IN :engine_ids
-        UNION ALL
-        SELECT `m`.`name`, `ef`.`value`, `ef`.`array_data`, `ef`.`repeat`, `ef`.`fold`
-        FROM `evaluation_fold` `ef`
-        JOIN `math_function` `m` ON `ef`.`function_id` = `m`.`id`
-        WHERE `ef`.`source` = :run_id
-          AND `ef`.`evaluation_engine_id` IN :engine_ids
-        """,
-    ).bindparams(bindparam("engine_ids", expanding=True))
     rows = await expdb.execute(
-        query,
+        _GET_EVALUATIONS_QUERY,
         parameters={"run_id": run_id, "engine_ids": evaluation_engine_ids},
     )
     return cast("list[Row]", rows.all())
 
 
-async def get_trace(run_id: int, expdb: AsyncConnection) -> Sequence[Row]:
-    """Get trace rows for a run from the trace table."""
-    rows = await expdb.execute(
-        text(
-            """
-            SELECT `repeat`, `fold`, `iteration`, `setup_string`, `evaluation`, `selected`
-            FROM `trace`
-            WHERE `run_id` = :run_id
-            """,
-        ),
-        parameters={"run_id": run_id},
-    )
-    return cast(
-        "Sequence[Row]",
-        rows.all(),
-    )
+_GET_TRACE_QUERY = text(
+    """
+    SELECT `repeat`, `fold`, `iteration`, `setup_string`, `evaluation`, `selected`
+    FROM `trace`
+    WHERE `run_id` = :run_id
+    """,
+)
+
+
+async def stream_trace(run_id: int, expdb: AsyncConnection) -> AsyncIterator[Row]:
+    """Yield the trace rows of a run, without loading the whole trace into memory.
+
+    The rows are read through a server-side cursor, so no other query can be executed
+    on `expdb` until the iterator is exhausted or closed.
+    """
+    async with expdb.stream(_GET_TRACE_QUERY, parameters={"run_id": run_id}) as rows:
+        async for row in rows:
+            yield row
@@ -1,13 +1,57 @@
+import asyncio
+import contextlib
+import dataclasses
 import functools
+import itertools
+import time
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING, Literal, cast
 
 from loguru import logger
+from sqlalchemy import event, text
 from sqlalchemy.engine import URL
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from config import DatabaseConfiguration, get_config
+from database.deadlines import add_execution_time_hint
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+    from sqlalchemy.pool import Pool, QueuePool
 
-def _create_engine(db_config: DatabaseConfiguration) -> AsyncEngine:
+
+@dataclasses.dataclass
+class PoolWaitStatistics:
+    """Time spent waiting on `engine.connect()`, which includes opening new connections."""
+
+    checkouts: int = 0
+    total_wait_ns: int = 0
+    max_wait_ns: int = 0
+
+    def record(self, wait_ns: int) -> None:
+        self.checkouts += 1
+        self.total_wait_ns += wait_ns
+        self.max_wait_ns = max(self.max_wait_ns, wait_ns)
+
+
+_wait_statistics: dict[str, PoolWaitStatistics] = {}
+
+
+# Pools are reported by a logical name, e.g., "expdb/replica-1", rather than by their
+# URL, which would reveal the host and user to anyone who can see the statistics.
+_pool_names: dict[Pool, str] = {}
+
+
+def _engine_name(engine: AsyncEngine) -> str:
+    return _pool_names[engine.pool]
+
+
+def _create_engine(
+    db_config: DatabaseConfiguration,
+    *,
+    name: str,
+) -> AsyncEngine:
+    """Create an engine for the database, with its own pool of connections."""
     db_url = URL.create(
         drivername=db_config.drivername,
         username=db_config.username,
@@ -18,34 +62,210 @@ def _create_engine(db_config: DatabaseConfiguration) -> AsyncEngine:
     )
 
     logger.info("Creating database engine for {db_url}", db_url=db_url)
-    return create_async_engine(
+    engine = create_async_engine(
         db_url,
         echo=db_config.echo,
-        pool_recycle=3600,
+        pool_size=db_config.pool_size,
+        max_overflow=db_config.max_overflow,
+        pool_timeout=db_config.pool_timeout,
+        pool_recycle=db_config.pool_recycle,
+        pool_pre_ping=db_config.pool_pre_ping,
+        pool_use_lifo=db_config.pool_use_lifo,
+        # Only connections in autocommit mode, see `_autocommit`, skip the rollback.
+        skip_autocommit_rollback=True,
     )
+    event.listen(engine.sync_engine, "before_cursor_execute", add_execution_time_hint, retval=True)
+    _pool_names[engine.pool] = name
+    return engine
 
 
 @functools.cache
 def user_database() -> AsyncEngine:
-    return _create_engine(get_config().openml_database)
+    return _create_engine(get_config().openml_database, name="user/primary")
 
 
 @functools.cache
 def expdb_database() -> AsyncEngine:
-    return _create_engine(get_config().expdb_database)
+    return _create_engine(get_config().expdb_database, name="expdb/primary")
+
+
+def _autocommit(engine: AsyncEngine) -> AsyncEngine:
+    """Return a view of the engine that runs every statement in autocommit mode.
+
+    The view shares the pool of `engine`. Its connections do not need a COMMIT to end
+    their transaction, nor a ROLLBACK when they are returned to the pool, and InnoDB
+    does not keep a read view open for the whole request.
+    """
+    return engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def _create_read_engines(
+    db_config: DatabaseConfiguration,
+    primary: AsyncEngine,
+    database: Literal["user", "expdb"],
+) -> tuple[AsyncEngine, ...]:
+    """Create an autocommit engine per replica, or use the primary if there are none."""
+    if not db_config.replicas:
+        return (_autocommit(primary),)
+    return tuple(
+        _autocommit(
+            _create_engine(
+                db_config.model_copy(update={"host": replica.host, "port": replica.port}),
+                name=f"{database}/replica-{i}",
+            ),
+        )
+        for i, replica in enumerate(db_config.replicas, start=1)
+    )
+
+
+@functools.cache
+def user_read_databases() -> tuple[AsyncEngine, ...]:
+    return _create_read_engines(get_config().openml_database, user_database(), "user")
+
+
+@functools.cache
+def expdb_read_databases() -> tuple[AsyncEngine, ...]:
+    return _create_read_engines(get_config().expdb_database, expdb_database(), "expdb")
+
+
+_read_counter = itertools.count()
+
+
+def _read_engine(engines: tuple[AsyncEngine, ...]) -> AsyncEngine:
+    """Return the next engine in round-robin order."""
+    return engines[next(_read_counter) % len(engines)]
+
+
+def user_read_database() -> AsyncEngine:
+    """Return an engine for work that does not write to the user database."""
+    return _read_engine(user_read_databases())
+
+
+def expdb_read_database() -> AsyncEngine:
+    """Return an engine for work that does not write to the experiment database."""
+    return _read_engine(expdb_read_databases())
+
+
+def is_autocommit(engine: AsyncEngine) -> bool:
+    """Whether the engine was created for reads, i.e., in autocommit mode."""
+    return engine.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+
+@contextlib.asynccontextmanager
+async def connect(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """Check out a connection from the engine's pool, recording how long that took."""
+    start_ns = time.monotonic_ns()
+    async with engine.connect() as connection:
+        wait_ns = time.monotonic_ns() - start_ns
+        _wait_statistics.setdefault(_engine_name(engine), PoolWaitStatistics()).record(wait_ns)
+        yield connection
+
+
+def has_idle_connection(engine: AsyncEngine) -> bool:
+    """Whether a connection can be checked out of the engine's pool without waiting."""
+    return cast("QueuePool", engine.pool).checkedin() > 0
+
+
+def _distinct_pools(engines: Iterable[AsyncEngine]) -> list[AsyncEngine]:
+    """Keep the first engine of each pool, as read engines may share the primary's pool."""
+    pools: dict[Pool, AsyncEngine] = {}
+    for engine in engines:
+        pools.setdefault(engine.pool, engine)
+    return list(pools.values())
+
+
+def _active_engines() -> list[AsyncEngine]:
+    engines = [db() for db in (user_database, expdb_database) if db.cache_info().currsize == 1]
+    for read_engines in (user_read_databases, expdb_read_databases):
+        if read_engines.cache_info().currsize == 1:
+            engines.extend(read_engines())
+    return _distinct_pools(engines)
+
+
+def pool_statistics() -> list[dict[str, str | int | float]]:
+    """Report the live state of the connection pool of every engine created so far."""
+    statistics: list[dict[str, str | int | float]] = []
+    for engine in _active_engines():
+        pool = cast("QueuePool", engine.pool)
+        name = _engine_name(engine)
+        waits = _wait_statistics.get(name, PoolWaitStatistics())
+        statistics.append(
+            {
+                "engine": name,
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checkouts": waits.checkouts,
+                "wait_ms_total": waits.total_wait_ns / 1_000_000,
+                "wait_ms_max": waits.max_wait_ns / 1_000_000,
+                "wait_ms_mean": (
+                    waits.total_wait_ns / waits.checkouts / 1_000_000 if waits.checkouts else 0
+                ),
+            },
+        )
+    return statistics
+
+
+_databases_ready = False
+
+
+def databases_ready() -> bool:
+    """Whether `prepare_databases` succeeded since the databases were last closed."""
+    return _databases_ready
+
+
+_PROBE_QUERY = text("SELECT 1")
+
+
+async def _warm_up(engine: AsyncEngine, db_config: DatabaseConfiguration) -> None:
+    """Open connections up to the configured number, and check each with a trivial query."""
+    n_connections = db_config.warm_up_connections
+    if db_config.pool_size > 0:
+        n_connections = min(n_connections, db_config.pool_size)
+    async with contextlib.AsyncExitStack() as stack:
+        connections = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(n_connections)),
+        )
+        await asyncio.gather(*(connection.execute(_PROBE_QUERY) for connection in connections))
+
+
+async def prepare_databases() -> bool:
+    """Create all engines and warm up their connection pools.
+
+    Returns whether every database responded, and records it for `databases_ready`.
+    """
+    global _databases_ready  # noqa: PLW0603
+    config = get_config()
+    user_engines = _distinct_pools((user_database(), *user_read_databases()))
+    expdb_engines = _distinct_pools((expdb_database(), *expdb_read_databases()))
+    engines = [
+        *((engine, config.openml_database) for engine in user_engines),
+        *((engine, config.expdb_database) for engine in expdb_engines),
+    ]
+    try:
+        await asyncio.gather(*(_warm_up(engine, db_config) for engine, db_config in engines))
+    except Exception:  # noqa: BLE001
+        logger.exception("Could not warm up the database connection pools.")
+        _databases_ready = False
+    else:
+        logger.info("Warmed up {n} database connection pools.", n=len(engines))
+        _databases_ready = True
+    return _databases_ready
 
 
 async def close_databases() -> None:
     """Close all database connections."""
-    for db in (user_database, expdb_database):
-        if db.cache_info().currsize == 1:
-            engine = db()
-            logger.info("Disposing of engine connected to {db_url}", db_url=engine.url)
-            try:
-                await engine.dispose()
-            except Exception:  # noqa: BLE001
-                logger.exception(
-                    "Issue disposing of database engine for {db_url}",
-                    db_url=engine.url,
-                )
-            db.cache_clear()
+    for engine in _active_engines():
+        logger.info("Disposing of engine connected to {db_url}", db_url=engine.url)
+        try:
+            await engine.dispose()
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "Issue disposing of database engine for {db_url}",
+                db_url=engine.url,
+            )
+    for db in (user_database, expdb_database, user_read_databases, expdb_read_databases):
+        db.cache_clear()
+    global _databases_ready  # noqa: PLW0603
+    _databases_ready = False
@@ -18,76 +18,96 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_GET_QUERY = text(
+    """
+    SELECT *
+    FROM algorithm_setup
+    WHERE sid = :setup_id
+    """,
+)
+
+
 async def get(setup_id: Identifier, connection: AsyncConnection) -> Row | None:
     """Get the setup with id `setup_id` from the database."""
     row = await connection.execute(
-        text(
-            """
-            SELECT *
-            FROM algorithm_setup
-            WHERE sid = :setup_id
-            """,
-        ),
+        _GET_QUERY,
         parameters={"setup_id": setup_id},
     )
     return row.first()
 
 
+_GET_PARAMETERS_QUERY = text(
+    """
+    SELECT
+        t_input.id as id,
+        t_input.implementation_id as flow_id,
+        t_impl.name AS flow_name,
+        CONCAT(t_impl.fullName, '_', t_input.name) AS full_name,
+        t_input.name AS parameter_name,
+        t_input.name AS name,
+        t_input.dataType AS data_type,
+        t_input.defaultValue AS default_value,
+        t_setting.value AS value
+    FROM input_setting t_setting
+    JOIN input t_input ON t_setting.input_id = t_input.id
+    JOIN implementation t_impl ON t_input.implementation_id = t_impl.id
+    WHERE t_setting.setup = :setup_id
+    ORDER BY t_impl.id, t_input.id
+    """,
+)
+
+
 async def get_parameters(setup_id: Identifier, connection: AsyncConnection) -> list[RowMapping]:
     """Get all parameters for setup with `setup_id` from the database."""
     rows = await connection.execute(
-        text(
-            """
-            SELECT
-                t_input.id as id,
-                t_input.implementation_id as flow_id,
-                t_impl.name AS flow_name,
-                CONCAT(t_impl.fullName, '_', t_input.name) AS full_name,
-                t_input.name AS parameter_name,
-                t_input.name AS name,
-                t_input.dataType AS data_type,
-                t_input.defaultValue AS default_value,
-                t_setting.value AS value
-            FROM input_setting t_setting
-            JOIN input t_input ON t_setting.input_id = t_input.id
-            JOIN implementation t_impl ON t_input.implementation_id = t_impl.id
-            WHERE t_setting.setup = :setup_id
-            ORDER BY t_impl.id, t_input.id
-            """,
-        ),
+        _GET_PARAMETERS_QUERY,
         parameters={"setup_id": setup_id},
     )
     return list(rows.mappings().all())
 
 
+_GET_TAGS_QUERY = text(
+    """
+    SELECT *
+    FROM setup_tag
+    WHERE id = :setup_id
+    """,
+)
+
+
 async def get_tags(setup_id: Identifier, connection: AsyncConnection) -> list[Row]:
     """Get all tags for setup with `setup_id` from the database."""
     rows = await connection.execute(
-        text(
-            """
-            SELECT *
-            FROM setup_tag
-            WHERE id = :setup_id
-            """,
-        ),
+        _GET_TAGS_QUERY,
         parameters={"setup_id": setup_id},
     )
     return list(rows.all())
 
 
+_UNTAG_QUERY = text(
+    """
+    DELETE FROM setup_tag
+    WHERE id = :setup_id AND tag = :tag
+    """,
+)
+
+
 async def untag(setup_id: Identifier, tag: TagString, connection: AsyncConnection) -> None:
     """Remove tag `tag` from setup with id `setup_id`."""
     await connection.execute(
-        text(
-            """
-            DELETE FROM setup_tag
-            WHERE id = :setup_id AND tag = :tag
-            """,
-        ),
+        _UNTAG_QUERY,
         parameters={"setup_id": setup_id, "tag": tag},
     )
 
 
+_TAG_QUERY = text(
+    """
+    INSERT INTO setup_tag (id, tag, uploader)
+    VALUES (:setup_id, :tag, :user_id)
+    """,
+)
+
+
 async def tag(
     setup_id: Identifier,
     tag: TagString,
@@ -97,12 +117,7 @@ async def tag(
     """Add tag `tag` to setup with id `setup_id`."""
     try:
         await connection.execute(
-            text(
-                """
-                INSERT INTO setup_tag (id, tag, uploader)
-                VALUES (:setup_id, :tag, :user_id)
-                """,
-            ),
+            _TAG_QUERY,
             parameters={"setup_id": setup_id, "tag": tag, "user_id": user_id},
         )
     except IntegrityError as e:
@@ -1,5 +1,5 @@
 import re
-from collections.abc import Sequence
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, cast
 
@@ -13,93 +13,100 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_GET_BY_ID_QUERY = text(
+    """
+    SELECT *, main_entity_type as type_
+    FROM study
+    WHERE id = :study_id
+    """,
+)
+
+
 async def get_by_id(id_: Identifier, connection: AsyncConnection) -> Row | None:
     row = await connection.execute(
-        text(
-            """
-            SELECT *, main_entity_type as type_
-            FROM study
-            WHERE id = :study_id
-            """,
-        ),
+        _GET_BY_ID_QUERY,
         parameters={"study_id": id_},
     )
     return row.one_or_none()
 
 
+_GET_BY_ALIAS_QUERY = text(
+    """
+    SELECT *, main_entity_type as type_
+    FROM study
+    WHERE alias = :study_id
+    """,
+)
+
+
 async def get_by_alias(alias: str, connection: AsyncConnection) -> Row | None:
     row = await connection.execute(
-        text(
-            """
-            SELECT *, main_entity_type as type_
-            FROM study
-            WHERE alias = :study_id
-            """,
-        ),
+        _GET_BY_ALIAS_QUERY,
         parameters={"study_id": alias},
     )
     return row.one_or_none()
 
 
-async def get_study_data(study: Row, expdb: AsyncConnection) -> Sequence[Row]:
-    """Return data related to the study, content depends on the study type.
+_GET_TASK_STUDY_DATA_QUERY = text(
+    """
+    SELECT ts.task_id as task_id, ti.value as data_id
+    FROM task_study as ts LEFT JOIN task_inputs ti ON ts.task_id = ti.task_id
+    WHERE ts.study_id = :study_id AND ti.input = 'source_data'
+    """,
+)
+
+_GET_RUN_STUDY_DATA_QUERY = text(
+    """
+    SELECT
+        rs.run_id as run_id,
+        run.task_id as task_id,
+        run.setup as setup_id,
+        ti.value as data_id,
+        setup.implementation_id as flow_id
+    FROM run_study as rs
+    JOIN run ON run.rid = rs.run_id
+    JOIN algorithm_setup as setup ON setup.sid = run.setup
+    JOIN task_inputs as ti ON ti.task_id = run.task_id
+    WHERE rs.study_id = :study_id AND ti.input = 'source_data'
+    """,
+)
+
+
+async def stream_study_data(study: Row, expdb: AsyncConnection) -> AsyncIterator[Row]:
+    """Yield data related to the study, content depends on the study type.
 
     For task studies: (task id, dataset id)
     For run studies: (run id, task id, setup id, dataset id, flow id)
+
+    The rows are read through a server-side cursor, so no other query can be executed
+    on `expdb` until the iterator is exhausted or closed.
     """
-    if study.type_ == StudyType.TASK:
-        rows = await expdb.execute(
-            text(
-                """
-                SELECT ts.task_id as task_id, ti.value as data_id
-                FROM task_study as ts LEFT JOIN task_inputs ti ON ts.task_id = ti.task_id
-                WHERE ts.study_id = :study_id AND ti.input = 'source_data'
-                """,
-            ),
-            parameters={"study_id": study.id},
-        )
-        return cast(
-            "Sequence[Row]",
-            rows.all(),
-        )
-    rows = await expdb.execute(
-        text(
-            """
-            SELECT
-                rs.run_id as run_id,
-                run.task_id as task_id,
-                run.setup as setup_id,
-                ti.value as data_id,
-                setup.implementation_id as flow_id
-            FROM run_study as rs
-            JOIN run ON run.rid = rs.run_id
-            JOIN algorithm_setup as setup ON setup.sid = run.setup
-            JOIN task_inputs as ti ON ti.task_id = run.task_id
-            WHERE rs.study_id = :study_id AND ti.input = 'source_data'
-            """,
-        ),
-        parameters={"study_id": study.id},
+    query = (
+        _GET_TASK_STUDY_DATA_QUERY if study.type_ == StudyType.TASK else _GET_RUN_STUDY_DATA_QUERY
     )
-    return cast(
-        "Sequence[Row]",
-        rows.all(),
+    async with expdb.stream(query, parameters={"study_id": study.id}) as rows:
+        async for row in rows:
+            yield row
+
+
+_CREATE_QUERY = text(
+    """
+    INSERT INTO study (
+        name, alias, benchmark_suite, main_entity_type, description,
+        creator, legacy, creation_date
+    )
+    VALUES (
+        :name, :alias, :benchmark_suite, :main_entity_type, :description,
+         :creator, 'n', :creation_date
     )
+    """,
+)
+_LAST_INSERT_ID_QUERY = text("SELECT LAST_INSERT_ID();")
 
 
 async def create(study: CreateStudy, user: User, expdb: AsyncConnection) -> int:
     await expdb.execute(
-        text(
-            """
-            INSERT INTO study (
-                name, alias, benchmark_suite, main_entity_type, description,
-                creator, legacy, creation_date
-            )
-            VALUES (
-                :name, :alias, :benchmark_suite, :main_entity_type, :description,
-                 :creator, 'n', :creation_date
-            )
-            """,
-        ),
+        _CREATE_QUERY,
         parameters={
             "name": study.name,
             "alias": study.alias,
@@ -110,11 +117,19 @@ async def create(study: CreateStudy, user: User, expdb: AsyncConnection) -> int:
             "benchmark_suite": study.benchmark_suite,
         },
     )
-    row = await expdb.execute(text("""SELECT LAST_INSERT_ID();"""))
+    row = await expdb.execute(_LAST_INSERT_ID_QUERY)
     (study_id,) = row.one()
     return cast("int", study_id)
 
 
+_ATTACH_TASK_QUERY = text(
+    """
+    INSERT INTO task_study (study_id, task_id, uploader)
+    VALUES (:study_id, :task_id, :user_id)
+    """,
+)
+
+
 async def attach_task(
     task_id: Identifier,
     study_id: Identifier,
@@ -122,16 +137,19 @@ async def attach_task(
     expdb: AsyncConnection,
 ) -> None:
     await expdb.execute(
-        text(
-            """
-            INSERT INTO task_study (study_id, task_id, uploader)
-            VALUES (:study_id, :task_id, :user_id)
-            """,
-        ),
+        _ATTACH_TASK_QUERY,
         parameters={"study_id": study_id, "task_id": task_id, "user_id": user.user_id},
     )
 
 
+_ATTACH_RUN_QUERY = text(
+    """
+    INSERT INTO run_study (study_id, run_id, uploader)
+    VALUES (:study_id, :run_id, :user_id)
+    """,
+)
+
+
 async def attach_run(
     *,
     run_id: Identifier,
@@ -140,16 +158,19 @@ async def attach_run(
     expdb: AsyncConnection,
 ) -> None:
     await expdb.execute(
-        text(
-            """
-            INSERT INTO run_study (study_id, run_id, uploader)
-            VALUES (:study_id, :run_id, :user_id)
-            """,
-        ),
+        _ATTACH_RUN_QUERY,
         parameters={"study_id": study_id, "run_id": run_id, "user_id": user.user_id},
     )
 
 
+_ATTACH_TASKS_QUERY = text(
+    """
+    INSERT INTO task_study (study_id, task_id, uploader)
+    VALUES (:study_id, :task_id, :user_id)
+    """,
+)
+
+
 async def attach_tasks(
     *,
     study_id: int,
@@ -160,12 +181,7 @@ async def attach_tasks(
     to_link = [(study_id, task_id, user.user_id) for task_id in task_ids]
     try:
         await connection.execute(
-            text(
-                """
-                INSERT INTO task_study (study_id, task_id, uploader)
-                VALUES (:study_id, :task_id, :user_id)
-                """,
-            ),
+            _ATTACH_TASKS_QUERY,
             parameters=[{"study_id": s, "task_id": t, "user_id": u} for s, t, u in to_link],
         )
     except Exception as e:
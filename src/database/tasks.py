@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING, cast
 from sqlalchemy import Row, text
 from sqlalchemy.exc import IntegrityError
 
+from core.cache import cached
+from database.caches import reference_data
 from database.exceptions import (
     _DUPLICATE_ENTRY,
     _FOREIGN_KEY_CONSTRAINT_FAILED,
@@ -13,31 +15,39 @@ from database.exceptions import (
 from routers.types import Identifier, TagString
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine import RowMapping
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+_GET_QUERY = text(
+    """
+    SELECT *
+    FROM task
+    WHERE `task_id` = :task_id
+    """,
+)
+
+
 async def get(id_: Identifier, expdb: AsyncConnection) -> Row | None:
     row = await expdb.execute(
-        text(
-            """
-            SELECT *
-            FROM task
-            WHERE `task_id` = :task_id
-            """,
-        ),
+        _GET_QUERY,
         parameters={"task_id": id_},
     )
     return row.one_or_none()
 
 
+_GET_TASK_TYPES_QUERY = text(
+    """
+    SELECT `ttid`, `name`, `description`, `creator`
+    FROM task_type
+    """,
+)
+
+
+@cached(reference_data)
 async def get_task_types(expdb: AsyncConnection) -> Sequence[Row]:
     rows = await expdb.execute(
-        text(
-            """
-       SELECT `ttid`, `name`, `description`, `creator`
-       FROM task_type
-       """,
-        ),
+        _GET_TASK_TYPES_QUERY,
     )
     return cast(
         "Sequence[Row]",
@@ -45,20 +55,51 @@ async def get_task_types(expdb: AsyncConnection) -> Sequence[Row]:
     )
 
 
+_GET_TASK_TYPE_QUERY = text(
+    """
+    SELECT *
+    FROM task_type
+    WHERE `ttid`=:ttid
+    """,
+)
+
+
+@cached(reference_data)
 async def get_task_type(task_type_id: Identifier, expdb: AsyncConnection) -> Row | None:
     row = await expdb.execute(
-        text(
-            """
-        SELECT *
-        FROM task_type
-        WHERE `ttid`=:ttid
-        """,
-        ),
+        _GET_TASK_TYPE_QUERY,
         parameters={"ttid": task_type_id},
     )
     return row.one_or_none()
 
 
+async def get_lookup_row(table: str, id_: int, expdb: AsyncConnection) -> RowMapping | None:
+    """Return the row with `id_` of a table referred to by a task template LOOKUP directive."""
+    # Table names can not be parametrized, they come from the task type templates.
+    row = await expdb.execute(
+        text(f"SELECT * FROM `{table}` WHERE `id` = :id_"),  # noqa: S608
+        parameters={"id_": id_},
+    )
+    return row.mappings().one_or_none()
+
+
+@cached(reference_data)
+async def get_lookup_table(table: str, expdb: AsyncConnection) -> dict[int, RowMapping]:
+    """Return all rows by id of a small table referred to by task template LOOKUP directives."""
+    rows = await expdb.execute(text(f"SELECT * FROM `{table}`"))  # noqa: S608
+    return {row["id"]: row for row in rows.mappings()}
+
+
+_GET_TASK_TYPE_NAME_QUERY = text(
+    """
+    SELECT `tt`.`name`
+    FROM `task` `t`
+    JOIN `task_type` `tt` ON `t`.`ttid` = `tt`.`ttid`
+    WHERE `t`.`task_id` = :task_id
+    """,
+)
+
+
 async def get_task_type_name(task_id: int, expdb: AsyncConnection) -> str | None:
     """Fetch the human-readable task type name for the task associated with a run.
 
@@ -66,20 +107,23 @@ async def get_task_type_name(task_id: int, expdb: AsyncConnection) -> str | None
     (e.g. "Supervised Classification").
     """
     row = await expdb.execute(
-        text(
-            """
-            SELECT `tt`.`name`
-            FROM `task` `t`
-            JOIN `task_type` `tt` ON `t`.`ttid` = `tt`.`ttid`
-            WHERE `t`.`task_id` = :task_id
-            """,
-        ),
+        _GET_TASK_TYPE_NAME_QUERY,
         parameters={"task_id": task_id},
     )
     result = row.one_or_none()
     return result.name if result else None
 
 
+_GET_TASK_EVALUATION_MEASURE_QUERY = text(
+    """
+    SELECT `value`
+    FROM `task_inputs`
+    WHERE `task_id` = :task_id
+      AND `input` = 'evaluation_measures'
+    """,
+)
+
+
 async def get_task_evaluation_measure(task_id: int, expdb: AsyncConnection) -> str | None:
     """Fetch the evaluation measure configured for a task, if any.
 
@@ -88,29 +132,26 @@ async def get_task_evaluation_measure(task_id: int, expdb: AsyncConnection) -> s
     can treat a falsy result uniformly.
     """
     row = await expdb.execute(
-        text(
-            """
-            SELECT `value`
-            FROM `task_inputs`
-            WHERE `task_id` = :task_id
-              AND `input` = 'evaluation_measures'
-            """,
-        ),
+        _GET_TASK_EVALUATION_MEASURE_QUERY,
         parameters={"task_id": task_id},
     )
     result = row.one_or_none()
     return result.value if result else None
 
 
+_GET_INPUT_FOR_TASK_TYPE_QUERY = text(
+    """
+    SELECT *
+    FROM task_type_inout
+    WHERE `ttid`=:ttid AND `io`='input'
+    """,
+)
+
+
+@cached(reference_data)
 async def get_input_for_task_type(task_type_id: int, expdb: AsyncConnection) -> Sequence[Row]:
     rows = await expdb.execute(
-        text(
-            """
-        SELECT *
-        FROM task_type_inout
-        WHERE `ttid`=:ttid AND `io`='input'
-        """,
-        ),
+        _GET_INPUT_FOR_TASK_TYPE_QUERY,
         parameters={"ttid": task_type_id},
     )
     return cast(
@@ -119,15 +160,18 @@ async def get_input_for_task_type(task_type_id: int, expdb: AsyncConnection) ->
     )
 
 
+_GET_INPUT_FOR_TASK_QUERY = text(
+    """
+    SELECT `input`, `value`
+    FROM task_inputs
+    WHERE task_id = :task_id
+    """,
+)
+
+
 async def get_input_for_task(id_: Identifier, expdb: AsyncConnection) -> Sequence[Row]:
     rows = await expdb.execute(
-        text(
-            """
-            SELECT `input`, `value`
-            FROM task_inputs
-            WHERE task_id = :task_id
-            """,
-        ),
+        _GET_INPUT_FOR_TASK_QUERY,
         parameters={"task_id": id_},
     )
     return cast(
@@ -136,18 +180,21 @@ async def get_input_for_task(id_: Identifier, expdb: AsyncConnection) -> Sequenc
     )
 
 
+_GET_TASK_TYPE_INOUT_WITH_TEMPLATE_QUERY = text(
+    """
+    SELECT *
+    FROM task_type_inout
+    WHERE `ttid`=:ttid AND `template_api` IS NOT NULL
+    """,
+)
+
+
 async def get_task_type_inout_with_template(
     task_type: Identifier,
     expdb: AsyncConnection,
 ) -> Sequence[Row]:
     rows = await expdb.execute(
-        text(
-            """
-            SELECT *
-            FROM task_type_inout
-            WHERE `ttid`=:ttid AND `template_api` IS NOT NULL
-            """,
-        ),
+        _GET_TASK_TYPE_INOUT_WITH_TEMPLATE_QUERY,
         parameters={"ttid": task_type},
     )
     return cast(
@@ -156,21 +203,32 @@ async def get_task_type_inout_with_template(
     )
 
 
+_GET_TAGS_QUERY = text(
+    """
+    SELECT `tag`
+    FROM task_tag
+    WHERE `id` = :task_id
+    """,
+)
+
+
 async def get_tags(id_: Identifier, connection: AsyncConnection) -> list[str]:
     rows = await connection.execute(
-        text(
-            """
-            SELECT `tag`
-            FROM task_tag
-            WHERE `id` = :task_id
-            """,
-        ),
+        _GET_TAGS_QUERY,
         parameters={"task_id": id_},
     )
     tag_rows = rows.all()
     return [row.tag for row in tag_rows]
 
 
+_TAG_QUERY = text(
+    """
+    INSERT INTO task_tag(`id`, `tag`, `uploader`)
+    VALUES (:task_id, :tag, :user_id)
+    """,
+)
+
+
 async def tag(
     id_: Identifier,
     tag_: TagString,
@@ -180,12 +238,7 @@ async def tag(
 ) -> None:
     try:
         await connection.execute(
-            text(
-                """
-        INSERT INTO task_tag(`id`, `tag`, `uploader`)
-        VALUES (:task_id, :tag, :user_id)
-        """,
-            ),
+            _TAG_QUERY,
             parameters={
                 "task_id": id_,
                 "user_id": user_id,
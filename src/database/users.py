@@ -4,10 +4,15 @@ import re
 from enum import IntEnum
 from typing import TYPE_CHECKING, Annotated, Self
 
+from loguru import logger
 from pydantic import AfterValidator
 from sqlalchemy import text
 
 from config import get_config
+from core.cache import broadcast_invalidation, cached
+from core.shared_cache import RedisError
+from database.caches import api_keys
+from database.connection import after_commit
 from routers.types import Identifier
 
 if TYPE_CHECKING:
@@ -43,6 +48,24 @@ class UserGroup(IntEnum):
     READ_ONLY = (3,)
 
 
+_GET_USER_BY_API_KEY_QUERY = text(
+    """
+    SELECT id, first_name, last_name
+    FROM users
+    WHERE session_hash = :api_key
+    LIMIT 1
+    """,
+)
+_GET_USER_BY_ID_QUERY = text(
+    """
+    SELECT id, first_name, last_name
+    FROM users
+    WHERE id = :user_id
+    LIMIT 1
+    """,
+)
+
+
 async def get_user(
     *,
     connection: AsyncConnection,
@@ -54,23 +77,9 @@ async def get_user(
         msg = "Exactly one of api_key or user_id must be provided."
         raise ValueError(msg)
 
-    if api_key is not None:
-        query = """
-        SELECT id, first_name, last_name
-        FROM users
-        WHERE session_hash = :api_key
-        LIMIT 1
-        """
-    else:
-        query = """
-        SELECT id, first_name, last_name
-        FROM users
-        WHERE id = :user_id
-        LIMIT 1
-        """
-
+    query = _GET_USER_BY_API_KEY_QUERY if api_key is not None else _GET_USER_BY_ID_QUERY
     result = await connection.execute(
-        text(query),
+        query,
         parameters={"api_key": api_key, "user_id": user_id},
     )
     row = result.one_or_none()
@@ -84,25 +93,45 @@ async def get_user(
     return None
 
 
+_GET_USER_GROUPS_FOR_QUERY = text(
+    """
+    SELECT group_id
+    FROM users_groups
+    WHERE user_id = :user_id
+    """,
+)
+
+
 async def get_user_groups_for(
     *,
     user_id: Identifier,
     connection: AsyncConnection,
 ) -> list[UserGroup]:
     row = await connection.execute(
-        text(
-            """
-    SELECT group_id
-    FROM users_groups
-    WHERE user_id = :user_id
-    """,
-        ),
+        _GET_USER_GROUPS_FOR_QUERY,
         parameters={"user_id": user_id},
     )
     rows = row.all()
     return [UserGroup(group) for (group,) in rows]
 
 
+@dataclasses.dataclass(frozen=True)
+class _Authentication:
+    user_id: Identifier
+    first_name: str
+    last_name: str
+    groups: tuple[UserGroup, ...]
+
+
+@cached(api_keys, tags=lambda authentication: [authentication.user_id] if authentication else [])
+async def _authenticate(api_key: APIKey, user_db: AsyncConnection) -> _Authentication | None:
+    user = await get_user(api_key=api_key, connection=user_db)
+    if user is None:
+        return None
+    groups = await user.get_groups()
+    return _Authentication(user.user_id, user.first_name, user.last_name, tuple(groups))
+
+
 @dataclasses.dataclass
 class User:
     user_id: Identifier
@@ -125,15 +154,20 @@ class User:
 
     @classmethod
     async def fetch(cls, api_key: APIKey, user_db: AsyncConnection) -> Self | None:
-        user = await get_user(api_key=api_key, connection=user_db)
-        if user is not None:
-            return cls(
-                user_id=user.user_id,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                _database=user_db,
-            )
-        return None
+        """Fetch the user with `api_key`, along with their groups.
+
+        Both are cached by API key in `api_keys`, as is the absence of a user.
+        """
+        authentication = await _authenticate(api_key, user_db)
+        if authentication is None:
+            return None
+        return cls(
+            user_id=authentication.user_id,
+            first_name=authentication.first_name,
+            last_name=authentication.last_name,
+            _database=user_db,
+            _groups=list(authentication.groups),
+        )
 
     async def get_groups(self) -> list[UserGroup]:
         if self._groups is None:
@@ -147,50 +181,78 @@ class User:
         return UserGroup.ADMIN in await self.get_groups()
 
 
+_EXISTS_BY_ID_QUERY = text("SELECT 1 FROM users WHERE id = :user_id LIMIT 1")
+
+
 async def exists_by_id(*, user_id: int, connection: AsyncConnection) -> bool:
     row = await connection.execute(
-        text("SELECT 1 FROM users WHERE id = :user_id LIMIT 1"),
+        _EXISTS_BY_ID_QUERY,
         parameters={"user_id": user_id},
     )
     return row.one_or_none() is not None
 
 
+_HAS_USER_REFERENCES_QUERY = text(
+    """
+    SELECT EXISTS (
+        SELECT 1 FROM dataset              WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM dataset_description WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM dataset_status      WHERE user_id  = :uid
+        UNION ALL SELECT 1 FROM dataset_tag         WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM dataset_topic       WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM implementation      WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM implementation_tag  WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM `run`               WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM run_study           WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM run_tag             WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM setup_tag           WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM study               WHERE creator  = :uid
+        UNION ALL SELECT 1 FROM task                WHERE creator  = :uid
+        UNION ALL SELECT 1 FROM task_study          WHERE uploader = :uid
+        UNION ALL SELECT 1 FROM task_tag            WHERE uploader = :uid
+    ) AS has_refs
+    """,
+)
+
+
 async def has_user_references(*, user_id: int, expdb: AsyncConnection) -> bool:
     """Return ``True`` if any ``expdb`` row still references ``user_id``."""
     row = await expdb.execute(
-        text(
-            """
-            SELECT EXISTS (
-                SELECT 1 FROM dataset              WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM dataset_description WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM dataset_status      WHERE user_id  = :uid
-                UNION ALL SELECT 1 FROM dataset_tag         WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM dataset_topic       WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM implementation      WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM implementation_tag  WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM `run`               WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM run_study           WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM run_tag             WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM setup_tag           WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM study               WHERE creator  = :uid
-                UNION ALL SELECT 1 FROM task                WHERE creator  = :uid
-                UNION ALL SELECT 1 FROM task_study          WHERE uploader = :uid
-                UNION ALL SELECT 1 FROM task_tag            WHERE uploader = :uid
-            ) AS has_refs
-            """,
-        ),
+        _HAS_USER_REFERENCES_QUERY,
         parameters={"uid": user_id},
     )
     return bool(row.scalar_one())
 
 
+_DELETE_USER_GROUPS_QUERY = text("DELETE FROM users_groups WHERE user_id = :user_id")
+_DELETE_USER_QUERY = text("DELETE FROM users WHERE id = :user_id")
+
+
 async def delete_user_rows(*, user_id: int, userdb: AsyncConnection) -> None:
-    """Remove group memberships then the user row (openml user database)."""
+    """Remove group memberships then the user row (openml user database).
+
+    Once that is committed, the user's API keys are removed from `api_keys` so they
+    stop authenticating. Other workers clear their whole `api_keys` cache when they next
+    check for invalidations (see `core.cache.broadcast_invalidation`), or, if the shared
+    cache is unavailable, authenticate the keys until their entries expire.
+    """
     await userdb.execute(
-        text("DELETE FROM users_groups WHERE user_id = :user_id"),
+        _DELETE_USER_GROUPS_QUERY,
         parameters={"user_id": user_id},
     )
     await userdb.execute(
-        text("DELETE FROM users WHERE id = :user_id"),
+        _DELETE_USER_QUERY,
         parameters={"user_id": user_id},
     )
+
+    async def forget_api_keys() -> None:
+        api_keys.invalidate_tag(user_id)
+        try:
+            await broadcast_invalidation(api_keys.name)
+        except OSError, RedisError:
+            logger.exception(
+                "Could not have other workers forget the API keys of {user_id}.",
+                user_id=user_id,
+            )
+
+    await after_commit(userdb, forget_api_keys)
@@ -5,9 +5,10 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.exceptions import RequestValidationError
 from loguru import logger
+from sqlalchemy.exc import OperationalError
 
 from config import (
     Configuration,
@@ -15,6 +16,10 @@ from config import (
     parse_config,
     set_config,
 )
+from core.admission import AdmissionControlMiddleware
+from core.cache import configure_caches, watch_invalidations
+from core.cancellation import CancelOnDisconnectMiddleware
+from core.conditional import ConditionalRequestMiddleware
 from core.errors import (
     ProblemDetailError,
     problem_detail_exception_handler,
@@ -26,7 +31,11 @@ from core.logging import (
     request_response_logger,
     setup_log_sinks,
 )
-from database.setup import close_databases
+from core.response_cache import ResponseCacheMiddleware
+from core.shared_cache import close_shared_cache
+from database.deadlines import operational_error_handler
+from database.setup import close_databases, prepare_databases
+from routers.dependencies import apply_query_deadline
 from routers.openml.datasets import router as datasets_router
 from routers.openml.estimation_procedure import router as estimationprocedure_router
 from routers.openml.evaluations import router as evaluationmeasures_router
@@ -38,6 +47,7 @@ from routers.openml.study import router as study_router
 from routers.openml.tasks import router as task_router
 from routers.openml.tasktype import router as ttype_router
 from routers.openml.users import router as users_router
+from routers.system import router as system_router
 
 
 @asynccontextmanager
@@ -45,10 +55,18 @@ async def lifespan(
     app: FastAPI | None,  # noqa: ARG001 # parameter required by FastAPI/Starlette
 ) -> AsyncIterator[None]:
     """Manage application lifespan - startup and shutdown events."""
+    # Open connections before serving, so the first requests do not wait on them.
+    # If a database is unreachable the app still starts, but reports it is not ready.
+    await prepare_databases()
+    invalidations = asyncio.create_task(
+        watch_invalidations(get_config().shared_cache.invalidation_interval),
+    )
     yield
+    invalidations.cancel()
     await asyncio.gather(
         logger.complete(),
         close_databases(),
+        close_shared_cache(),
     )
 
 
@@ -85,20 +103,30 @@ def create_api(configuration: Configuration | None = None) -> FastAPI:
     config = configuration or parse_config()
     set_config(config)
     setup_log_sinks(*get_config().logging)
+    configure_caches(get_config().caches)
 
     root_path = get_config().routing.root_path
     logger.info("Creating FastAPI App", lifespan=lifespan, root_path=root_path)
-    app = FastAPI(lifespan=lifespan, root_path=root_path)
+    app = FastAPI(
+        lifespan=lifespan,
+        root_path=root_path,
+        dependencies=[Depends(apply_query_deadline)],
+    )
 
     logger.info("Setting up middleware and exception handlers.")
     # Order matters! Each added middleware wraps the previous, creating a stack.
     # See also: https://fastapi.tiangolo.com/tutorial/middleware/#multiple-middleware-execution-order
+    app.add_middleware(ResponseCacheMiddleware, configuration=get_config().response_cache)
+    app.add_middleware(ConditionalRequestMiddleware, cache_control=get_config().cache_control)
+    app.add_middleware(AdmissionControlMiddleware, configuration=get_config().admission)
+    app.add_middleware(CancelOnDisconnectMiddleware)
     app.middleware("http")(request_response_logger)
     app.middleware("http")(log_request_duration)
     app.middleware("http")(add_request_context_to_log)
 
     app.add_exception_handler(ProblemDetailError, problem_detail_exception_handler)  # type: ignore[arg-type]
     app.add_exception_handler(RequestValidationError, validation_exception_handler)  # type: ignore[arg-type]
+    app.add_exception_handler(OperationalError, operational_error_handler)  # type: ignore[arg-type]
 
     logger.info("Adding routers to app")
     app.include_router(datasets_router)
@@ -112,6 +140,7 @@ def create_api(configuration: Configuration | None = None) -> FastAPI:
     app.include_router(setup_router)
     app.include_router(run_router)
     app.include_router(users_router)
+    app.include_router(system_router)
 
     logger.info("App setup completed.")
     logger.remove(setup_sink)
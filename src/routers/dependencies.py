@@ -1,30 +1,75 @@
+import base64
+import contextlib
 from collections.abc import AsyncGenerator, AsyncIterator
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, Self, cast
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.routing import APIRoute
 from loguru import logger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
+from config import DatabaseConfiguration, get_config
 from core.errors import AuthenticationFailedError, AuthenticationRequiredError
-from database.setup import expdb_database, user_database
+from database.connection import LazyConnection
+from database.deadlines import statement_deadline
+from database.setup import (
+    expdb_database,
+    expdb_read_database,
+    user_database,
+    user_read_database,
+)
 from database.users import APIKey, User
 
 if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncConnection
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+@contextlib.asynccontextmanager
+async def _lazy_connection(
+    engine: AsyncEngine,
+    configuration: DatabaseConfiguration,
+) -> AsyncIterator[AsyncConnection]:
+    async with LazyConnection(
+        engine,
+        max_parallel_queries=configuration.max_parallel_queries,
+    ) as connection:
+        # The `LazyConnection` supports the subset of the `AsyncConnection` interface
+        # that is used by the endpoints.
+        yield cast("AsyncConnection", connection)
 
 
 async def expdb_connection() -> AsyncIterator[AsyncConnection]:
-    engine = expdb_database()
-    async with engine.connect() as connection, connection.begin():
+    async with _lazy_connection(expdb_database(), get_config().expdb_database) as connection:
         yield connection
 
 
 async def userdb_connection() -> AsyncIterator[AsyncConnection]:
-    engine = user_database()
-    async with engine.connect() as connection, connection.begin():
+    async with _lazy_connection(user_database(), get_config().openml_database) as connection:
+        yield connection
+
+
+async def expdb_read_connection() -> AsyncIterator[AsyncConnection]:
+    """Yield a connection for endpoints that only read, it may be served by a replica."""
+    engine = expdb_read_database()
+    async with _lazy_connection(engine, get_config().expdb_database) as connection:
         yield connection
 
 
+async def userdb_read_connection() -> AsyncIterator[AsyncConnection]:
+    """Yield a connection for endpoints that only read, it may be served by a replica."""
+    engine = user_read_database()
+    async with _lazy_connection(engine, get_config().openml_database) as connection:
+        yield connection
+
+
+async def apply_query_deadline(request: Request) -> AsyncIterator[None]:
+    """Limit the execution time of the statements of the route, see `query_deadlines`."""
+    route = request.scope.get("route")
+    path = route.path if isinstance(route, APIRoute) else request.url.path
+    with statement_deadline(get_config().query_deadlines.for_route(path)):
+        yield
+
+
 async def fetch_user(
     api_key: APIKey | None = None,
     user_data: Annotated[AsyncConnection | None, Depends(userdb_connection)] = None,
@@ -63,6 +108,58 @@ LIMIT_DEFAULT = 100
 LIMIT_MAX = 1000
 
 
+# Response header with the cursor of the next page, the body of list endpoints is a list.
+NEXT_CURSOR_HEADER = "Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Return an opaque cursor for the page that starts after `last_id`."""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the id after which the page of `cursor` starts."""
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        last_id = int(base64.urlsafe_b64decode(cursor + padding))
+    except ValueError:
+        last_id = -1
+    if last_id < 0:
+        msg = "Invalid cursor, use the cursor of the previous page."
+        raise ValueError(msg)
+    return last_id
+
+
 class Pagination(BaseModel):
+    """Select a page either by `offset`, or by the `cursor` returned with the previous page.
+
+    Pages by cursor continue after the last id of the previous page, so the database does
+    not need to skip over all earlier rows, and no rows are skipped or repeated when rows
+    are added or removed in between.
+    """
+
     offset: int = Field(default=0, ge=0)
     limit: int = Field(default=LIMIT_DEFAULT, gt=0, le=LIMIT_MAX)
+    cursor: str | None = Field(
+        default=None,
+        description=f"Continue after the previous page, see its `{NEXT_CURSOR_HEADER}` header.",
+    )
+
+    @field_validator("cursor")
+    @classmethod
+    def _validate_cursor(cls, cursor: str | None) -> str | None:
+        if cursor is not None:
+            decode_cursor(cursor)
+        return cursor
+
+    @model_validator(mode="after")
+    def _offset_or_cursor(self) -> Self:
+        if self.offset and self.cursor is not None:
+            msg = "Specify either an offset or a cursor, not both."
+            raise ValueError(msg)
+        return self
+
+    @property
+    def after(self) -> int | None:
+        """The id after which the page starts, if paging by cursor."""
+        return None if self.cursor is None else decode_cursor(self.cursor)
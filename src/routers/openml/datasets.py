@@ -1,17 +1,17 @@
 import asyncio
-import re
 from datetime import datetime
 from enum import StrEnum
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Annotated, Any, Literal, NamedTuple, NotRequired, TypedDict
 
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Response
 from loguru import logger
 from sqlalchemy import bindparam, text
 
 import database.datasets
 import database.qualities
 from core.access import _user_has_access
+from core.coalescing import SingleFlight
 from core.errors import (
     DatasetAdminOnlyError,
     DatasetNoAccessError,
@@ -24,6 +24,7 @@ from core.errors import (
     DatasetStatusTransitionError,
     InternalError,
     NoResultsError,
+    ProblemDetailError,
     TagAlreadyExistsError,
     TagNotFoundError,
     TagNotOwnedError,
@@ -33,29 +34,42 @@ from core.formatting import (
     _format_dataset_url,
     _format_parquet_url,
 )
+from core.shared_cache import invalidate
+from database.connection import QueryFanOut, after_commit
 from database.exceptions import DuplicatePrimaryKeyError, ForeignKeyConstraintError
+from database.existence import may_exist
 from database.users import User
 from routers.dependencies import (
+    LIMIT_MAX,
+    NEXT_CURSOR_HEADER,
     Pagination,
+    encode_cursor,
     expdb_connection,
+    expdb_read_connection,
     fetch_user,
     fetch_user_or_raise,
-    userdb_connection,
+    userdb_read_connection,
 )
 from routers.types import (
     CasualString128,
     Identifier,
-    IntegerRange,
+    NumberRange,
     TagString,
-    integer_range_regex,
 )
-from schemas.datasets.openml import DatasetMetadata, DatasetStatus, Feature, FeatureType
+from schemas.datasets.openml import (
+    DatasetMetadata,
+    DatasetMetadataResult,
+    DatasetStatus,
+    Feature,
+    FeatureType,
+)
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Row
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
+_datasets_in_flight = SingleFlight("datasets")
 
 
 @router.post(
@@ -77,6 +91,7 @@ async def tag_dataset(
         raise TagAlreadyExistsError(msg) from None
 
     logger.info("Dataset {data_id} tagged '{tag}'.", data_id=data_id, tag=tag)
+    await after_commit(expdb_db, lambda: invalidate(f"dataset:{data_id}"))
 
     tags = await database.datasets.get_tags_for(data_id, expdb_db)
 
@@ -127,6 +142,7 @@ async def untag_dataset(
         msg = f"You are not allowed to remove {tag!r} from dataset {identifier}."
         raise TagNotOwnedError(msg)
     await database.datasets.delete_tag(identifier, tag, expdb_db)
+    await after_commit(expdb_db, lambda: invalidate(f"dataset:{identifier}"))
 
 
 class DatasetStatusFilter(StrEnum):
@@ -136,26 +152,9 @@ class DatasetStatusFilter(StrEnum):
     ALL = "all"
 
 
-def _quality_clause(quality: str, range_: str | None) -> str:
-    if not range_:
-        return ""
-    if not (match := re.match(integer_range_regex, range_)):
-        msg = f"`range_` not a valid range: {range_}"
-        raise ValueError(msg)
-    start, end = match.groups()
-    value = f"`value` BETWEEN {start} AND {end[2:]}" if end else f"`value`={start}"
-    return f""" AND
-        d.`did` IN (
-            SELECT `data`
-            FROM data_quality
-            WHERE `quality`='{quality}' AND {value}
-        )
-    """  # noqa: S608 - `quality` is not user provided, value is filtered with regex
-
-
 @router.post(path="/list", description="Provided for convenience, same as `GET` endpoint.")
 @router.get(path="/list")
-async def list_datasets(  # noqa: PLR0913, C901
+async def list_datasets(  # noqa: PLR0913, PLR0912, C901, PLR0915
     pagination: Annotated[Pagination, Body(default_factory=Pagination)],
     data_name: Annotated[CasualString128 | None, Body()] = None,
     tag: Annotated[TagString | None, Body()] = None,
@@ -174,27 +173,16 @@ async def list_datasets(  # noqa: PLR0913, C901
             "If none are specified, all datasets are included.",
         ),
     ] = None,
-    number_instances: Annotated[IntegerRange | None, Body()] = None,
-    number_features: Annotated[IntegerRange | None, Body()] = None,
-    number_classes: Annotated[IntegerRange | None, Body()] = None,
-    number_missing_values: Annotated[IntegerRange | None, Body()] = None,
+    number_instances: Annotated[NumberRange | None, Body()] = None,
+    number_features: Annotated[NumberRange | None, Body()] = None,
+    number_classes: Annotated[NumberRange | None, Body()] = None,
+    number_missing_values: Annotated[NumberRange | None, Body()] = None,
     status: Annotated[DatasetStatusFilter, Body()] = DatasetStatusFilter.ACTIVE,
     user: Annotated[User | None, Depends(fetch_user)] = None,
-    expdb_db: Annotated[AsyncConnection, Depends(expdb_connection)] = None,
+    expdb_db: Annotated[AsyncConnection, Depends(expdb_read_connection)] = None,
+    response: Response = None,
 ) -> list[dict[str, Any]]:
     assert expdb_db is not None  # noqa: S101
-    status_subquery = text(
-        """
-        SELECT ds1.`did`, ds1.`status`
-        FROM dataset_status as ds1
-        WHERE ds1.`status_date`=(
-            SELECT MAX(ds2.`status_date`)
-            FROM dataset_status as ds2
-            WHERE ds1.`did`=ds2.`did`
-        )
-        """,
-    )
-
     clauses = []
     parameters: dict[str, Any] = {
         "offset": pagination.offset,
@@ -226,6 +214,10 @@ async def list_datasets(  # noqa: PLR0913, C901
         clauses.append("AND d.`did` IN :data_ids")
         parameters["data_ids"] = data_id
 
+    if pagination.after is not None:
+        clauses.append("AND d.`did` > :after")
+        parameters["after"] = pagination.after
+
     # requires some benchmarking on whether e.g., IN () is more efficient.
     if tag:
         clauses.append(
@@ -239,26 +231,41 @@ async def list_datasets(  # noqa: PLR0913, C901
         )
         parameters["tag"] = tag
 
-    number_instances_filter = _quality_clause("NumberOfInstances", number_instances)
-    number_classes_filter = _quality_clause("NumberOfClasses", number_classes)
-    number_features_filter = _quality_clause("NumberOfFeatures", number_features)
-    number_missing_values_filter = _quality_clause("NumberOfMissingValues", number_missing_values)
+    summary = await database.qualities.has_summary_table(expdb_db)
+    quality_filters = [
+        database.qualities.range_clause(quality, range_, parameters, summary=summary)
+        for quality, range_ in [
+            ("NumberOfInstances", number_instances),
+            ("NumberOfFeatures", number_features),
+            ("NumberOfClasses", number_classes),
+            ("NumberOfMissingValues", number_missing_values),
+        ]
+    ]
 
     columns = ["did", "name", "version", "format", "file_id", "status"]
+    status_table = await database.datasets.current_status_table(expdb_db)
+    # The shown qualities are stored in a row per dataset, and the filtered ones are
+    # indexed, see `database.qualities.SUMMARY_QUALITIES`. Without that table, they are
+    # fetched for the datasets of the page.
+    quality_columns = "".join(
+        f",qs.`{quality}`" for quality in database.qualities.SUMMARY_QUALITIES if summary
+    )
+    summary_join = "LEFT JOIN dataset_quality_summary AS qs ON d.`did`=qs.`did`" if summary else ""
     matching_filter = text(
         f"""
         SELECT d.`did`,d.`name`,d.`version`,d.`format`,d.`file_id`,
-               IFNULL(cs.`status`, 'in_preparation')
+               IFNULL(cs.`status`, 'in_preparation') AS `status` {quality_columns}
         FROM dataset AS d
-        LEFT JOIN ({status_subquery}) AS cs ON d.`did`=cs.`did`
-        WHERE 1=1 {number_instances_filter} {number_features_filter}
-        {number_classes_filter} {number_missing_values_filter}
+        LEFT JOIN {status_table} AS cs ON d.`did`=cs.`did`
+        {summary_join}
+        WHERE 1=1 {" ".join(quality_filters)}
         {" ".join(clauses)}
+        ORDER BY d.`did`
         LIMIT :limit OFFSET :offset
         """,  # noqa: S608
         # I am not sure how to do this correctly without an error from Bandit here.
         # However, the `status` input is already checked by FastAPI to be from a set
-        # of given options, so no injection is possible (I think). The `current_status`
+        # of given options, so no injection is possible (I think). The `status_table`
         # subquery also has no user input. So I think this should be safe.
     )
 
@@ -268,44 +275,35 @@ async def list_datasets(  # noqa: PLR0913, C901
         matching_filter,
         parameters=parameters,
     )
-    rows = result.all()
-    datasets: dict[int, dict[str, Any]] = {
-        row.did: dict(zip(columns, row, strict=True)) for row in rows
-    }
-    if not datasets:
+    rows = result.mappings().all()
+    if not rows:
         msg = "No datasets match the search criteria."
         raise NoResultsError(msg)
-
-    for dataset in datasets.values():
+    if response is not None and len(rows) == pagination.limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["did"])
+
+    qualities_by_dataset = (
+        {}
+        if summary
+        else await database.qualities.get_for_datasets(
+            dataset_ids=[row["did"] for row in rows],
+            quality_names=database.qualities.SUMMARY_QUALITIES,
+            connection=expdb_db,
+        )
+    )
+    datasets = []
+    for row in rows:
+        dataset = {column: row[column] for column in columns}
         # The old API does not actually provide the checksum but just an empty field
         dataset["md5_checksum"] = ""
-        dataset["quality"] = []
+        dataset["quality"] = (
+            database.qualities.summary_to_qualities(row)
+            if summary
+            else qualities_by_dataset.get(row["did"], [])
+        )
         dataset["version"] = int(dataset["version"])
-
-    # The method of filtering and adding the qualities information is the same to
-    # how it was done in PHP. Something like a pivot table seems more reasonable
-    # to me. Pivot tables dont seem well supported though, would need to benchmark
-    # doing it in the DB probably with some view or many joins.
-    qualities_to_show = [
-        "MajorityClassSize",
-        "MaxNominalAttDistinctValues",
-        "MinorityClassSize",
-        "NumberOfClasses",
-        "NumberOfFeatures",
-        "NumberOfInstances",
-        "NumberOfInstancesWithMissingValues",
-        "NumberOfMissingValues",
-        "NumberOfNumericFeatures",
-        "NumberOfSymbolicFeatures",
-    ]
-    qualities_by_dataset = await database.qualities.get_for_datasets(
-        dataset_ids=datasets.keys(),
-        quality_names=qualities_to_show,
-        connection=expdb_db,
-    )
-    for did, qualities in qualities_by_dataset.items():
-        datasets[did]["quality"] = qualities
-    return list(datasets.values())
+        datasets.append(dataset)
+    return datasets
 
 
 class ProcessingInformation(NamedTuple):
@@ -314,17 +312,9 @@ class ProcessingInformation(NamedTuple):
     error: str | None
 
 
-async def _get_processing_information(
-    dataset_id: Identifier,
-    connection: AsyncConnection,
-) -> ProcessingInformation:
+def _processing_information(data_processed: Row | None) -> ProcessingInformation:
     """Return processing information, if any. Otherwise, all fields `None`."""
-    if not (
-        data_processed := await database.datasets.get_latest_processing_update(
-            dataset_id,
-            connection,
-        )
-    ):
+    if not data_processed:
         return ProcessingInformation(date=None, warning=None, error=None)
 
     date_processed = data_processed.processing_date
@@ -333,6 +323,15 @@ async def _get_processing_information(
     return ProcessingInformation(date=date_processed, warning=warning, error=error)
 
 
+async def _get_processing_information(
+    dataset_id: Identifier,
+    connection: AsyncConnection,
+) -> ProcessingInformation:
+    """Return processing information, if any. Otherwise, all fields `None`."""
+    data_processed = await database.datasets.get_latest_processing_update(dataset_id, connection)
+    return _processing_information(data_processed)
+
+
 async def _get_dataset_raise_otherwise(
     dataset_id: Identifier,
     user: User | None,
@@ -357,23 +356,23 @@ async def _get_dataset_raise_otherwise(
 async def get_dataset_features(
     dataset_id: Identifier,
     user: Annotated[User | None, Depends(fetch_user)] = None,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)] = None,
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)] = None,
 ) -> list[Feature]:
     assert expdb is not None  # noqa: S101
     await _get_dataset_raise_otherwise(dataset_id, user, expdb)
-    features, ontologies = await asyncio.gather(
-        database.datasets.get_features(dataset_id, expdb),
-        database.datasets.get_feature_ontologies(dataset_id, expdb),
+    fan_out = QueryFanOut(expdb)
+    # The values of all nominal features are fetched at once, not with a query per feature.
+    features, ontologies, values = await asyncio.gather(
+        fan_out(lambda connection: database.datasets.get_features(dataset_id, connection)),
+        fan_out(
+            lambda connection: database.datasets.get_feature_ontologies(dataset_id, connection),
+        ),
+        fan_out(lambda connection: database.datasets.get_feature_values(dataset_id, connection)),
     )
     for feature in features:
         feature.ontology = ontologies.get(feature.index)
-
-    for feature in [f for f in features if f.data_type == FeatureType.NOMINAL]:
-        feature.nominal_values = await database.datasets.get_feature_values(
-            dataset_id,
-            feature_index=feature.index,
-            connection=expdb,
-        )
+        if feature.data_type == FeatureType.NOMINAL:
+            feature.nominal_values = values.get(feature.index, [])
 
     if not features:
         processing_state = await database.datasets.get_latest_processing_update(dataset_id, expdb)
@@ -437,6 +436,7 @@ async def update_dataset_status(
     else:
         msg = f"Unknown status transition: {current_status} -> {status}"
         raise InternalError(msg)
+    await after_commit(expdb, lambda: invalidate(f"dataset:{dataset_id}"))
 
     logger.info(
         "Dataset {dataset_id} changed from {previous} to {current}",
@@ -454,12 +454,28 @@ async def update_dataset_status(
 async def get_dataset(
     dataset_id: Identifier,
     user: Annotated[User | None, Depends(fetch_user)] = None,
-    user_db: Annotated[AsyncConnection, Depends(userdb_connection)] = None,
-    expdb_db: Annotated[AsyncConnection, Depends(expdb_connection)] = None,
+    user_db: Annotated[AsyncConnection, Depends(userdb_read_connection)] = None,
+    expdb_db: Annotated[AsyncConnection, Depends(expdb_read_connection)] = None,
 ) -> DatasetMetadata:
     assert user_db is not None  # noqa: S101
     assert expdb_db is not None  # noqa: S101
+    if not await may_exist("dataset", dataset_id, expdb_db):
+        msg = f"No dataset with id {dataset_id} found."
+        raise DatasetNotFoundError(msg)
     dataset = await _get_dataset_raise_otherwise(dataset_id, user, expdb_db)
+    # Access is checked for each request, the metadata is the same for everyone with access.
+    return await _datasets_in_flight(
+        dataset_id,
+        lambda: _get_dataset_metadata(dataset, user_db, expdb_db),
+    )
+
+
+async def _get_dataset_metadata(
+    dataset: Row[Any],
+    user_db: AsyncConnection,
+    expdb_db: AsyncConnection,
+) -> DatasetMetadata:
+    dataset_id = dataset.did
     if not (
         dataset_file := await database.datasets.get_file(
             file_id=dataset.file_id,
@@ -469,13 +485,33 @@ async def get_dataset(
         msg = f"No data file found for dataset {dataset_id}."
         raise DatasetNoDataFileError(msg)
 
+    fan_out = QueryFanOut(expdb_db)
     tags, description, processing_result, status = await asyncio.gather(
-        database.datasets.get_tags_for(dataset_id, expdb_db),
-        database.datasets.get_description(dataset_id, expdb_db),
-        _get_processing_information(dataset_id, expdb_db),
-        database.datasets.get_status(dataset_id, expdb_db),
+        fan_out(lambda connection: database.datasets.get_tags_for(dataset_id, connection)),
+        fan_out(lambda connection: database.datasets.get_description(dataset_id, connection)),
+        fan_out(lambda connection: _get_processing_information(dataset_id, connection)),
+        fan_out(lambda connection: database.datasets.get_status(dataset_id, connection)),
     )
 
+    return _build_dataset_metadata(
+        dataset,
+        dataset_file=dataset_file,
+        tags=tags,
+        description=description,
+        processing_result=processing_result,
+        status=status,
+    )
+
+
+def _build_dataset_metadata(  # noqa: PLR0913
+    dataset: Row[Any],
+    *,
+    dataset_file: Row[Any],
+    tags: list[str],
+    description: Row[Any] | None,
+    processing_result: ProcessingInformation,
+    status: DatasetStatus,
+) -> DatasetMetadata:
     description_ = ""
     if description:
         description_ = description.description.replace("\r", "").strip()
@@ -521,3 +557,78 @@ async def get_dataset(
         collection_date=dataset.collection_date,
         md5_checksum=dataset_file.md5_hash,
     )
+
+
+@router.post(
+    path="/batch",
+    description="Get meta-data for each of the datasets with IDs `dataset_ids`.",
+)
+async def get_datasets(
+    dataset_ids: Annotated[list[Identifier], Body(embed=True, min_length=1, max_length=LIMIT_MAX)],
+    user: Annotated[User | None, Depends(fetch_user)] = None,
+    user_db: Annotated[AsyncConnection, Depends(userdb_read_connection)] = None,
+    expdb_db: Annotated[AsyncConnection, Depends(expdb_read_connection)] = None,
+) -> list[DatasetMetadataResult]:
+    """Get the meta-data of many datasets with one query per table, instead of per dataset.
+
+    There is one result for each distinct id, in the order they are requested. A dataset
+    that can not be returned, e.g., because it does not exist or the user has no access,
+    has the problem detail that `GET /datasets/{dataset_id}` would respond with instead.
+    """
+    assert user_db is not None  # noqa: S101
+    assert expdb_db is not None  # noqa: S101
+    ids = list(dict.fromkeys(dataset_ids))
+    candidates = [id_ for id_ in ids if await may_exist("dataset", id_, expdb_db)]
+    datasets = await database.datasets.get_many(candidates, expdb_db) if candidates else {}
+
+    results: dict[int, DatasetMetadata | ProblemDetailError] = {}
+    for id_ in ids:
+        if (dataset := datasets.get(id_)) is None:
+            results[id_] = DatasetNotFoundError(f"No dataset with id {id_} found.")
+        elif not await _user_has_access(dataset=dataset, user=user):
+            results[id_] = DatasetNoAccessError(f"No access granted to dataset {id_}.")
+
+    accessible = [datasets[id_] for id_ in ids if id_ not in results]
+    if accessible:
+        results |= await _get_many_dataset_metadata(accessible, user_db, expdb_db)
+    return [
+        DatasetMetadataResult(id_=id_, dataset=result)
+        if isinstance(result := results[id_], DatasetMetadata)
+        else DatasetMetadataResult(id_=id_, problem=result.content())
+        for id_ in ids
+    ]
+
+
+async def _get_many_dataset_metadata(
+    datasets: list[Row[Any]],
+    user_db: AsyncConnection,
+    expdb_db: AsyncConnection,
+) -> dict[int, DatasetMetadata | ProblemDetailError]:
+    ids = [dataset.did for dataset in datasets]
+    file_ids = [dataset.file_id for dataset in datasets if dataset.file_id is not None]
+    fan_out = QueryFanOut(expdb_db)
+    files, tags, descriptions, processing_updates, statuses = await asyncio.gather(
+        database.datasets.get_files(file_ids=file_ids, connection=user_db),
+        fan_out(lambda connection: database.datasets.get_tags_for_many(ids, connection)),
+        fan_out(lambda connection: database.datasets.get_descriptions(ids, connection)),
+        fan_out(
+            lambda connection: database.datasets.get_latest_processing_updates(ids, connection),
+        ),
+        fan_out(lambda connection: database.datasets.get_statuses(ids, connection)),
+    )
+
+    metadata: dict[int, DatasetMetadata | ProblemDetailError] = {}
+    for dataset in datasets:
+        if (dataset_file := files.get(dataset.file_id)) is None:
+            msg = f"No data file found for dataset {dataset.did}."
+            metadata[dataset.did] = DatasetNoDataFileError(msg)
+            continue
+        metadata[dataset.did] = _build_dataset_metadata(
+            dataset,
+            dataset_file=dataset_file,
+            tags=tags.get(dataset.did, []),
+            description=descriptions.get(dataset.did),
+            processing_result=_processing_information(processing_updates.get(dataset.did)),
+            status=statuses[dataset.did],
+        )
+    return metadata
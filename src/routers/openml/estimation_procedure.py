@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Annotated
 from fastapi import APIRouter, Depends
 
 import database.evaluations
-from routers.dependencies import expdb_connection
+from routers.dependencies import expdb_read_connection
 from schemas.datasets.openml import EstimationProcedure
 
 if TYPE_CHECKING:
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/estimationprocedure", tags=["estimationprocedure"])
 
 @router.get("/list", response_model_exclude_none=True)
 async def get_estimation_procedures(
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> list[EstimationProcedure]:
     procedures = await database.evaluations.get_estimation_procedures(expdb)
     return list(procedures)
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Annotated
 from fastapi import APIRouter, Depends
 
 import database.evaluations
-from routers.dependencies import expdb_connection
+from routers.dependencies import expdb_read_connection
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/evaluationmeasure", tags=["evaluationmeasure"])
 
 @router.get("/list")
 async def get_evaluation_measures(
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> list[str]:
     functions = await database.evaluations.get_math_functions(
         function_type="EvaluationFunction",
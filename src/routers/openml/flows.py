@@ -1,16 +1,21 @@
 import asyncio
-from typing import TYPE_CHECKING, Annotated, Literal
+from typing import TYPE_CHECKING, Annotated, Literal, NamedTuple
 
 from fastapi import APIRouter, Depends
 
 import database.flows
 from core.conversions import _str_to_num
 from core.errors import FlowNotFoundError
-from routers.dependencies import expdb_connection
+from database.connection import QueryFanOut
+from database.existence import may_exist
+from routers.dependencies import expdb_read_connection
 from routers.types import Identifier
 from schemas.flows import Flow, Parameter, Subflow
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.engine import Row
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 router = APIRouter(prefix="/flows", tags=["flows"])
@@ -20,7 +25,7 @@ router = APIRouter(prefix="/flows", tags=["flows"])
 async def flow_exists(
     name: str,
     external_version: str,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> dict[Literal["flow_id"], int]:
     """Check if a Flow with the name and version exists, if so, return the flow id."""
     flow = await database.flows.get_by_name(
@@ -34,21 +39,42 @@ async def flow_exists(
     return {"flow_id": flow.id}
 
 
-@router.get("/{flow_id}")
-async def get_flow(
-    flow_id: Identifier,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
-) -> Flow:
-    flow = await database.flows.get(flow_id, expdb)
+class _FlowParts(NamedTuple):
+    """The parts of a flow that do not change after upload, i.e., all but its tags."""
+
+    flow: Row
+    parameters: Sequence[Row]
+    subflows: Sequence[Row]
+
+
+async def _get_flow_parts(flow_id: int, fan_out: QueryFanOut) -> _FlowParts:
+    flow, parameters, subflows = await asyncio.gather(
+        fan_out(lambda connection: database.flows.get(flow_id, connection)),
+        fan_out(lambda connection: database.flows.get_parameters(flow_id, connection)),
+        fan_out(lambda connection: database.flows.get_subflows(flow_id, connection)),
+    )
     if not flow:
         msg = f"Flow with id {flow_id} not found."
         raise FlowNotFoundError(msg)
+    return _FlowParts(flow, parameters, subflows)
 
-    parameter_rows, tags, subflow_rows = await asyncio.gather(
-        database.flows.get_parameters(flow_id, expdb),
-        database.flows.get_tags(flow_id, expdb),
-        database.flows.get_subflows(flow_id, expdb),
-    )
+
+async def _get_flow_tree(flow_id: int, expdb: AsyncConnection) -> dict[int, _FlowParts]:
+    """Return the parts of the flow and all of its (nested) subflows, by flow id."""
+    fan_out = QueryFanOut(expdb)
+    tree: dict[int, _FlowParts] = {}
+    level = {flow_id}
+    while level:
+        # Components shared by several subflows are only fetched once.
+        ids = sorted(level)
+        parts = await asyncio.gather(*(_get_flow_parts(id_, fan_out) for id_ in ids))
+        tree.update(zip(ids, parts, strict=True))
+        level = {subflow.child_id for part in parts for subflow in part.subflows} - tree.keys()
+    return tree
+
+
+def _build_flow(flow_id: int, tree: dict[int, _FlowParts], tags: dict[int, list[str]]) -> Flow:
+    flow, parameter_rows, subflow_rows = tree[flow_id]
     parameters = [
         Parameter(
             name=parameter.name,
@@ -61,15 +87,10 @@ async def get_flow(
         )
         for parameter in parameter_rows
     ]
-    subflows = []
-    for subflow in subflow_rows:
-        subflows.append(  # noqa: PERF401
-            Subflow(
-                identifier=subflow.identifier,
-                flow=await get_flow(flow_id=subflow.child_id, expdb=expdb),
-            ),
-        )
-
+    subflows = [
+        Subflow(identifier=subflow.identifier, flow=_build_flow(subflow.child_id, tree, tags))
+        for subflow in subflow_rows
+    ]
     return Flow(
         id_=flow.id,
         uploader=flow.uploader,
@@ -83,5 +104,24 @@ async def get_flow(
         dependencies=flow.dependencies,
         parameter=parameters,
         subflows=subflows,
-        tag=tags,
+        tag=tags.get(flow_id, []),
     )
+
+
+@router.get("/{flow_id}")
+async def get_flow(
+    flow_id: Identifier,
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
+) -> Flow:
+    """Get the flow with its (nested) subflows.
+
+    Flows do not change after upload, except for their tags. All other parts of the
+    flows are cached, see `database.caches.flows` and `database.caches.flow_rows`, and
+    the tags of the flow and all of its subflows are fetched with a single query.
+    """
+    if not await may_exist("flow", flow_id, expdb):
+        msg = f"Flow with id {flow_id} not found."
+        raise FlowNotFoundError(msg)
+    tree = await _get_flow_tree(flow_id, expdb)
+    tags = await database.flows.get_tags_for(list(tree), expdb)
+    return _build_flow(flow_id, tree, tags)
@@ -12,7 +12,7 @@ from core.errors import (
     NoQualitiesError,
 )
 from database.users import User
-from routers.dependencies import expdb_connection, fetch_user
+from routers.dependencies import expdb_read_connection, fetch_user
 from routers.types import Identifier
 from schemas.datasets.openml import Quality
 
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/datasets", tags=["datasets"])
 
 @router.get("/qualities/list")
 async def list_qualities(
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> dict[Literal["data_qualities_list"], dict[Literal["quality"], list[str]]]:
     qualities = await database.qualities.list_all_qualities(connection=expdb)
     return {
@@ -38,7 +38,7 @@ async def list_qualities(
 async def get_qualities(
     dataset_id: Identifier,
     user: Annotated[User | None, Depends(fetch_user)],
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> list[Quality]:
     dataset = await database.datasets.get(dataset_id, expdb)
     if not dataset or not await _user_has_access(dataset, user):
@@ -1,10 +1,13 @@
 """Endpoints for run-related data."""
 
 import asyncio
+import contextlib
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Annotated, Any, cast
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 if TYPE_CHECKING:
     from sqlalchemy import Row
@@ -16,7 +19,10 @@ import database.setups
 import database.tasks
 import database.users
 from core.errors import RunNotFoundError, RunTraceNotFoundError
-from routers.dependencies import expdb_connection, userdb_connection
+from core.streaming import json_object_with_array
+from database.connection import QueryFanOut
+from database.existence import may_exist
+from routers.dependencies import expdb_read_connection, userdb_read_connection
 from routers.types import Identifier
 from schemas.runs import (
     EvaluationScore,
@@ -35,34 +41,44 @@ if TYPE_CHECKING:
 router = APIRouter(prefix="/run", tags=["run"])
 
 
-@router.get("/trace/{run_id}")
+def _trace_iteration(row: Row) -> TraceIteration:
+    return TraceIteration(
+        repeat=row.repeat,
+        fold=row.fold,
+        iteration=row.iteration,
+        setup_string=row.setup_string,
+        evaluation=row.evaluation,
+        selected=row.selected,
+    )
+
+
+@router.get("/trace/{run_id}", response_model=RunTrace)
 async def get_run_trace(
     run_id: Identifier,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
-) -> RunTrace:
-    """Get trace data for a run by run ID."""
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
+) -> StreamingResponse:
+    """Get trace data for a run by run ID.
+
+    The trace is streamed from the database to the client as it is serialized.
+    """
     if not await database.runs.exist(run_id, expdb):
         msg = f"Run {run_id} not found."
         raise RunNotFoundError(msg)
 
-    trace_rows = await database.runs.get_trace(run_id, expdb)
-    if not trace_rows:
+    trace_rows = database.runs.stream_trace(run_id, expdb)
+    if (first_row := await anext(trace_rows, None)) is None:
         msg = f"No trace found for run {run_id}."
         raise RunTraceNotFoundError(msg)
 
-    return RunTrace(
-        run_id=run_id,
-        trace=[
-            TraceIteration(
-                repeat=row.repeat,
-                fold=row.fold,
-                iteration=row.iteration,
-                setup_string=row.setup_string,
-                evaluation=row.evaluation,
-                selected=row.selected,
-            )
-            for row in trace_rows
-        ],
+    async def trace() -> AsyncIterator[TraceIteration]:
+        async with contextlib.aclosing(trace_rows):
+            yield _trace_iteration(first_row)
+            async for row in trace_rows:
+                yield _trace_iteration(row)
+
+    return StreamingResponse(
+        json_object_with_array({"run_id": run_id}, "trace", trace()),
+        media_type="application/json",
     )
 
 
@@ -88,6 +104,7 @@ async def _load_run_context(
     userdb: AsyncConnection,
     engine_ids: list[int],
 ) -> RunContext:
+    expdb_fan_out, userdb_fan_out = QueryFanOut(expdb), QueryFanOut(userdb)
     (
         uploader_user,
         tags,
@@ -102,15 +119,35 @@ async def _load_run_context(
         "tuple[Any, list[str], list[Row], list[Row], list[Row], str | None, str |"
         "None, Row | None, list[Row]]",
         await asyncio.gather(
-            database.users.get_user(user_id=run.uploader, connection=userdb),
-            database.runs.get_tags(run_id, expdb),
-            database.runs.get_input_data(run_id, expdb),
-            database.runs.get_output_files(run_id, expdb),
-            database.runs.get_evaluations(run_id, expdb, evaluation_engine_ids=engine_ids),
-            database.tasks.get_task_type_name(run.task_id, expdb),
-            database.tasks.get_task_evaluation_measure(run.task_id, expdb),
-            database.setups.get(run.setup, expdb),
-            database.setups.get_parameters(run.setup, expdb),
+            userdb_fan_out(
+                lambda connection: database.users.get_user(
+                    user_id=run.uploader,
+                    connection=connection,
+                ),
+            ),
+            expdb_fan_out(lambda connection: database.runs.get_tags(run_id, connection)),
+            expdb_fan_out(lambda connection: database.runs.get_input_data(run_id, connection)),
+            expdb_fan_out(lambda connection: database.runs.get_output_files(run_id, connection)),
+            expdb_fan_out(
+                lambda connection: database.runs.get_evaluations(
+                    run_id,
+                    connection,
+                    evaluation_engine_ids=engine_ids,
+                ),
+            ),
+            expdb_fan_out(
+                lambda connection: database.tasks.get_task_type_name(run.task_id, connection),
+            ),
+            expdb_fan_out(
+                lambda connection: database.tasks.get_task_evaluation_measure(
+                    run.task_id,
+                    connection,
+                ),
+            ),
+            expdb_fan_out(lambda connection: database.setups.get(run.setup, connection)),
+            expdb_fan_out(
+                lambda connection: database.setups.get_parameters(run.setup, connection),
+            ),
         ),
     )
     return RunContext(
@@ -147,14 +184,17 @@ def _build_evaluations(rows: list[Row]) -> list[EvaluationScore]:
 @router.get("/{run_id}", response_model_exclude_none=True)
 async def get_run(
     run_id: int,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
-    userdb: Annotated[AsyncConnection, Depends(userdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
+    userdb: Annotated[AsyncConnection, Depends(userdb_read_connection)],
 ) -> Run:
     """Get full metadata for a run by ID.
 
     No authentication or visibility check is performed — all runs are
     publicly accessible.
     """
+    if not await may_exist("run", run_id, expdb):
+        msg = f"Run {run_id} not found."
+        raise RunNotFoundError(msg, code=236)
     run = await database.runs.get(run_id, expdb)
     if run is None:
         msg = f"Run {run_id} not found."
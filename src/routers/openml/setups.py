@@ -13,9 +13,11 @@ from core.errors import (
     TagNotFoundError,
     TagNotOwnedError,
 )
+from core.shared_cache import invalidate
+from database.connection import after_commit
 from database.exceptions import DuplicatePrimaryKeyError, ForeignKeyConstraintError
 from database.users import User
-from routers.dependencies import expdb_connection, fetch_user_or_raise
+from routers.dependencies import expdb_connection, expdb_read_connection, fetch_user_or_raise
 from routers.types import Identifier, TagString
 from schemas.setups import SetupParameters, SetupResponse
 
@@ -28,7 +30,7 @@ router = APIRouter(prefix="/setup", tags=["setup"])
 @router.get(path="/{setup_id}", response_model_exclude_none=True)
 async def get_setup(
     setup_id: Annotated[Identifier, Path()],
-    expdb_db: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb_db: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> SetupResponse:
     """Get setup by id."""
     setup = await database.setups.get(setup_id, expdb_db)
@@ -65,6 +67,7 @@ async def tag_setup(
         raise TagAlreadyExistsError(msg) from None
 
     logger.info("Setup {setup_id} tagged '{tag}'.", setup_id=setup_id, tag=tag)
+    await after_commit(expdb_db, lambda: invalidate(f"setup:{setup_id}"))
     all_tag_rows = await database.setups.get_tags(setup_id, expdb_db)
     all_tags = [t.tag for t in all_tag_rows]
 
@@ -105,6 +108,7 @@ async def untag_setup(
 
     await database.setups.untag(setup_id, matched_tag_row.tag, expdb_db)
     logger.info("Setup {setup_id} had tag '{tag}' removed.", setup_id=setup_id, tag=tag)
+    await after_commit(expdb_db, lambda: invalidate(f"setup:{setup_id}"))
     remaining_tags = [
         t.tag for t in setup_tags if t.tag.casefold() != matched_tag_row.tag.casefold()
     ]
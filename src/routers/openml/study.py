@@ -5,6 +5,7 @@ from loguru import logger
 from pydantic import BaseModel
 
 import database.studies
+from core.coalescing import SingleFlight
 from core.errors import (
     AuthenticationRequiredError,
     StudyAliasExistsError,
@@ -16,8 +17,15 @@ from core.errors import (
     StudyPrivateError,
 )
 from core.formatting import _str_to_bool
+from core.shared_cache import invalidate
+from database.connection import after_commit
 from database.users import User
-from routers.dependencies import expdb_connection, fetch_user, fetch_user_or_raise
+from routers.dependencies import (
+    expdb_connection,
+    expdb_read_connection,
+    fetch_user,
+    fetch_user_or_raise,
+)
 from routers.types import Identifier
 from schemas.core import Visibility
 from schemas.study import CreateStudy, Study, StudyStatus, StudyType
@@ -27,6 +35,7 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 router = APIRouter(prefix="/studies", tags=["studies"])
+_studies_in_flight = SingleFlight("studies")
 
 
 async def _get_study_raise_otherwise(
@@ -103,6 +112,9 @@ async def attach_to_study(
     except ValueError as e:
         msg = str(e)
         raise StudyConflictError(msg) from e
+    # The study may be requested by id or by alias.
+    tags = [f"study:{study_id}", *([f"study:{study.alias}"] if study.alias else [])]
+    await after_commit(expdb, lambda: invalidate(*tags))
     logger.info(
         "User {user_id} attached entities to study {study_id}.",
         study_id=study_id,
@@ -153,11 +165,30 @@ async def create_study(
 async def get_study(
     alias_or_id: Identifier | str,
     user: Annotated[User | None, Depends(fetch_user)] = None,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)] = None,
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)] = None,
 ) -> Study:
     assert expdb is not None  # noqa: S101
     study = await _get_study_raise_otherwise(alias_or_id, user, expdb)
-    study_data = await database.studies.get_study_data(study, expdb)
+    # Access is checked for each request, the study is the same for everyone with access.
+    return await _studies_in_flight(study.id, lambda: _get_study_with_entities(study, expdb))
+
+
+async def _get_study_with_entities(study: Row, expdb: AsyncConnection) -> Study:
+    is_run_study = study.type_ == StudyType.RUN
+    # The response holds every identifier of the study, so memory still grows with the
+    # size of the study. Streaming the rows only avoids holding each row besides them.
+    data_ids: list[int] = []
+    task_ids: list[int] = []
+    run_ids: list[int] = []
+    flow_ids: list[int] = []
+    setup_ids: list[int] = []
+    async for row in database.studies.stream_study_data(study, expdb):
+        data_ids.append(row.data_id)
+        task_ids.append(row.task_id)
+        if is_run_study:
+            run_ids.append(row.run_id)
+            flow_ids.append(row.flow_id)
+            setup_ids.append(row.setup_id)
     return Study(
         _legacy=_str_to_bool(study.legacy),
         id_=study.id,
@@ -169,9 +200,9 @@ async def get_study(
         status=study.status,
         creation_date=study.creation_date,
         creator=study.creator,
-        data_ids=[row.data_id for row in study_data],
-        task_ids=[row.task_id for row in study_data],
-        run_ids=[row.run_id for row in study_data] if study.type_ == StudyType.RUN else [],
-        flow_ids=[row.flow_id for row in study_data] if study.type_ == StudyType.RUN else [],
-        setup_ids=[row.setup_id for row in study_data] if study.type_ == StudyType.RUN else [],
+        data_ids=data_ids,
+        task_ids=task_ids,
+        run_ids=run_ids,
+        flow_ids=flow_ids,
+        setup_ids=setup_ids,
     )
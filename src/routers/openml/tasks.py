@@ -1,35 +1,53 @@
 import asyncio
 import json
 import re
+from dataclasses import dataclass
 from enum import StrEnum
-from typing import TYPE_CHECKING, Annotated, Any, cast
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple, cast
 
 import xmltodict
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Response
 from loguru import logger
 from sqlalchemy import bindparam, text
 
 import database.datasets
+import database.qualities
 import database.tasks
 from config import get_config
+from core.cache import cached
+from core.coalescing import SingleFlight
 from core.errors import InternalError, NoResultsError, TagAlreadyExistsError, TaskNotFoundError
+from core.shared_cache import invalidate
+from database.caches import task_templates
+from database.connection import QueryFanOut, after_commit
 from database.exceptions import DuplicatePrimaryKeyError, ForeignKeyConstraintError
+from database.existence import may_exist
 from database.users import User
-from routers.dependencies import Pagination, expdb_connection, fetch_user_or_raise
+from routers.dependencies import (
+    NEXT_CURSOR_HEADER,
+    Pagination,
+    encode_cursor,
+    expdb_connection,
+    expdb_read_connection,
+    fetch_user_or_raise,
+)
 from routers.types import (
     CasualString128,
     Identifier,
-    IntegerRange,
+    NumberRange,
     TagString,
-    integer_range_regex,
 )
 from schemas.datasets.openml import Task
 
 if TYPE_CHECKING:
-    from sqlalchemy.engine import RowMapping
+    from collections.abc import Iterable, Sequence
+
+    from sqlalchemy.engine import Row, RowMapping
     from sqlalchemy.ext.asyncio import AsyncConnection
+    from sqlalchemy.sql.elements import TextClause
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
+_tasks_in_flight = SingleFlight("tasks")
 
 type JSON = dict[str, "JSON"] | list["JSON"] | str | int | float | bool | None
 
@@ -51,6 +69,7 @@ async def tag_task(
         raise TagAlreadyExistsError(msg) from None
 
     logger.info("Task {task_id} tagged '{tag}'.", task_id=task_id, tag=tag)
+    await after_commit(expdb_db, lambda: invalidate(f"task:{task_id}"))
 
     tags = await database.tasks.get_tags(task_id, expdb_db)
 
@@ -68,27 +87,39 @@ def convert_template_xml_to_json(xml_template: str) -> dict[str, JSON]:
     return cast("dict[str, JSON]", json.loads(json_str))
 
 
-async def fill_template(
-    template: str,
-    task: RowMapping,
-    task_inputs: dict[str, str | int],
-    connection: AsyncConnection,
-) -> dict[str, JSON]:
-    """Fill in the XML template as used for task descriptions and return the result.
+_DIRECTIVES = re.compile(r"(\[(?:INPUT|LOOKUP|TASK|CONSTANT):[^\]]*])")
+_INPUT_DIRECTIVE = re.compile(r"\[INPUT:(.*)]")
+_LOOKUP_DIRECTIVE = re.compile(r"\[LOOKUP:(.*)]")
+
+
+@dataclass(frozen=True, slots=True)
+class _Input:
+    """A value that is replaced by the task input `field`."""
+
+    field: str
+
+
+@dataclass(frozen=True, slots=True)
+class _Lookup:
+    """A value that is replaced by `column` of the `table` row the task input `table` refers to."""
+
+    table: str
+    column: str
+
+
+@dataclass(frozen=True, slots=True)
+class _Text:
+    """A string with a directive at each odd index of `parts`, substituted as text."""
+
+    parts: tuple[str | _Input | _Lookup, ...]
 
-    The result is converted to JSON.
 
-    template, str:
-        A string represent XML, as detailed below.
-    task, ?:
-        The `task` for which to fill in the template.
-    task_inputs, dict:
-        The `task_input` entries where keys correspond to `input` and values
-        correspond to `value`.
+type _TemplateNode = dict[str, _TemplateNode] | list[_TemplateNode] | str | _Input | _Lookup | _Text
 
-    returns: str
-        The template with values filled in.
 
+@dataclass(frozen=True)
+class TaskTemplate:
+    """A task description template, parsed once, with the location of each directive.
 
     The template is an XML template that specifies which information to show to the user,
     and where to fetch it from. For example:
@@ -110,7 +141,9 @@ async def fill_template(
       - [CONSTANT:a] is replaced by a constant 'a' known by the PHP API.
       - [TASK:id] is replaced by the task id.
 
-    Resulting JSON could look like:
+    An INPUT or LOOKUP directive which is the entire value is replaced keeping the type
+    of the input or column, other directives are substituted as text. The filled
+    template, converted to JSON, could look like:
 
     "estimation_procedure": {
         "id": 5,
@@ -122,80 +155,139 @@ async def fill_template(
         ]
     }
     """
-    json_template = convert_template_xml_to_json(template)
-    return cast(
-        "dict[str, JSON]",
-        await _fill_json_template(
-            json_template,
-            task,
-            task_inputs,
-            fetched_data={},
-            connection=connection,
-        ),
-    )
 
+    tree: dict[str, _TemplateNode]
+    lookup_tables: frozenset[str]
+
+    @classmethod
+    def parse(cls, xml_template: str) -> TaskTemplate:
+        """Parse the XML `xml_template` and locate its directives."""
+        lookup_tables: set[str] = set()
+
+        def parse_node(node: JSON) -> _TemplateNode:
+            if isinstance(node, dict):
+                return {key: parse_node(value) for key, value in node.items()}
+            if isinstance(node, list):
+                return [parse_node(value) for value in node]
+            if not isinstance(node, str):
+                msg = f"Unexpected type for `template`: {node=}, {type(node)=}"
+                raise TypeError(msg)
+            parts = _DIRECTIVES.split(node)
+            if len(parts) == 1:
+                return node
+            parsed = tuple(parse_directive(part) if i % 2 else part for i, part in enumerate(parts))
+            if parsed[::2] == ("", "") and isinstance(parsed[1], _Input | _Lookup):
+                return parsed[1]
+            return _Text(parsed)
+
+        def parse_directive(directive: str) -> str | _Input | _Lookup:
+            if match := _INPUT_DIRECTIVE.fullmatch(directive):
+                return _Input(match.group(1))
+            if match := _LOOKUP_DIRECTIVE.fullmatch(directive):
+                table, column = match.group(1).split(".")
+                lookup_tables.add(table)
+                return _Lookup(table, column)
+            return directive
+
+        tree = cast(
+            "dict[str, _TemplateNode]",
+            parse_node(convert_template_xml_to_json(xml_template)),
+        )
+        return cls(tree=tree, lookup_tables=frozenset(lookup_tables))
+
+    def fill(
+        self,
+        task_id: int,
+        task_inputs: dict[str, str | int],
+        lookups: dict[str, RowMapping],
+    ) -> dict[str, JSON]:
+        """Substitute the values of the task into the template.
+
+        `lookups` holds the row each table in `lookup_tables` refers to.
+        """
+        url = get_config().routing.server_url
+        constants = {
+            "[TASK:id]": str(task_id),
+            "[CONSTANT:base_url]": f"{url.scheme}://{url.host}:{url.port}/",
+        }
 
-async def _fill_json_template(  # noqa: C901
-    template: JSON,
-    task: RowMapping,
+        def fill_text(part: str | _Input | _Lookup) -> str:
+            match part:
+                case _Input(field):
+                    return str(task_inputs[field])
+                case _Lookup(table, column):
+                    return str(lookups[table][column])
+            return constants.get(part, part)
+
+        def fill_node(node: _TemplateNode) -> JSON:
+            match node:
+                case dict():
+                    return {key: fill_node(value) for key, value in node.items()}
+                case list():
+                    return [fill_node(value) for value in node]
+                case _Input(field):
+                    # How do we know the default value? probably ttype_io table?
+                    return task_inputs.get(field, [])
+                case _Lookup(table, column):
+                    return cast("JSON", lookups[table][column])
+                case _Text(parts):
+                    return "".join(fill_text(part) for part in parts)
+            return node
+
+        return cast("dict[str, JSON]", fill_node(self.tree))
+
+
+# Tables referred to by LOOKUP directives that are small and rarely change, these are
+# kept in memory in their entirety. Other tables are queried for the row a task refers to.
+_CACHED_LOOKUP_TABLES = frozenset({"estimation_procedure"})
+
+
+async def fetch_lookup_rows(
+    tables: Iterable[str],
     task_inputs: dict[str, str | int],
-    fetched_data: dict[str, str],
     connection: AsyncConnection,
-) -> JSON:
-    if isinstance(template, dict):
-        return {
-            k: await _fill_json_template(v, task, task_inputs, fetched_data, connection)
-            for k, v in template.items()
-        }
-    if isinstance(template, list):
-        return [
-            await _fill_json_template(v, task, task_inputs, fetched_data, connection)
-            for v in template
-        ]
-    if not isinstance(template, str):
-        msg = f"Unexpected type for `template`: {template=}, {type(template)=}"
-        raise TypeError(msg)
-
-    # I believe at this point, if there is an [INPUT:] or [LOOKUP:] directive,
-    # this is always the entirety of the string. However, for now we verify explicitly.
-    if match := re.search(r"\[INPUT:(.*)]", template):
-        (field,) = match.groups()
-        if match.string == template:
-            # How do we know the default value? probably ttype_io table?
-            return task_inputs.get(field, [])
-        template = template.replace(match.group(), str(task_inputs[field]))
-    if match := re.search(r"\[LOOKUP:(.*)]", template):
-        (field,) = match.groups()
-        if field not in fetched_data:
-            table, _ = field.split(".")
-            result = await connection.execute(
-                text(
-                    f"""
-                    SELECT *
-                    FROM {table}
-                    WHERE `id` = :id_
-                    """,  # noqa: S608
-                ),
-                # Not sure how parametrize table names, as the parametrization adds
-                # quotes which is not legal.
-                parameters={"id_": int(task_inputs[table])},
-            )
-            rows = result.mappings()
-            row_data = next(rows, None)
-            if row_data is None:
-                msg = f"No data found for table {table} with id {task_inputs[table]}"
-                raise ValueError(msg)
-            for column, value in row_data.items():
-                fetched_data[f"{table}.{column}"] = value
-        if match.string == template:
-            return fetched_data[field]
-        template = template.replace(match.group(), fetched_data[field])
-    # I believe that the operations below are always part of string output, so
-    # we don't need to be careful to avoid losing typedness
-    template = template.replace("[TASK:id]", str(task.task_id))
-    url = get_config().routing.server_url
-    server_url = f"{url.scheme}://{url.host}:{url.port}/"
-    return template.replace("[CONSTANT:base_url]", server_url)
+) -> dict[str, RowMapping]:
+    """Fetch the row of each table in `tables` that the task inputs refer to."""
+    rows = {}
+    for table in tables:
+        id_ = int(task_inputs[table])
+        row = None
+        if table in _CACHED_LOOKUP_TABLES:
+            row = (await database.tasks.get_lookup_table(table, connection)).get(id_)
+        if row is None:
+            # Rows added since the table was cached are not in memory yet.
+            row = await database.tasks.get_lookup_row(table, id_, connection)
+        if row is None:
+            msg = f"No data found for table {table} with id {task_inputs[table]}"
+            raise ValueError(msg)
+        rows[table] = row
+    return rows
+
+
+class TaskTypeTemplates(NamedTuple):
+    """The parsed templates of the inputs and outputs of a task type, by name."""
+
+    inputs: list[tuple[str, TaskTemplate]]
+    outputs: list[tuple[str, dict[str, JSON]]]
+
+    @property
+    def lookup_tables(self) -> frozenset[str]:
+        """The tables referred to by LOOKUP directives of any of the input templates."""
+        return frozenset().union(*(template.lookup_tables for _, template in self.inputs))
+
+
+@cached(task_templates)
+async def get_task_type_templates(task_type_id: int, expdb: AsyncConnection) -> TaskTypeTemplates:
+    """Return the parsed templates of the task type, which are static per task type."""
+    ttios = await database.tasks.get_task_type_inout_with_template(task_type_id, expdb)
+    return TaskTypeTemplates(
+        inputs=[(io.name, TaskTemplate.parse(io.template_api)) for io in ttios if io.io == "input"],
+        outputs=[
+            (io.name, convert_template_xml_to_json(io.template_api))
+            for io in ttios
+            if io.io == "output"
+        ],
+    )
 
 
 class TaskStatusFilter(StrEnum):
@@ -207,19 +299,6 @@ class TaskStatusFilter(StrEnum):
     ALL = "all"
 
 
-QUALITIES_TO_SHOW = [
-    "MajorityClassSize",
-    "MaxNominalAttDistinctValues",
-    "MinorityClassSize",
-    "NumberOfClasses",
-    "NumberOfFeatures",
-    "NumberOfInstances",
-    "NumberOfInstancesWithMissingValues",
-    "NumberOfMissingValues",
-    "NumberOfNumericFeatures",
-    "NumberOfSymbolicFeatures",
-]
-
 BASIC_TASK_INPUTS = [
     "source_data",
     "target_feature",
@@ -228,30 +307,35 @@ BASIC_TASK_INPUTS = [
 ]
 
 
-def _quality_clause(quality: str, range_: str | None) -> str:
-    """Return a SQL WHERE clause fragment filtering tasks by a dataset quality range.
-
-    Looks up tasks whose source dataset has the given quality within the range.
-    Range can be exact ('100') or a range ('50..200').
+_TASK_INPUTS_QUERY = text(
     """
-    if not range_:
-        return ""
-    if not (match := re.match(integer_range_regex, range_)):
-        msg = f"`range_` not a valid range: {range_}"
-        raise ValueError(msg)
-    start, end = match.groups()
-    # end group looks like "..200", strip the ".." prefix to get just the number
-    value = f"`value` BETWEEN {start} AND {end[2:]}" if end else f"`value`={start}"
-    # nested subquery: find datasets with matching quality, then find tasks using those datasets
-    return f"""
-        AND t.`task_id` IN (
-            SELECT ti.`task_id` FROM task_inputs ti
-            WHERE ti.`input`='source_data' AND ti.`value` IN (
-                SELECT `data` FROM data_quality
-                WHERE `quality`='{quality}' AND {value}
-            )
-        )
-    """  # noqa: S608
+    SELECT `task_id`, `input`, `value`
+    FROM task_inputs
+    WHERE `task_id` IN :task_ids
+    AND `input` IN :basic_inputs
+    """,
+).bindparams(
+    bindparam("task_ids", expanding=True),
+    bindparam("basic_inputs", expanding=True),
+)
+_TASK_QUALITIES_QUERY = text(
+    """
+    SELECT `data`, `quality`, `value`
+    FROM data_quality
+    WHERE `data` IN :dataset_ids
+    AND `quality` IN :quality_names
+    """,
+).bindparams(
+    bindparam("dataset_ids", expanding=True),
+    bindparam("quality_names", expanding=True),
+)
+_TASK_TAGS_QUERY = text(
+    """
+    SELECT `id`, `tag`
+    FROM task_tag
+    WHERE `id` IN :task_ids
+    """,
+).bindparams(bindparam("task_ids", expanding=True))
 
 
 @router.post(path="/list", description="Provided for convenience, same as `GET` endpoint.")
@@ -271,11 +355,12 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
         Body(description="Filter by dataset id(s).", min_length=1),
     ] = None,
     data_name: Annotated[CasualString128 | None, Body()] = None,
-    number_instances: Annotated[IntegerRange | None, Body()] = None,
-    number_features: Annotated[IntegerRange | None, Body()] = None,
-    number_classes: Annotated[IntegerRange | None, Body()] = None,
-    number_missing_values: Annotated[IntegerRange | None, Body()] = None,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)] = None,
+    number_instances: Annotated[NumberRange | None, Body()] = None,
+    number_features: Annotated[NumberRange | None, Body()] = None,
+    number_classes: Annotated[NumberRange | None, Body()] = None,
+    number_missing_values: Annotated[NumberRange | None, Body()] = None,
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)] = None,
+    response: Response = None,
 ) -> list[dict[str, Any]]:
     """List tasks, optionally filtered by type, tag, status, dataset properties, and more."""
     assert expdb is not None  # noqa: S101
@@ -314,20 +399,22 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
         clauses.append("AND d.`did` IN :data_ids")
         parameters["data_ids"] = data_id
 
-    where_number_instances = _quality_clause("NumberOfInstances", number_instances)
-    where_number_features = _quality_clause("NumberOfFeatures", number_features)
-    where_number_classes = _quality_clause("NumberOfClasses", number_classes)
-    where_number_missing_values = _quality_clause("NumberOfMissingValues", number_missing_values)
-
-    # subquery to get the latest status per dataset (dataset_status is a history table)
-    status_subquery = """
-        SELECT ds1.did, ds1.status
-        FROM dataset_status ds1
-        WHERE ds1.status_date = (
-            SELECT MAX(ds2.status_date) FROM dataset_status ds2
-            WHERE ds1.did = ds2.did
-        )
-    """
+    if pagination.after is not None:
+        clauses.append("AND t.`task_id` > :after")
+        parameters["after"] = pagination.after
+
+    summary = await database.qualities.has_summary_table(expdb)
+    quality_filters = [
+        database.qualities.range_clause(quality, range_, parameters, summary=summary)
+        for quality, range_ in [
+            ("NumberOfInstances", number_instances),
+            ("NumberOfFeatures", number_features),
+            ("NumberOfClasses", number_classes),
+            ("NumberOfMissingValues", number_missing_values),
+        ]
+    ]
+    summary_join = "LEFT JOIN dataset_quality_summary qs ON qs.`did` = d.`did`" if summary else ""
+    status_table = await database.datasets.current_status_table(expdb)
 
     main_query = text(
         f"""
@@ -347,13 +434,11 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
             AND ti_source.`input` = 'source_data'
         JOIN dataset d
             ON d.`did` = ti_source.`value`
-        LEFT JOIN ({status_subquery}) ds
+        LEFT JOIN {status_table} ds
             ON ds.`did` = d.`did`
+        {summary_join}
         WHERE 1=1
-            {where_number_instances}
-            {where_number_features}
-            {where_number_classes}
-            {where_number_missing_values}
+            {" ".join(quality_filters)}
             {" ".join(clauses)}
         GROUP BY t.`task_id`, t.`ttid`, tt.`name`, d.`did`, d.`name`, d.`format`, ds.`status`
         ORDER BY t.`task_id`
@@ -372,6 +457,8 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
     if not rows:
         msg = "No tasks match the search criteria."
         raise NoResultsError(msg, code="482")
+    if response is not None and len(rows) == pagination.limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["task_id"])
 
     columns = ["task_id", "task_type_id", "task_type", "did", "name", "format", "status"]
     tasks: dict[int, dict[str, Any]] = {
@@ -380,53 +467,37 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
     task_ids: list[int] = list(tasks.keys())
     dataset_ids: list[int] = list({t["did"] for t in tasks.values()})
 
-    inputs_query = text(
-        """
-        SELECT `task_id`, `input`, `value`
-        FROM task_inputs
-        WHERE `task_id` IN :task_ids
-        AND `input` IN :basic_inputs
-        """,
-    ).bindparams(
-        bindparam("task_ids", expanding=True),
-        bindparam("basic_inputs", expanding=True),
-    )
-    qualities_query = text(
-        """
-        SELECT `data`, `quality`, `value`
-        FROM data_quality
-        WHERE `data` IN :dataset_ids
-        AND `quality` IN :quality_names
-        """,
-    ).bindparams(
-        bindparam("dataset_ids", expanding=True),
-        bindparam("quality_names", expanding=True),
-    )
-
-    tags_query = text(
-        """
-        SELECT `id`, `tag`
-        FROM task_tag
-        WHERE `id` IN :task_ids
-        """,
-    ).bindparams(bindparam("task_ids", expanding=True))
-
-    inputs_result, qualities_result, tags_result = await asyncio.gather(
-        expdb.execute(
-            inputs_query,
-            parameters={"task_ids": task_ids, "basic_inputs": BASIC_TASK_INPUTS},
-        ),
-        expdb.execute(
-            qualities_query,
-            parameters={"dataset_ids": dataset_ids, "quality_names": QUALITIES_TO_SHOW},
+    async def fetch_all(
+        connection: AsyncConnection,
+        query: TextClause,
+        parameters: dict[str, Any],
+    ) -> Sequence[Row]:
+        return (await connection.execute(query, parameters=parameters)).all()
+
+    fan_out = QueryFanOut(expdb)
+    # Qualities are shown as stored, rather than from the numbers in the summary table.
+    input_rows, quality_rows, tag_rows = await asyncio.gather(
+        fan_out(
+            lambda connection: fetch_all(
+                connection,
+                _TASK_INPUTS_QUERY,
+                {"task_ids": task_ids, "basic_inputs": BASIC_TASK_INPUTS},
+            ),
         ),
-        expdb.execute(
-            tags_query,
-            parameters={"task_ids": task_ids},
+        fan_out(
+            lambda connection: fetch_all(
+                connection,
+                _TASK_QUALITIES_QUERY,
+                {
+                    "dataset_ids": dataset_ids,
+                    "quality_names": database.qualities.SUMMARY_QUALITIES,
+                },
+            ),
         ),
+        fan_out(lambda connection: fetch_all(connection, _TASK_TAGS_QUERY, {"task_ids": task_ids})),
     )
 
-    for row in inputs_result.all():
+    for row in input_rows:
         tasks[row.task_id].setdefault("input", []).append(
             {"name": row.input, "value": row.value},
         )
@@ -435,13 +506,13 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
     did_to_task_ids: dict[int, list[int]] = {}
     for tid, t in tasks.items():
         did_to_task_ids.setdefault(t["did"], []).append(tid)
-    for row in qualities_result.all():
+    for row in quality_rows:
         for tid in did_to_task_ids.get(row.data, []):
             tasks[tid].setdefault("quality", []).append(
                 {"name": row.quality, "value": str(row.value)},
             )
 
-    for row in tags_result.all():
+    for row in tag_rows:
         tasks[row.id].setdefault("tag", []).append(row.tag)
 
     return list(tasks.values())
@@ -450,8 +521,16 @@ async def list_tasks(  # noqa: PLR0913, PLR0912, C901, PLR0915
 @router.get("/{task_id}")
 async def get_task(
     task_id: int,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> Task:
+    if not await may_exist("task", task_id, expdb):
+        msg = f"Task {task_id} not found."
+        raise TaskNotFoundError(msg)
+    # Tasks are public, so concurrent requests for the same task share their response.
+    return await _tasks_in_flight(task_id, lambda: _get_task(task_id, expdb))
+
+
+async def _get_task(task_id: int, expdb: AsyncConnection) -> Task:
     if not (task := await database.tasks.get(task_id, expdb)):
         msg = f"Task {task_id} not found."
         raise TaskNotFoundError(msg)
@@ -459,30 +538,21 @@ async def get_task(
         msg = f"Task {task_id} has task type {task.ttid}, but task type {task.ttid} is not found."
         raise InternalError(msg)
 
-    task_input_rows, ttios, tags = await asyncio.gather(
+    task_input_rows, templates, tags = await asyncio.gather(
         database.tasks.get_input_for_task(task_id, expdb),
-        database.tasks.get_task_type_inout_with_template(task_type.ttid, expdb),
+        get_task_type_templates(task_type.ttid, expdb),
         database.tasks.get_tags(task_id, expdb),
     )
     task_inputs = {
         row.input: int(row.value) if row.value.isdigit() else row.value for row in task_input_rows
     }
-    templates = [(tt_io.name, tt_io.io, tt_io.requirement, tt_io.template_api) for tt_io in ttios]
-    input_templates = [
-        (name, template) for name, io, required, template in templates if io == "input"
-    ]
-    filled_templates = await asyncio.gather(
-        *[fill_template(template, task, task_inputs, expdb) for name, template in input_templates],
-    )
+    # Templates share the rows they look up, e.g., of the estimation procedure.
+    lookups = await fetch_lookup_rows(templates.lookup_tables, task_inputs, expdb)
     inputs = [
-        filled | {"name": name}
-        for (name, _), filled in zip(input_templates, filled_templates, strict=True)
-    ]
-    outputs = [
-        convert_template_xml_to_json(template) | {"name": name}
-        for name, io, required, template in templates
-        if io == "output"
+        template.fill(task.task_id, task_inputs, lookups) | {"name": name}
+        for name, template in templates.inputs
     ]
+    outputs = [template | {"name": name} for name, template in templates.outputs]
     name = f"Task {task_id} ({task_type.name})"
     dataset_id = task_inputs.get("source_data")
     if isinstance(dataset_id, int) and (dataset := await database.datasets.get(dataset_id, expdb)):
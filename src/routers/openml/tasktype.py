@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends
 from core.errors import TaskTypeNotFoundError
 from database.tasks import get_input_for_task_type, get_task_types
 from database.tasks import get_task_type as db_get_task_type
-from routers.dependencies import expdb_connection
+from routers.dependencies import expdb_read_connection
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Row
@@ -30,7 +30,7 @@ def _normalize_task_type(task_type: Row[Any]) -> dict[str, str | None | list[Any
 
 @router.get(path="/list")
 async def list_task_types(
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> dict[
     Literal["task_types"],
     dict[Literal["task_type"], list[dict[str, str | None | list[Any]]]],
@@ -44,7 +44,7 @@ async def list_task_types(
 @router.get(path="/{task_type_id}")
 async def get_task_type(
     task_type_id: int,
-    expdb: Annotated[AsyncConnection, Depends(expdb_connection)],
+    expdb: Annotated[AsyncConnection, Depends(expdb_read_connection)],
 ) -> dict[Literal["task_type"], dict[str, str | None | list[str] | list[dict[str, str]]]]:
     task_type_record = await db_get_task_type(task_type_id, expdb)
     if task_type_record is None:
@@ -0,0 +1,95 @@
+"""Endpoints that report on the state of the service itself, rather than OpenML data."""
+
+from http import HTTPStatus
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Response
+
+from core.cache import broadcast_invalidation, cache_statistics, invalidate_caches
+from core.coalescing import coalescing_statistics
+from core.errors import (
+    CacheInvalidationError,
+    CacheNotFoundError,
+    ForbiddenError,
+    ServiceNotReadyError,
+)
+from core.shared_cache import RedisError
+from database.setup import databases_ready, pool_statistics, prepare_databases
+from database.users import User
+from routers.dependencies import fetch_user_or_raise
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/pools")
+async def get_pool_statistics() -> list[dict[str, str | int | float]]:
+    """Live connection pool statistics for each database engine in this worker.
+
+    `checked_out` and `overflow` describe the pool right now, the `wait_ms_*` fields
+    summarize how long requests waited for a connection since the worker started.
+    Engines are named by their role, e.g., `expdb/replica-1`, not by their address.
+    """
+    return pool_statistics()
+
+
+@router.get("/ready")
+async def get_readiness() -> dict[Literal["ready"], bool]:
+    """Report whether this worker is connected to its databases and can serve requests.
+
+    Databases are connected at startup. If that failed, it is retried on each call.
+    """
+    if not databases_ready() and not await prepare_databases():
+        msg = "Could not connect to the databases."
+        raise ServiceNotReadyError(msg)
+    return {"ready": True}
+
+
+@router.get("/caches")
+async def get_cache_statistics() -> list[dict[str, str | int | float]]:
+    """Size and hit/miss counters of each in-process cache in this worker."""
+    return cache_statistics()
+
+
+@router.get("/coalescing")
+async def get_coalescing_statistics() -> list[dict[str, str | int]]:
+    """Responses computed, and shared with identical concurrent requests, in this worker.
+
+    `coalesced` counts the requests that waited for the response of an identical request
+    that was in flight, rather than computing it themselves.
+    """
+    return coalescing_statistics()
+
+
+@router.delete(
+    "/caches/{name}",
+    responses={
+        HTTPStatus.NO_CONTENT: {"description": "Cache cleared."},
+        HTTPStatus.FORBIDDEN: {"description": "Only administrators may clear caches."},
+        HTTPStatus.NOT_FOUND: {"description": "No cache with that name."},
+        HTTPStatus.SERVICE_UNAVAILABLE: {
+            "description": "Cleared in this worker only, as the shared cache is unavailable.",
+        },
+    },
+)
+async def clear_cache(
+    name: str,
+    user: Annotated[User, Depends(fetch_user_or_raise)],
+) -> Response:
+    """Clear a cache in all workers, e.g., after reference data was changed in the database.
+
+    The worker handling this request clears its cache right away, the other workers do so
+    within `shared_cache.invalidation_interval` seconds. This requires the `redis` backend
+    of the shared cache if there is more than one worker.
+    """
+    if not await user.is_admin():
+        msg = "Only administrators may clear caches."
+        raise ForbiddenError(msg)
+    if not invalidate_caches(name):
+        msg = f"Cache {name} not found."
+        raise CacheNotFoundError(msg)
+    try:
+        await broadcast_invalidation(name)
+    except (OSError, RedisError) as error:
+        msg = f"Cache {name} was cleared in this worker only, the shared cache is unavailable."
+        raise CacheInvalidationError(msg) from error
+    return Response(status_code=HTTPStatus.NO_CONTENT)
@@ -11,13 +11,13 @@ CasualString128 = Annotated[CasualString, Field(max_length=128)]
 
 Identifier = Annotated[int, Field(gt=0)]
 
-integer_range_regex = r"^(\d+)(\.\.\d+)?$"
-IntegerRange = Annotated[
+number_range_regex = r"^(\d+(?:\.\d+)?)(?:\.\.(\d+(?:\.\d+)?))?$"
+NumberRange = Annotated[
     str,
     Field(
-        pattern=integer_range_regex,
-        description="Either a single integer, or a range defined as `low..high`, where"
-        "`low` and `high` are inclusive integer bounds of the range.",
-        examples=["12", "3..150"],
+        pattern=number_range_regex,
+        description="Either a single number, or a range defined as `low..high`, where "
+        "`low` and `high` are inclusive bounds of the range.",
+        examples=["12", "3..150", "0.5..1.5"],
     ),
 ]
@@ -136,6 +136,25 @@ class DatasetMetadata(BaseModel):
     md5_checksum: str = Field(json_schema_extra={"example": "d01f6ccd68c88b749b20bbe897de3713"})
 
 
+class DatasetMetadataResult(BaseModel):
+    """The metadata of one of the requested datasets, or the problem that prevented it."""
+
+    id_: int = Field(serialization_alias="id", json_schema_extra={"example": 1})
+    dataset: DatasetMetadata | None = None
+    problem: dict[str, str | int] | None = Field(
+        default=None,
+        json_schema_extra={
+            "example": {
+                "type": "https://openml.org/problems/dataset-not-found",
+                "title": "Dataset Not Found",
+                "status": 404,
+                "detail": "No dataset with id 1 found.",
+                "code": "111",
+            },
+        },
+    )
+
+
 class Task(BaseModel):
     id_: int = Field(serialization_alias="id", json_schema_extra={"example": 59})
     name: str = Field(
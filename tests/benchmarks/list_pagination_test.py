@@ -0,0 +1,92 @@
+"""Rows read for, and latency of, a deep page of `/datasets/list` by offset versus by cursor."""
+
+import contextlib
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import text
+
+from routers.dependencies import Pagination, encode_cursor
+from routers.openml.datasets import DatasetStatusFilter, list_datasets
+from tests.benchmarks.rows_read import count_rows_read
+from tests.benchmarks.timing import best_of
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+_PAGE_SIZE = 100
+
+# Within the session, the temporary table takes the place of `dataset`.
+_CREATE_DATASET = text(
+    """
+    CREATE TEMPORARY TABLE dataset (
+        `did` int unsigned NOT NULL AUTO_INCREMENT,
+        `uploader` int unsigned NOT NULL,
+        `name` varchar(128) NOT NULL,
+        `version` varchar(64) NOT NULL,
+        `format` varchar(64) NOT NULL,
+        `file_id` int DEFAULT NULL,
+        `visibility` varchar(64) NOT NULL,
+        PRIMARY KEY (`did`)
+    )
+    """,
+)
+# 100 000 datasets, about the number in production, mirrors page through all of them.
+_FILL_DATASET = text(
+    """
+    INSERT INTO dataset (`did`, `uploader`, `name`, `version`, `format`, `visibility`)
+    WITH RECURSIVE digits(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM digits WHERE n < 9)
+    SELECT 1 + a.n + 10 * b.n + 100 * c.n + 1000 * d.n + 10000 * e.n,
+           1, 'benchmark', '1', 'ARFF', 'public'
+    FROM digits a, digits b, digits c, digits d, digits e
+    """,
+)
+_DROP_DATASET = text("DROP TEMPORARY TABLE IF EXISTS dataset")
+
+
+@contextlib.asynccontextmanager
+async def _realistic_dataset(expdb: AsyncConnection) -> AsyncIterator[None]:
+    try:
+        await expdb.execute(_CREATE_DATASET)
+        await expdb.execute(_FILL_DATASET)
+        yield
+    finally:
+        # Temporary tables outlive the transaction, and the connection is reused.
+        await expdb.execute(_DROP_DATASET)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("page", [500, 990])
+async def test_deep_page_by_cursor_reads_only_the_page(
+    page: int,
+    expdb_test: AsyncConnection,
+    record_property: Callable[[str, object], None],
+) -> None:
+    skipped = page * _PAGE_SIZE
+
+    async def by_offset() -> list[dict[str, Any]]:
+        pagination = Pagination(offset=skipped, limit=_PAGE_SIZE)
+        return await list_datasets(pagination, status=DatasetStatusFilter.ALL, expdb_db=expdb_test)
+
+    async def by_cursor() -> list[dict[str, Any]]:
+        # Dataset ids start at 1, so the previous page ended with id `skipped`.
+        pagination = Pagination(cursor=encode_cursor(skipped), limit=_PAGE_SIZE)
+        return await list_datasets(pagination, status=DatasetStatusFilter.ALL, expdb_db=expdb_test)
+
+    async with _realistic_dataset(expdb_test):
+        async with count_rows_read(expdb_test) as offset_rows:
+            offset_page = await by_offset()
+        async with count_rows_read(expdb_test) as cursor_rows:
+            cursor_page = await by_cursor()
+        assert offset_page == cursor_page
+        offset_duration = await best_of(5, by_offset)
+        cursor_duration = await best_of(5, by_cursor)
+
+    record_property("offset_rows_read", offset_rows.count)
+    record_property("cursor_rows_read", cursor_rows.count)
+    record_property("offset_seconds", offset_duration)
+    record_property("cursor_seconds", cursor_duration)
+    # By offset, all earlier rows are read and discarded, by cursor the page is a seek.
+    assert offset_rows.count >= skipped
+    assert cursor_rows.count < skipped // 10
@@ -0,0 +1,92 @@
+"""Listing quality names from the `quality_names` cache versus scanning `data_quality`."""
+
+import contextlib
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import text
+
+import database.qualities
+from database.caches import quality_names
+from tests.benchmarks.round_trips import count_round_trips
+from tests.benchmarks.rows_read import count_rows_read
+from tests.benchmarks.timing import best_of
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+# About 10 000 datasets with all qualities, the size of `data_quality` in production.
+_DATASETS = 10_000
+
+_COPY_QUALITY_NAMES = text(
+    "CREATE TEMPORARY TABLE benchmark_quality AS SELECT DISTINCT(`quality`) FROM data_quality",
+)
+# Within the session, the temporary table takes the place of `data_quality`.
+_CREATE_DATA_QUALITY = text(
+    """
+    CREATE TEMPORARY TABLE data_quality (
+        `data` int unsigned NOT NULL DEFAULT 0,
+        `quality` varchar(128) NOT NULL,
+        `evaluation_engine_id` int NOT NULL,
+        `value` varchar(128) DEFAULT NULL,
+        `description` text,
+        PRIMARY KEY (`data`, `quality`, `evaluation_engine_id`)
+    )
+    """,
+)
+_FILL_DATA_QUALITY = text(
+    """
+    INSERT INTO data_quality (`data`, `quality`, `evaluation_engine_id`, `value`)
+    WITH RECURSIVE digits(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM digits WHERE n < 9)
+    SELECT 1 + a.n + 10 * b.n + 100 * c.n + 1000 * d.n, q.`quality`, 1, '0.5'
+    FROM digits a, digits b, digits c, digits d, benchmark_quality q
+    """,
+)
+_DROP_TABLES = text("DROP TEMPORARY TABLE IF EXISTS data_quality, benchmark_quality")
+_SCAN_QUALITY_NAMES = text("SELECT DISTINCT(`quality`) FROM data_quality")
+
+
+@contextlib.asynccontextmanager
+async def _realistic_data_quality(expdb: AsyncConnection) -> AsyncIterator[None]:
+    await expdb.execute(_COPY_QUALITY_NAMES)
+    try:
+        await expdb.execute(_CREATE_DATA_QUALITY)
+        await expdb.execute(_FILL_DATA_QUALITY)
+        quality_names.invalidate()
+        yield
+    finally:
+        # Temporary tables outlive the transaction, and the connection is reused.
+        await expdb.execute(_DROP_TABLES)
+        quality_names.invalidate()
+
+
+@pytest.mark.slow
+async def test_quality_names_are_cached(
+    mocker: MockerFixture,
+    expdb_test: AsyncConnection,
+    record_property: Callable[[str, object], None],
+) -> None:
+    async def scan() -> list[str]:
+        rows = await expdb_test.execute(_SCAN_QUALITY_NAMES)
+        return sorted(row.quality for row in rows.all())
+
+    async def cached() -> list[str]:
+        return await database.qualities.list_all_qualities(expdb_test)
+
+    async with _realistic_data_quality(expdb_test):
+        # The first call scans and caches the names, later calls reuse them.
+        assert await cached() == await scan()
+        async with count_rows_read(expdb_test) as scan_rows:
+            await scan()
+        with count_round_trips(mocker) as round_trips:
+            await cached()
+        scan_duration = await best_of(5, scan)
+        cached_duration = await best_of(5, cached)
+
+    record_property("scan_rows_read", scan_rows.count)
+    record_property("scan_seconds", scan_duration)
+    record_property("cached_seconds", cached_duration)
+    assert scan_rows.count >= _DATASETS
+    assert round_trips.statements == 0
@@ -0,0 +1,36 @@
+"""Round trips saved by serving GET endpoints from autocommit read connections."""
+
+import contextlib
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING
+
+import database.datasets
+from routers.dependencies import expdb_connection, expdb_read_connection
+from tests.benchmarks.round_trips import count_round_trips
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def _read_dataset(dependency: Callable[[], AsyncIterator[AsyncConnection]]) -> None:
+    async with contextlib.asynccontextmanager(dependency)() as connection:
+        await database.datasets.get(1, connection)
+        await database.datasets.get_tags_for(1, connection)
+
+
+async def test_read_connection_saves_round_trips(mocker: MockerFixture) -> None:
+    # Open a pooled connection for each engine first, so connection setup is not counted.
+    await _read_dataset(expdb_connection)
+    await _read_dataset(expdb_read_connection)
+
+    with count_round_trips(mocker) as transactional:
+        await _read_dataset(expdb_connection)
+    with count_round_trips(mocker) as read_only:
+        await _read_dataset(expdb_read_connection)
+
+    assert transactional.statements == read_only.statements == 2  # noqa: PLR2004
+    # The COMMIT at the end of the request, and the ROLLBACK when the pool resets it.
+    assert (transactional.commits, transactional.rollbacks) == (1, 1)
+    assert (read_only.commits, read_only.rollbacks) == (0, 0)
+    assert transactional.total - read_only.total == 2  # noqa: PLR2004
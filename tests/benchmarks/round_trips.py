@@ -0,0 +1,44 @@
+import contextlib
+import dataclasses
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.dialects.mysql.aiomysql import AsyncAdapt_aiomysql_connection
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@dataclasses.dataclass
+class RoundTrips:
+    """Messages sent to the database server, excluding those that set up a connection."""
+
+    statements: int = 0
+    commits: int = 0
+    rollbacks: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.statements + self.commits + self.rollbacks
+
+
+@contextlib.contextmanager
+def count_round_trips(mocker: MockerFixture) -> Iterator[RoundTrips]:
+    """Count the round trips to any database made within the context."""
+    round_trips = RoundTrips()
+
+    def count_statement(*_: Any) -> None:  # noqa: ANN401
+        round_trips.statements += 1
+
+    commit = mocker.spy(AsyncAdapt_aiomysql_connection, "commit")
+    rollback = mocker.spy(AsyncAdapt_aiomysql_connection, "rollback")
+    event.listen(Engine, "before_cursor_execute", count_statement)
+    try:
+        yield round_trips
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_statement)
+        round_trips.commits = commit.call_count
+        round_trips.rollbacks = rollback.call_count
+        mocker.stop(commit)
+        mocker.stop(rollback)
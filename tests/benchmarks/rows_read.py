@@ -0,0 +1,35 @@
+import contextlib
+import dataclasses
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+_HANDLER_READS = text("SHOW SESSION STATUS LIKE 'Handler_read%'")
+
+
+@dataclasses.dataclass
+class RowsRead:
+    """Rows read, or looked up in an index, by the storage engine for a session."""
+
+    count: int = 0
+
+
+async def _handler_reads(connection: AsyncConnection) -> int:
+    rows = await connection.execute(_HANDLER_READS)
+    return sum(int(row.Value) for row in rows.all())
+
+
+@contextlib.asynccontextmanager
+async def count_rows_read(connection: AsyncConnection) -> AsyncIterator[RowsRead]:
+    """Count the rows read by statements on `connection` within the context.
+
+    Unlike durations, the count only depends on the data and the query plans.
+    """
+    rows_read = RowsRead()
+    before = await _handler_reads(connection)
+    yield rows_read
+    rows_read.count = await _handler_reads(connection) - before
@@ -0,0 +1,16 @@
+import time
+from collections.abc import Awaitable, Callable
+
+
+async def best_of(repeat: int, query: Callable[[], Awaitable[object]]) -> float:
+    """Return the shortest duration of `repeat` calls to `query`, in seconds.
+
+    Durations vary with the machine and its load, so only record them (e.g., with the
+    `record_property` fixture) and assert on deterministic measures instead.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await query()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
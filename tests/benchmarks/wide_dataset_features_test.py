@@ -0,0 +1,146 @@
+"""Queries and latency of `/datasets/features` for a dataset with many nominal features."""
+
+import contextlib
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import text
+
+import database.datasets
+from routers.openml.datasets import get_dataset_features
+from schemas.datasets.openml import Feature, FeatureType
+from tests.benchmarks.round_trips import count_round_trips
+from tests.benchmarks.timing import best_of
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+_DATASET_ID = 1
+_FEATURES = 2_000
+_VALUES_PER_FEATURE = 5
+
+# Within the session, the temporary tables take the place of the feature tables.
+_CREATE_DATA_FEATURE = text(
+    """
+    CREATE TEMPORARY TABLE data_feature (
+        `did` int unsigned NOT NULL,
+        `index` int unsigned NOT NULL,
+        `name` varchar(64) NOT NULL,
+        `data_type` varchar(64) DEFAULT NULL,
+        `is_target` enum('true','false') NOT NULL DEFAULT 'false',
+        `is_row_identifier` enum('true','false') NOT NULL DEFAULT 'false',
+        `is_ignore` enum('true','false') NOT NULL DEFAULT 'false',
+        `NumberOfMissingValues` int NOT NULL,
+        PRIMARY KEY (`did`, `index`)
+    )
+    """,
+)
+_CREATE_DATA_FEATURE_VALUE = text(
+    """
+    CREATE TEMPORARY TABLE data_feature_value (
+        `did` int unsigned NOT NULL,
+        `index` int unsigned NOT NULL,
+        `value` varchar(256) NOT NULL,
+        PRIMARY KEY (`did`, `index`, `value`)
+    )
+    """,
+)
+_CREATE_DATA_FEATURE_DESCRIPTION = text(
+    """
+    CREATE TEMPORARY TABLE data_feature_description (
+        `did` int unsigned NOT NULL,
+        `index` int unsigned NOT NULL,
+        `description_type` enum('plain','ontology') NOT NULL,
+        `value` varchar(256) NOT NULL
+    )
+    """,
+)
+_FILL_DATA_FEATURE = text(
+    """
+    INSERT INTO data_feature (`did`, `index`, `name`, `data_type`, `NumberOfMissingValues`)
+    WITH RECURSIVE digits(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM digits WHERE n < 9),
+    features(n) AS (
+        SELECT a.n + 10 * b.n + 100 * c.n + 1000 * d.n
+        FROM digits a, digits b, digits c, digits d
+    )
+    SELECT :dataset_id, n, CONCAT('feature_', n), 'nominal', 0
+    FROM features
+    WHERE n < :features
+    """,
+)
+_FILL_DATA_FEATURE_VALUE = text(
+    """
+    INSERT INTO data_feature_value (`did`, `index`, `value`)
+    WITH RECURSIVE val(v) AS (SELECT 0 UNION ALL SELECT v + 1 FROM val WHERE v < :values - 1)
+    SELECT f.`did`, f.`index`, CONCAT('value_', val.v)
+    FROM data_feature f, val
+    """,
+)
+_DROP_TABLES = text(
+    "DROP TEMPORARY TABLE IF EXISTS data_feature, data_feature_value, data_feature_description",
+)
+# The query per nominal feature that fetching all values at once replaced.
+_GET_VALUES_OF_FEATURE = text(
+    """
+    SELECT `value`
+    FROM data_feature_value
+    WHERE `did` = :dataset_id AND `index` = :feature_index
+    """,
+)
+
+
+@contextlib.asynccontextmanager
+async def _wide_dataset(expdb: AsyncConnection) -> AsyncIterator[None]:
+    try:
+        await expdb.execute(_CREATE_DATA_FEATURE)
+        await expdb.execute(_CREATE_DATA_FEATURE_VALUE)
+        await expdb.execute(_CREATE_DATA_FEATURE_DESCRIPTION)
+        await expdb.execute(
+            _FILL_DATA_FEATURE,
+            parameters={"dataset_id": _DATASET_ID, "features": _FEATURES},
+        )
+        await expdb.execute(_FILL_DATA_FEATURE_VALUE, parameters={"values": _VALUES_PER_FEATURE})
+        yield
+    finally:
+        # Temporary tables outlive the transaction, and the connection is reused.
+        await expdb.execute(_DROP_TABLES)
+
+
+@pytest.mark.slow
+async def test_wide_dataset_features_in_constant_queries(
+    mocker: MockerFixture,
+    expdb_test: AsyncConnection,
+    record_property: Callable[[str, object], None],
+) -> None:
+    async def all_at_once() -> list[Feature]:
+        return await get_dataset_features(_DATASET_ID, user=None, expdb=expdb_test)
+
+    async def per_feature() -> list[Feature]:
+        features = await database.datasets.get_features(_DATASET_ID, expdb_test)
+        for feature in features:
+            rows = await expdb_test.execute(
+                _GET_VALUES_OF_FEATURE,
+                parameters={"dataset_id": _DATASET_ID, "feature_index": feature.index},
+            )
+            feature.nominal_values = [row.value for row in rows.all()]
+        return features
+
+    async with _wide_dataset(expdb_test):
+        with count_round_trips(mocker) as round_trips:
+            features = await all_at_once()
+        assert len(features) == _FEATURES
+        assert all(feature.data_type == FeatureType.NOMINAL for feature in features)
+        assert {len(feature.nominal_values or []) for feature in features} == {_VALUES_PER_FEATURE}
+        expected = {f.index: sorted(f.nominal_values or []) for f in await per_feature()}
+        assert {f.index: sorted(f.nominal_values or []) for f in features} == expected
+
+        all_at_once_duration = await best_of(5, all_at_once)
+        per_feature_duration = await best_of(5, per_feature)
+
+    record_property("statements", round_trips.statements)
+    record_property("all_at_once_seconds", all_at_once_duration)
+    record_property("per_feature_seconds", per_feature_duration)
+    # The dataset, its features, their ontologies, and the values of all of them.
+    assert round_trips.statements == 4  # noqa: PLR2004
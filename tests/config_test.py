@@ -1,7 +1,7 @@
 import os
 from unittest import mock
 
-from config import _db_env_credentials
+from config import _db_env_credentials, parse_config
 
 
 def test__db_env_credentials() -> None:
@@ -17,3 +17,10 @@ def test__db_env_credentials() -> None:
 
     assert credentials["username"] == "foo"
     assert credentials["password"] == "bar"  # noqa: S105
+
+
+def test_parse_config_pool_settings() -> None:
+    config = parse_config()
+    assert config.expdb_database.pool_size == 10  # noqa: PLR2004
+    assert config.expdb_database.pool_use_lifo
+    assert config.openml_database.max_overflow == 10  # noqa: PLR2004
@@ -20,9 +20,15 @@ from config import (
     LoggingConfiguration,
     RoutingConfiguration,
 )
+from database.existence import entity_created
 from database.setup import expdb_database, user_database
 from main import create_api
-from routers.dependencies import expdb_connection, userdb_connection
+from routers.dependencies import (
+    expdb_connection,
+    expdb_read_connection,
+    userdb_connection,
+    userdb_read_connection,
+)
 from routers.types import Identifier
 from tests.users import OWNER_USER
 
@@ -95,6 +101,14 @@ async def app() -> AsyncIterator[FastAPI]:
             minio_url="http://minio:9000", server_url="http://php-api:80/"
         ),
         logging=[LoggingConfiguration(sink="sys.stderr", level="DEBUG")],
+        cache_control={
+            "/datasets/{dataset_id}": "private, max-age=60",
+            "/flows/{flow_id}": "public, max-age=300",
+            "/tasks/{task_id}": "public, max-age=300",
+            "/setup/{setup_id}": "public, max-age=300",
+            "/run/{run_id}": "public, max-age=300",
+            "/studies/{alias_or_id}": "private, max-age=60",
+        },
     )
     _app = create_api(config)
     async with LifespanManager(_app):
@@ -122,6 +136,8 @@ async def py_api(
 
     app.dependency_overrides[expdb_connection] = override_expdb
     app.dependency_overrides[userdb_connection] = override_userdb
+    app.dependency_overrides[expdb_read_connection] = override_expdb
+    app.dependency_overrides[userdb_read_connection] = override_userdb
 
     async with httpx.AsyncClient(
         transport=httpx.ASGITransport(app=app),
@@ -132,6 +148,8 @@ async def py_api(
 
     app.dependency_overrides[expdb_connection] = expdb_connection
     app.dependency_overrides[userdb_connection] = userdb_connection
+    app.dependency_overrides[expdb_read_connection] = expdb_read_connection
+    app.dependency_overrides[userdb_read_connection] = userdb_read_connection
 
 
 @pytest.fixture
@@ -191,6 +209,7 @@ async def task_factory(
             """),
             parameters={"task_id": task_id, "ttid": task_type, "creator": creator},
         )
+        entity_created("task")
         return Task(task_id, task_type, creator)
 
     return create_task
@@ -225,6 +244,7 @@ async def dataset_factory(
                 "name": f"dataset-name-{dataset_id}",
             },
         )
+        entity_created("dataset")
         return dataset_id
 
     return create_dataset
@@ -250,6 +270,7 @@ async def flow(expdb_test: AsyncConnection) -> Flow:
     )
     result = await expdb_test.execute(text("""SELECT LAST_INSERT_ID();"""))
     (flow_id,) = result.one()
+    entity_created("flow")
     return Flow(id=flow_id, name="name", external_version="external_version")
 
 
@@ -0,0 +1,98 @@
+import asyncio
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import httpx
+
+from config import AdmissionConfiguration, AdmissionGroupConfiguration
+from core.admission import AdmissionControlMiddleware, ConcurrencyLimit
+from core.errors import ServiceOverloadedError
+
+if TYPE_CHECKING:
+    from starlette.types import Receive, Scope, Send
+
+
+def _limit(
+    max_concurrent: int = 1, max_queued: int = 0, queue_timeout: float = 1
+) -> ConcurrencyLimit:
+    group = AdmissionGroupConfiguration(
+        paths=["/datasets"],
+        max_concurrent=max_concurrent,
+        max_queued=max_queued,
+        queue_timeout=queue_timeout,
+    )
+    return ConcurrencyLimit("datasets", group)
+
+
+def test_concurrency_limit_matches_path_prefix() -> None:
+    limit = _limit()
+    assert limit.matches("/datasets")
+    assert limit.matches("/datasets/list")
+    assert not limit.matches("/datasets_old")
+    assert not limit.matches("/tasks/list")
+
+
+async def test_concurrency_limit_rejects_without_queue() -> None:
+    limit = _limit(max_concurrent=1, max_queued=0)
+    async with limit.admit() as first, limit.admit() as second:
+        assert (first, second) == (True, False)
+    async with limit.admit() as third:
+        assert third
+    assert limit.rejected == 1
+
+
+async def test_concurrency_limit_queued_request_is_admitted_once_slot_frees() -> None:
+    limit = _limit(max_concurrent=1, max_queued=1)
+    release = asyncio.Event()
+
+    async def hold() -> bool:
+        async with limit.admit() as admitted:
+            await release.wait()
+            return admitted
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert limit.queued == 1
+    async with limit.admit() as overflow:
+        assert not overflow
+    release.set()
+    assert await asyncio.gather(holder, waiter) == [True, True]
+    assert limit.queued == 0
+
+
+async def test_concurrency_limit_queue_timeout() -> None:
+    limit = _limit(max_concurrent=1, max_queued=1, queue_timeout=0.01)
+    async with limit.admit() as first, limit.admit() as second:
+        assert (first, second) == (True, False)
+    assert limit.queued == 0
+
+
+async def test_admission_control_middleware_responds_with_retry_after() -> None:
+    release = asyncio.Event()
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+        await release.wait()
+        await send({"type": "http.response.start", "status": HTTPStatus.OK, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    configuration = AdmissionConfiguration(
+        retry_after=3,
+        groups={"datasets": AdmissionGroupConfiguration(paths=["/datasets"], max_concurrent=1)},
+    )
+    middleware = AdmissionControlMiddleware(app, configuration)
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        admitted = asyncio.create_task(client.get("/datasets/1"))
+        await asyncio.sleep(0.01)
+        rejected = await client.get("/datasets/2")
+        release.set()
+        unlimited = await client.get("/system/ready")
+        assert (await admitted).status_code == HTTPStatus.OK
+
+    assert unlimited.status_code == HTTPStatus.OK
+    assert rejected.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert rejected.headers["retry-after"] == "3"
+    assert rejected.headers["content-type"] == "application/problem+json"
+    assert rejected.json()["type"] == ServiceOverloadedError.uri
@@ -0,0 +1,134 @@
+import uuid
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from config import CacheConfiguration
+from core.cache import (
+    TTLCache,
+    _caches,
+    apply_invalidations,
+    broadcast_invalidation,
+    cache_statistics,
+    cached,
+    configure_caches,
+    invalidate_caches,
+)
+from core.shared_cache import MemoryCacheBackend
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def cache() -> Iterator[TTLCache]:
+    name = f"test-{uuid.uuid4().hex}"
+    yield TTLCache(name, ttl=60, max_size=2)
+    _caches.pop(name)
+
+
+def test_cache_hit_and_miss(cache: TTLCache) -> None:
+    assert cache.get("key") is None
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_entries_expire(cache: TTLCache, mocker: MockerFixture) -> None:
+    monotonic = mocker.patch("core.cache.time.monotonic", return_value=100.0)
+    cache.set("key", "value")
+    monotonic.return_value = 100.0 + cache.ttl + 1
+    assert cache.get("key", "expired") == "expired"
+
+
+def test_cache_evicts_least_recently_used(cache: TTLCache) -> None:
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_cache_none_expires_after_negative_ttl(cache: TTLCache, mocker: MockerFixture) -> None:
+    cache.negative_ttl = 1
+    monotonic = mocker.patch("core.cache.time.monotonic", return_value=100.0)
+    cache.set("missing", None)
+    cache.set("present", "value")
+    monotonic.return_value = 102.0
+    assert cache.get("missing", "expired") == "expired"
+    assert cache.get("present") == "value"
+
+
+def test_cache_invalidate_tag(cache: TTLCache) -> None:
+    cache.set("a", 1, tags=["user:1", "user:2"])
+    cache.set("b", 2, tags=["user:2"])
+    cache.invalidate_tag("user:1")
+    assert (cache.get("a"), cache.get("b")) == (None, 2)
+    cache.set("b", 3)
+    cache.invalidate_tag("user:2")
+    assert cache.get("b") == 3, "tags of an overwritten entry no longer apply"  # noqa: PLR2004
+    assert cache._keys_by_tag == {}  # noqa: SLF001
+
+
+def test_cache_disabled_with_zero_ttl(cache: TTLCache) -> None:
+    cache.ttl = 0
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+
+def test_cache_duplicate_name(cache: TTLCache) -> None:
+    with pytest.raises(ValueError, match="already exists"):
+        TTLCache(cache.name)
+
+
+def test_invalidate_caches(cache: TTLCache) -> None:
+    cache.set("key", "value")
+    assert invalidate_caches(cache.name)
+    assert cache.get("key") is None
+    assert not invalidate_caches("does-not-exist")
+
+
+def test_configure_caches(cache: TTLCache) -> None:
+    cache.set("key", "value")
+    configure_caches({cache.name: CacheConfiguration(ttl=5, max_size=10, negative_ttl=1)})
+    assert (cache.ttl, cache.max_size, cache.negative_ttl) == (5, 10, 1)
+    assert cache.get("key") is None
+    assert cache.name in {statistics["name"] for statistics in cache_statistics()}
+
+
+async def test_cached_query_is_keyed_on_arguments_but_connection(cache: TTLCache) -> None:
+    calls = []
+
+    @cached(cache)
+    async def query(id_: int, connection: object) -> int:
+        calls.append((id_, connection))
+        return id_ * 2
+
+    assert await query(1, "connection") == 2  # noqa: PLR2004
+    assert await query(1, connection="other connection") == 2  # noqa: PLR2004
+    assert await query(id_=2, connection="connection") == 4  # noqa: PLR2004
+    assert calls == [(1, "connection"), (2, "connection")]
+
+
+async def test_invalidation_is_broadcast_to_other_workers(
+    cache: TTLCache,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("core.cache.shared_cache", return_value=MemoryCacheBackend())
+    mocker.patch("core.cache._generations", {})
+    await apply_invalidations()
+    cache.set("key", "value")
+
+    with patch("core.cache._generations", {}):  # as another worker
+        await broadcast_invalidation(cache.name)
+    assert cache.get("key") == "value"
+    await apply_invalidations()
+    assert cache.get("key") is None
+
+    cache.set("key", "value")
+    await broadcast_invalidation(cache.name)
+    await apply_invalidations()
+    assert cache.get("key") == "value", "a worker does not clear its cache by its own broadcast"
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+from collections.abc import Iterator
+
+import pytest
+
+from core.coalescing import SingleFlight, _groups, coalescing_statistics
+
+
+@pytest.fixture
+def group() -> Iterator[SingleFlight]:
+    name = f"test-{uuid.uuid4().hex}"
+    yield SingleFlight(name)
+    _groups.pop(name)
+
+
+async def test_single_flight_shares_result(group: SingleFlight) -> None:
+    computations = 0
+    release = asyncio.Event()
+
+    async def compute() -> str:
+        nonlocal computations
+        computations += 1
+        await release.wait()
+        return "result"
+
+    calls = [asyncio.create_task(group("key", compute)) for _ in range(5)]
+    other = asyncio.create_task(group("other", compute))
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*calls) == ["result"] * 5
+    await other
+    assert computations == 2  # noqa: PLR2004
+    assert group.statistics() == {
+        "name": group.name,
+        "computations": 2,
+        "coalesced": 4,
+        "in_flight": 0,
+    }
+    assert group.statistics() in coalescing_statistics()
+
+
+async def test_single_flight_does_not_keep_results(group: SingleFlight) -> None:
+    async def compute() -> object:
+        return object()
+
+    assert await group("key", compute) is not await group("key", compute)
+
+
+async def test_single_flight_shares_exception(group: SingleFlight) -> None:
+    release = asyncio.Event()
+
+    async def compute() -> None:
+        await release.wait()
+        msg = "failed"
+        raise ValueError(msg)
+
+    calls = [asyncio.create_task(group("key", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert group.computations == 1
+
+
+async def test_single_flight_waiter_recomputes_if_leader_cancelled(group: SingleFlight) -> None:
+    release = asyncio.Event()
+
+    async def compute() -> str:
+        await release.wait()
+        return "result"
+
+    leader = asyncio.create_task(group("key", compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(group("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await waiter == "result"
+    assert leader.cancelled()
+    assert group.computations == 2  # noqa: PLR2004
+
+
+async def test_single_flight_cancelled_waiter_does_not_cancel_leader(
+    group: SingleFlight,
+) -> None:
+    release = asyncio.Event()
+
+    async def compute() -> str:
+        await release.wait()
+        return "result"
+
+    leader = asyncio.create_task(group("key", compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(group("key", compute))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    assert await leader == "result"
+    assert waiter.cancelled()
+
+
+def test_single_flight_duplicate_name(group: SingleFlight) -> None:
+    with pytest.raises(ValueError, match="already exists"):
+        SingleFlight(group.name)
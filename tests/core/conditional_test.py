@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.datastructures import Headers
+
+from core.conditional import ConditionalRequestMiddleware, entity_tag, is_not_modified
+
+ETAG = entity_tag(b"body")
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, False),
+        ({"if-none-match": ETAG}, True),
+        ({"if-none-match": f'"other", W/{ETAG}'}, True),
+        ({"if-none-match": "*"}, True),
+        ({"if-none-match": '"other"'}, False),
+        # Responses have no Last-Modified time to compare with
+        ({"if-modified-since": "Tue, 14 Nov 2023 22:13:20 GMT"}, False),
+    ],
+)
+def test_is_not_modified(headers: dict[str, str], expected: bool) -> None:  # noqa: FBT001
+    assert is_not_modified(Headers(headers), ETAG) == expected
+
+
+def _client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.add_middleware(
+        ConditionalRequestMiddleware,
+        cache_control={"/items/{item_id}": "public, max-age=60"},
+    )
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    @app.get("/other")
+    async def get_other() -> dict[str, int]:
+        return {"id": 0}
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_conditional_request_not_modified() -> None:
+    async with _client() as client:
+        response = await client.get("/items/1")
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {"id": 1}
+        assert response.headers["cache-control"] == "public, max-age=60"
+        etag = response.headers["etag"]
+        assert "last-modified" not in response.headers
+
+        response = await client.get("/items/1", headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert "content-type" not in response.headers
+
+        response = await client.get("/items/2", headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["etag"] != etag
+
+
+async def test_conditional_request_ignores_other_routes() -> None:
+    async with _client() as client:
+        response = await client.get("/other")
+    assert response.status_code == HTTPStatus.OK
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
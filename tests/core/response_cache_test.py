@@ -0,0 +1,153 @@
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from config import ResponseCacheConfiguration, parse_config
+from core.conditional import ConditionalRequestMiddleware
+from core.response_cache import ResponseCacheMiddleware, decode_response, encode_response
+from core.shared_cache import MemoryCacheBackend, RedisCacheBackend, invalidate
+from routers.openml.datasets import router as datasets_router
+from routers.openml.tasks import router as tasks_router
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def backend(mocker: MockerFixture) -> MemoryCacheBackend:
+    backend = MemoryCacheBackend()
+    mocker.patch("core.response_cache.shared_cache", return_value=backend)
+    mocker.patch("core.shared_cache.shared_cache", return_value=backend)
+    return backend
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[tuple[httpx.AsyncClient, list[int]]]:
+    handled: list[int] = []
+    app = FastAPI()
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        configuration=ResponseCacheConfiguration(
+            routes={"/items/{item_id}": ["item:{item_id}"]},
+        ),
+    )
+    app.add_middleware(
+        ConditionalRequestMiddleware,
+        cache_control={"/items/{item_id}": "public, max-age=60"},
+    )
+
+    @app.get("/items/list")
+    async def list_items() -> list[int]:
+        handled.append(-1)
+        return [1, 2]
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict[str, int]:
+        handled.append(item_id)
+        if item_id == 0:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND)
+        return {"id": item_id}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, handled
+
+
+def test_encode_decode_response() -> None:
+    start = {
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    }
+    assert decode_response(encode_response(start, b'{"a":\n1}')) == (start, b'{"a":\n1}')
+
+
+@pytest.mark.usefixtures("backend")
+async def test_response_served_from_cache(client: tuple[httpx.AsyncClient, list[int]]) -> None:
+    http, handled = client
+    first = await http.get("/items/1")
+    second = await http.get("/items/1")
+    assert first.status_code == second.status_code == HTTPStatus.OK
+    assert first.json() == second.json() == {"id": 1}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert handled == [1]
+
+    # Conditional requests are also answered from the cache.
+    response = await http.get("/items/1", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert handled == [1]
+
+    await http.get("/items/1", params={"format": "json"})
+    assert handled == [1, 1]
+
+
+@pytest.mark.usefixtures("backend")
+async def test_response_not_cached(client: tuple[httpx.AsyncClient, list[int]]) -> None:
+    http, handled = client
+    for _ in range(2):
+        await http.get("/items/0")
+        await http.get("/items/2", params={"api_key": "abc"})
+    assert handled == [0, 2, 0, 2]
+
+
+@pytest.mark.usefixtures("backend")
+async def test_response_invalidated(client: tuple[httpx.AsyncClient, list[int]]) -> None:
+    http, handled = client
+    await http.get("/items/1")
+    await http.get("/items/2")
+    await invalidate("item:1")
+    await http.get("/items/1")
+    await http.get("/items/2")
+    assert handled == [1, 2, 1]
+
+
+async def test_response_cache_unavailable(
+    client: tuple[httpx.AsyncClient, list[int]],
+    mocker: MockerFixture,
+) -> None:
+    unreachable = RedisCacheBackend("redis://127.0.0.1:1/0")
+    mocker.patch("core.response_cache.shared_cache", return_value=unreachable)
+    http, handled = client
+    for _ in range(2):
+        response = await http.get("/items/1")
+        assert response.status_code == HTTPStatus.OK
+    assert handled == [1, 1]
+
+
+@pytest.mark.usefixtures("backend")
+async def test_response_of_route_matched_first(
+    client: tuple[httpx.AsyncClient, list[int]],
+) -> None:
+    http, handled = client
+    for _ in range(2):
+        response = await http.get("/items/list")
+        assert response.status_code == HTTPStatus.OK
+        # Not handled as `/items/{item_id}`, so neither cached nor given its Cache-Control.
+        assert "cache-control" not in response.headers
+    assert handled == [-1, -1]
+
+
+@pytest.mark.parametrize(
+    ("path", "cached_as"),
+    [
+        ("/datasets/list", None),
+        ("/tasks/list", None),
+        ("/datasets/61", "/datasets/{dataset_id}"),
+        ("/tasks/59", "/tasks/{task_id}"),
+    ],
+)
+def test_configured_routes_match_as_routed(path: str, cached_as: str | None) -> None:
+    app = FastAPI()
+    app.include_router(datasets_router)
+    app.include_router(tasks_router)
+    configuration = parse_config().response_cache
+    assert {"/datasets/{dataset_id}", "/tasks/{task_id}"} <= configuration.routes.keys()
+
+    middleware = ResponseCacheMiddleware(app, configuration=configuration)
+    scope = {"type": "http", "method": "GET", "path": path, "root_path": "", "app": app}
+    matched = middleware._match(scope)  # noqa: SLF001
+    assert (matched[0] if matched else None) == cached_as
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+import pytest
+
+from core.shared_cache import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    RedisError,
+    invalidate,
+)
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+class RedisStandIn:
+    """Serves the subset of the Redis protocol used by `RedisCacheBackend`."""
+
+    def __init__(self) -> None:
+        self.values: dict[bytes, bytes | set[bytes]] = {}
+        self.expires: dict[bytes, float] = {}
+        self.commands: list[list[bytes]] = []
+
+    async def serve(self) -> AsyncIterator[str]:
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server:
+            yield f"redis://{host}:{port}/0"
+
+    def _expire(self, key: bytes) -> None:
+        if self.expires.get(key, float("inf")) < time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while header := await reader.readline():
+            command = []
+            for _ in range(int(header[1:])):
+                length = int((await reader.readline())[1:])
+                command.append((await reader.readexactly(length + 2))[:-2])
+            self.commands.append(command)
+            writer.write(self._execute(command[0].upper().decode(), *command[1:]))
+            await writer.drain()
+        writer.close()
+
+    def _execute(self, name: str, *args: bytes) -> bytes:  # noqa: PLR0911
+        for key in args[:1]:
+            self._expire(key)
+        match name, args:
+            case "GET", (key,):
+                value = self.values.get(key)
+                return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            case "SET", (key, value, b"PX", milliseconds):
+                self.values[key] = value
+                self.expires[key] = time.monotonic() + int(milliseconds) / 1000
+                return b"+OK\r\n"
+            case "SADD", (key, member):
+                self.values.setdefault(key, set()).add(member)  # type: ignore[union-attr]
+                return b":1\r\n"
+            case "PEXPIRE", (key, milliseconds, option):
+                expires = time.monotonic() + int(milliseconds) / 1000
+                current = self.expires.get(key)
+                if (option == b"NX" and current is None) or (
+                    option == b"GT" and current is not None and expires > current
+                ):
+                    self.expires[key] = expires
+                    return b":1\r\n"
+                return b":0\r\n"
+            case "SMEMBERS", (key,):
+                members = self.values.get(key, set())
+                return b"*%d\r\n" % len(members) + b"".join(
+                    b"$%d\r\n%s\r\n" % (len(member), member) for member in members
+                )
+            case "DEL", keys:
+                deleted = [self.values.pop(key, None) for key in keys]
+                return b":%d\r\n" % sum(value is not None for value in deleted)
+            case "FLUSHDB", ():
+                self.values.clear()
+                return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+async def redis() -> AsyncIterator[tuple[RedisStandIn, str]]:
+    stand_in = RedisStandIn()
+    async for url in stand_in.serve():
+        yield stand_in, url
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(
+    request: pytest.FixtureRequest,
+    redis: tuple[RedisStandIn, str],
+) -> AsyncIterator[CacheBackend]:
+    _, url = redis
+    backend = MemoryCacheBackend() if request.param == "memory" else RedisCacheBackend(url)
+    yield backend
+    await backend.close()
+
+
+async def test_backend_get_set(backend: CacheBackend) -> None:
+    assert await backend.get("key") is None
+    await backend.set("key", b"value\r\nwith newline", ttl=60)
+    assert await backend.get("key") == b"value\r\nwith newline"
+
+
+async def test_backend_entries_expire(backend: CacheBackend) -> None:
+    await backend.set("key", b"value", ttl=0.01)
+    await asyncio.sleep(0.02)
+    assert await backend.get("key") is None
+
+
+async def test_backend_invalidate_tags(backend: CacheBackend) -> None:
+    await backend.set("dataset", b"1", ttl=60, tags=["dataset:1"])
+    await backend.set("both", b"2", ttl=60, tags=["dataset:1", "task:2"])
+    await backend.set("task", b"3", ttl=60, tags=["task:2"])
+    await backend.set("untagged", b"4", ttl=60)
+
+    await backend.invalidate_tags(["dataset:1"])
+    assert await backend.get("dataset") is None
+    assert await backend.get("both") is None
+    assert await backend.get("task") == b"3"
+    assert await backend.get("untagged") == b"4"
+
+    await backend.invalidate_tags(["task:2", "unknown"])
+    assert await backend.get("task") is None
+
+
+async def test_backend_clear(backend: CacheBackend) -> None:
+    await backend.set("key", b"value", ttl=60, tags=["tag"])
+    await backend.clear()
+    assert await backend.get("key") is None
+
+
+async def test_redis_backend_is_shared(redis: tuple[RedisStandIn, str]) -> None:
+    _, url = redis
+    first, second = RedisCacheBackend(url), RedisCacheBackend(url)
+    await first.set("key", b"value", ttl=60, tags=["dataset:1"])
+    assert await second.get("key") == b"value"
+    await second.invalidate_tags(["dataset:1"])
+    assert await first.get("key") is None
+    await asyncio.gather(first.close(), second.close())
+
+
+async def test_redis_backend_reuses_connections(redis: tuple[RedisStandIn, str]) -> None:
+    stand_in, url = redis
+    max_connections, requests = 2, 10
+    backend = RedisCacheBackend(url, max_connections=max_connections)
+    await asyncio.gather(*(backend.set(f"key{i}", b"value", ttl=60) for i in range(requests)))
+    assert len(backend._idle) == max_connections  # noqa: SLF001
+    assert len(stand_in.commands) == requests
+    await backend.close()
+
+
+async def test_redis_backend_error_reply(redis: tuple[RedisStandIn, str]) -> None:
+    _, url = redis
+    backend = RedisCacheBackend(url)
+    connection = await backend._connect()  # noqa: SLF001
+    with pytest.raises(RedisError, match="unknown command"):
+        await connection.execute("UNKNOWN")
+    await connection.close()
+
+
+async def test_redis_backend_times_out_unresponsive_server() -> None:
+    async def never_reply(reader: asyncio.StreamReader, _: asyncio.StreamWriter) -> None:
+        await reader.read()
+
+    server = await asyncio.start_server(never_reply, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    async with server:
+        backend = RedisCacheBackend(f"redis://{host}:{port}/0", timeout=0.05)
+        with pytest.raises(TimeoutError):
+            await backend.get("key")
+        # The reply may still arrive, so the connection is not reused.
+        assert not backend._idle  # noqa: SLF001
+        await backend.close()
+
+
+async def test_invalidate_logs_unavailable_backend(mocker: MockerFixture) -> None:
+    unreachable = RedisCacheBackend("redis://127.0.0.1:1/0")
+    mocker.patch("core.shared_cache.shared_cache", return_value=unreachable)
+    await invalidate("dataset:1")  # does not raise
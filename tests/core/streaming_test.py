@@ -0,0 +1,36 @@
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+from pydantic import BaseModel
+
+from core.streaming import json_object_with_array
+
+
+class Item(BaseModel):
+    value: int
+
+
+async def _items(n: int) -> AsyncIterator[Item]:
+    for value in range(n):
+        yield Item(value=value)
+
+
+@pytest.mark.parametrize("n_items", [0, 1, 50])
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+async def test_json_object_with_array(n_items: int, chunk_size: int) -> None:
+    chunks = [
+        chunk
+        async for chunk in json_object_with_array(
+            {"id": 1},
+            "items",
+            _items(n_items),
+            chunk_size=chunk_size,
+        )
+    ]
+    assert json.loads(b"".join(chunks)) == {
+        "id": 1,
+        "items": [{"value": value} for value in range(n_items)],
+    }
+    if chunk_size == 1:
+        assert len(chunks) == n_items + 1
@@ -0,0 +1,165 @@
+import asyncio
+import math
+from typing import TYPE_CHECKING, cast
+
+import anyio
+import pytest
+from sqlalchemy import text
+
+from core.cancellation import CLIENT_CLOSED_REQUEST, CancelOnDisconnectMiddleware
+from database.connection import LazyConnection, QueryFanOut, after_commit
+from database.setup import expdb_database
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+    from sqlalchemy.pool import QueuePool
+    from starlette.types import Message, Receive, Scope, Send
+
+
+async def test_lazy_connection_checks_out_on_first_execute() -> None:
+    engine = expdb_database()
+    pool = cast("QueuePool", engine.pool)
+    checked_out_before = pool.checkedout()
+    async with LazyConnection(engine) as connection:
+        assert not connection.checked_out
+        assert pool.checkedout() == checked_out_before
+
+        result = await connection.execute(text("SELECT 1"))
+        assert result.scalar_one() == 1
+        assert connection.checked_out
+        assert pool.checkedout() == checked_out_before + 1
+    assert pool.checkedout() == checked_out_before
+
+
+async def test_lazy_connection_unused_never_checks_out() -> None:
+    engine = expdb_database()
+    pool = cast("QueuePool", engine.pool)
+    checked_out_before = pool.checkedout()
+    async with LazyConnection(engine) as connection:
+        pass
+    assert not connection.checked_out
+    assert pool.checkedout() == checked_out_before
+
+
+@pytest.mark.mut
+async def test_lazy_connection_rolls_back_on_error() -> None:
+    engine = expdb_database()
+    tag = "lazy-connection-rollback"
+
+    async def tag_then_fail() -> None:
+        async with LazyConnection(engine) as connection:
+            await connection.execute(
+                text("INSERT INTO task_tag(`id`, `tag`, `uploader`) VALUES (1, :tag, 1)"),
+                parameters={"tag": tag},
+            )
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await tag_then_fail()
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text("SELECT 1 FROM task_tag WHERE `tag` = :tag"),
+            parameters={"tag": tag},
+        )
+        assert result.one_or_none() is None
+
+
+async def test_lazy_connection_returned_to_pool_after_disconnect() -> None:
+    engine = expdb_database()
+    pool = cast("QueuePool", engine.pool)
+    checked_out_before = pool.checkedout()
+    queried = anyio.Event()
+
+    async def app(_scope: Scope, _receive: Receive, _send: Send) -> None:
+        async with LazyConnection(engine) as connection:
+            await connection.execute(text("SELECT 1"))
+            queried.set()
+            await anyio.sleep(math.inf)
+
+    async def receive() -> Message:
+        await queried.wait()
+        return {"type": "http.disconnect"}
+
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await CancelOnDisconnectMiddleware(app)({"type": "http"}, receive, send)
+    assert sent[0]["status"] == CLIENT_CLOSED_REQUEST
+    # The rollback was not cancelled along with the request.
+    assert pool.checkedout() == checked_out_before
+
+
+async def test_after_commit_awaited_once_committed() -> None:
+    committed: list[str] = []
+
+    async def record() -> None:
+        committed.append("tag")
+
+    async with LazyConnection(expdb_database()) as connection:
+        await connection.execute(text("SELECT 1"))
+        await after_commit(cast("AsyncConnection", connection), record)
+        assert committed == []
+    assert committed == ["tag"]
+
+
+async def test_after_commit_not_awaited_on_rollback() -> None:
+    committed: list[str] = []
+
+    async def record() -> None:
+        committed.append("tag")
+
+    async def record_then_fail() -> None:
+        async with LazyConnection(expdb_database()) as connection:
+            await connection.execute(text("SELECT 1"))
+            await after_commit(cast("AsyncConnection", connection), record)
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await record_then_fail()
+    assert committed == []
+
+
+async def test_after_commit_awaited_now_for_other_connections(expdb_test: AsyncConnection) -> None:
+    committed: list[str] = []
+
+    async def record() -> None:
+        committed.append("tag")
+
+    await after_commit(expdb_test, record)
+    assert committed == ["tag"]
+
+
+async def _connection_id(connection: AsyncConnection) -> int:
+    result = await connection.execute(text("SELECT CONNECTION_ID()"))
+    return cast("int", result.scalar_one())
+
+
+async def test_fan_out_runs_on_the_given_connection(expdb_test: AsyncConnection) -> None:
+    fan_out = QueryFanOut(expdb_test)
+    own_id = await _connection_id(expdb_test)
+    ids = await asyncio.gather(fan_out(_connection_id), fan_out(_connection_id))
+    assert ids == [own_id, own_id]
+
+
+async def test_fan_out_borrows_connections_up_to_limit() -> None:
+    engine = expdb_database()
+    active, most_active = 0, 0
+
+    async def track_concurrency(connection: AsyncConnection) -> int:
+        nonlocal active, most_active
+        active += 1
+        most_active = max(most_active, active)
+        await connection.execute(text("SELECT SLEEP(0.05)"))
+        active -= 1
+        return await _connection_id(connection)
+
+    async with engine.connect(), engine.connect():
+        pass  # Both connections are idle in the pool now, and can be borrowed.
+    async with LazyConnection(engine, max_parallel_queries=2) as lazy:
+        fan_out = QueryFanOut(cast("AsyncConnection", lazy))
+        ids = await asyncio.gather(*(fan_out(track_concurrency) for _ in range(4)))
+        assert not lazy.checked_out
+    assert most_active == 2  # noqa: PLR2004
+    assert len(set(ids)) >= 2  # noqa: PLR2004
@@ -0,0 +1,118 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import text
+
+import database.datasets
+from schemas.datasets.openml import DatasetStatus
+from tests.users import ADMIN_USER
+
+if TYPE_CHECKING:
+    import httpx
+    from pytest_mock import MockerFixture
+    from sqlalchemy import TextClause
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from tests.conftest import DatasetFactory
+
+
+_LATEST_STATUS_QUERY = text(
+    """
+    SELECT ds1.`did`, ds1.`status`
+    FROM dataset_status AS ds1
+    WHERE ds1.`status_date` = (
+        SELECT MAX(ds2.`status_date`) FROM dataset_status AS ds2 WHERE ds1.`did` = ds2.`did`
+    )
+    """,
+)
+_CURRENT_STATUS_QUERY = text("SELECT `did`, `status` FROM dataset_current_status")
+
+
+async def _status_by_dataset(query: TextClause, expdb: AsyncConnection) -> dict[int, str]:
+    rows = await expdb.execute(query)
+    return {row.did: row.status for row in rows.all()}
+
+
+async def test_current_status_matches_history(expdb_test: AsyncConnection) -> None:
+    latest = await _status_by_dataset(_LATEST_STATUS_QUERY, expdb_test)
+    assert await _status_by_dataset(_CURRENT_STATUS_QUERY, expdb_test) == latest
+    assert await database.datasets.has_current_status_table(expdb_test)
+
+
+async def test_status_without_current_status_table(
+    expdb_test: AsyncConnection,
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    latest = await _status_by_dataset(_LATEST_STATUS_QUERY, expdb_test)
+    expected_lists = [
+        (await py_api.post(path, json={"status": "all"})).json()
+        for path in ("/datasets/list", "/tasks/list")
+    ]
+    # E.g., `python -m database repair-status` was not run yet.
+    mocker.patch.object(database.datasets, "has_current_status_table", return_value=False)
+
+    statuses = await database.datasets.get_statuses(list(latest), expdb_test)
+    assert statuses == {did: DatasetStatus(status) for did, status in latest.items()}
+    for did, status in latest.items():
+        assert await database.datasets.get_status(did, expdb_test) == status
+    lists = [
+        (await py_api.post(path, json={"status": "all"})).json()
+        for path in ("/datasets/list", "/tasks/list")
+    ]
+    assert lists == expected_lists
+
+
+@pytest.mark.mut
+async def test_current_status_follows_changes(
+    expdb_test: AsyncConnection,
+    dataset_factory: DatasetFactory,
+) -> None:
+    dataset_id = await dataset_factory()
+    assert await database.datasets.get_status(dataset_id, expdb_test) == (
+        DatasetStatus.IN_PREPARATION
+    )
+    for status in [DatasetStatus.ACTIVE, DatasetStatus.DEACTIVATED]:
+        await database.datasets.update_status(
+            dataset_id, status, user_id=ADMIN_USER.user_id, connection=expdb_test
+        )
+        assert await database.datasets.get_status(dataset_id, expdb_test) == status
+
+    await database.datasets.remove_deactivated_status(dataset_id, expdb_test)
+    assert await database.datasets.get_status(dataset_id, expdb_test) == DatasetStatus.ACTIVE
+
+
+@pytest.mark.mut
+async def test_current_status_follows_changes_by_other_applications(
+    expdb_test: AsyncConnection,
+    dataset_factory: DatasetFactory,
+) -> None:
+    dataset_id = await dataset_factory()
+    # E.g., the PHP API or the processing pipeline, which only write `dataset_status`.
+    await expdb_test.execute(
+        text(
+            "INSERT INTO dataset_status(`did`, `status`, `status_date`, `user_id`) "
+            "VALUES (:did, 'active', '2020-01-01 00:00:00', 1)",
+        ),
+        parameters={"did": dataset_id},
+    )
+    assert await database.datasets.get_status(dataset_id, expdb_test) == DatasetStatus.ACTIVE
+
+    await expdb_test.execute(
+        text("DELETE FROM dataset_status WHERE `did` = :did"),
+        parameters={"did": dataset_id},
+    )
+    assert await database.datasets.get_status(dataset_id, expdb_test) == (
+        DatasetStatus.IN_PREPARATION
+    )
+
+
+@pytest.mark.mut
+async def test_repair_current_status(expdb_test: AsyncConnection) -> None:
+    latest = await _status_by_dataset(_LATEST_STATUS_QUERY, expdb_test)
+    # E.g., the table is out of date, as it was created after the statuses were set.
+    await expdb_test.execute(text("UPDATE dataset_current_status SET `status`='deactivated'"))
+    await expdb_test.execute(text("DELETE FROM dataset_current_status WHERE `did` = 2"))
+
+    assert await database.datasets.repair_current_status(expdb_test) == len(latest)
+    assert await _status_by_dataset(_CURRENT_STATUS_QUERY, expdb_test) == latest
@@ -0,0 +1,58 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database.deadlines import add_execution_time_hint, is_query_timeout, statement_deadline
+from database.exceptions import _QUERY_TIMEOUT
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+def _hinted(statement: str) -> str:
+    hinted, _ = add_execution_time_hint(None, None, statement, {}, None, executemany=False)  # type: ignore[arg-type]
+    return hinted
+
+
+def test_add_execution_time_hint_without_deadline() -> None:
+    assert _hinted("SELECT 1") == "SELECT 1"
+
+
+def test_add_execution_time_hint_with_deadline() -> None:
+    with statement_deadline(2.5):
+        assert _hinted("\n SELECT `id` FROM dataset") == (
+            "\n SELECT /*+ MAX_EXECUTION_TIME(2500) */ `id` FROM dataset"
+        )
+    assert _hinted("SELECT 1") == "SELECT 1"
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["INSERT INTO dataset_tag(`id`) VALUES (1)", "UPDATE dataset SET `name`='a'", "SHOW TABLES"],
+)
+def test_add_execution_time_hint_ignores_other_statements(statement: str) -> None:
+    with statement_deadline(1):
+        assert _hinted(statement) == statement
+
+
+@pytest.mark.parametrize(
+    ("orig", "expected"),
+    [
+        (Exception(_QUERY_TIMEOUT, "Query execution was interrupted"), True),
+        (Exception(2013, "Lost connection to MySQL server during query"), False),
+    ],
+)
+def test_is_query_timeout(orig: Exception, expected: bool) -> None:  # noqa: FBT001
+    error = OperationalError("SELECT 1", {}, orig)
+    assert is_query_timeout(error) == expected
+
+
+async def test_statement_deadline_interrupts_query(expdb_test: AsyncConnection) -> None:
+    slow_query = text(
+        "SELECT COUNT(*) FROM information_schema.columns AS a, information_schema.columns AS b",
+    )
+    with statement_deadline(0.001), pytest.raises(OperationalError) as error:
+        await expdb_test.execute(slow_query)
+    assert is_query_timeout(error.value)
@@ -0,0 +1,43 @@
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import pytest
+
+from database.caches import max_ids
+from database.existence import entity_created, may_exist
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from tests.conftest import DatasetFactory
+
+
+@pytest.fixture(autouse=True)
+def empty_caches() -> Iterator[None]:
+    max_ids.invalidate()
+    yield
+    max_ids.invalidate()
+
+
+async def test_may_exist_below_watermark(expdb_test: AsyncConnection) -> None:
+    assert await may_exist("dataset", 1, expdb_test)
+    assert max_ids.get("dataset") is not None
+
+
+async def test_may_exist_above_watermark(expdb_test: AsyncConnection) -> None:
+    assert not await may_exist("task", 10**12, expdb_test)
+
+
+async def test_may_exist_after_creation(
+    expdb_test: AsyncConnection,
+    dataset_factory: DatasetFactory,
+) -> None:
+    max_ids.set("dataset", 1)
+    dataset_id = await dataset_factory()
+    assert await may_exist("dataset", dataset_id, expdb_test)
+
+
+def test_entity_created_keeps_other_entities() -> None:
+    max_ids.set("flow", 10)
+    entity_created("dataset")
+    assert max_ids.get("flow") == 10  # noqa: PLR2004
@@ -0,0 +1,111 @@
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import text
+
+import database.qualities
+from database.qualities import SUMMARY_QUALITIES, range_clause, summary_to_qualities
+
+if TYPE_CHECKING:
+    import httpx
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from tests.conftest import DatasetFactory
+
+
+_GET_SUMMARY_QUERY = text("SELECT * FROM dataset_quality_summary WHERE `did` = :dataset_id")
+_ADD_QUALITY_QUERY = text(
+    """
+    INSERT INTO data_quality(`data`, `quality`, `evaluation_engine_id`, `value`)
+    VALUES (:dataset_id, :quality, 1, :value)
+    """,
+)
+
+
+@pytest.mark.parametrize(
+    ("range_", "low", "high"),
+    [("150", 150, 150), ("2..100", 2, 100), ("0.5..1.5", 0.5, 1.5)],
+)
+def test_range_clause(range_: str, low: float, high: float) -> None:
+    parameters: dict[str, Any] = {}
+    clause = range_clause("NumberOfInstances", range_, parameters, summary=True)
+    assert clause == (
+        "AND qs.`NumberOfInstances` BETWEEN :NumberOfInstances_low AND :NumberOfInstances_high"
+    )
+    assert parameters == {"NumberOfInstances_low": low, "NumberOfInstances_high": high}
+
+
+def test_range_clause_without_summary() -> None:
+    parameters: dict[str, Any] = {}
+    clause = range_clause("NumberOfInstances", "2..100", parameters, summary=False)
+    assert "FROM data_quality" in clause
+    assert "`quality`='NumberOfInstances'" in clause
+    assert parameters == {"NumberOfInstances_low": 2, "NumberOfInstances_high": 100}
+
+
+@pytest.mark.parametrize("summary", [True, False])
+def test_range_clause_without_range(summary: bool) -> None:  # noqa: FBT001
+    assert range_clause("NumberOfInstances", None, {}, summary=summary) == ""
+
+
+@pytest.mark.parametrize(("quality", "range_"), [("MinorityClassSize", "1"), ("; --", "1")])
+def test_range_clause_only_indexed_qualities(quality: str, range_: str) -> None:
+    with pytest.raises(ValueError, match="not indexed"):
+        range_clause(quality, range_, {}, summary=False)
+
+
+async def test_summary_matches_data_quality(expdb_test: AsyncConnection) -> None:
+    summary = (await expdb_test.execute(_GET_SUMMARY_QUERY, {"dataset_id": 1})).mappings().one()
+    qualities = await database.qualities.get_for_dataset(1, expdb_test)
+    expected = {
+        q.name: q.value for q in qualities if q.name in SUMMARY_QUALITIES and q.value is not None
+    }
+    assert {q.name: q.value for q in summary_to_qualities(summary)} == expected
+
+
+@pytest.mark.mut
+async def test_summary_follows_data_quality(
+    expdb_test: AsyncConnection,
+    dataset_factory: DatasetFactory,
+) -> None:
+    dataset_id = await dataset_factory()
+    parameters = {"dataset_id": dataset_id, "quality": "NumberOfInstances", "value": "12.0"}
+    await expdb_test.execute(_ADD_QUALITY_QUERY, parameters)
+    await expdb_test.execute(_ADD_QUALITY_QUERY, {**parameters, "quality": "AutoCorrelation"})
+    summary = (await expdb_test.execute(_GET_SUMMARY_QUERY, parameters)).mappings().one()
+    assert summary["NumberOfInstances"] == 12.0  # noqa: PLR2004
+    assert summary["NumberOfFeatures"] is None
+
+    await expdb_test.execute(
+        text("DELETE FROM data_quality WHERE `data` = :dataset_id"),
+        parameters,
+    )
+    summary = (await expdb_test.execute(_GET_SUMMARY_QUERY, parameters)).mappings().one_or_none()
+    assert summary is None
+
+
+@pytest.mark.mut
+async def test_repair_summary(expdb_test: AsyncConnection) -> None:
+    before = (await expdb_test.execute(text("SELECT * FROM dataset_quality_summary"))).all()
+    await expdb_test.execute(text("DELETE FROM dataset_quality_summary WHERE `did` = 1"))
+    assert await database.qualities.repair_summary(expdb_test) == len(before)
+    after = (await expdb_test.execute(text("SELECT * FROM dataset_quality_summary"))).all()
+    assert sorted(after) == sorted(before)
+
+
+async def test_lists_without_summary_table(
+    expdb_test: AsyncConnection,
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    assert await database.qualities.has_summary_table(expdb_test)
+    requests = [
+        ("/datasets/list", {"status": "all"}),
+        ("/datasets/list", {"status": "all", "number_instances": "100..1000"}),
+        ("/tasks/list", {"number_instances": "150"}),
+    ]
+    expected = [(await py_api.post(path, json=body)).json() for path, body in requests]
+    # E.g., `python -m database repair-qualities` was not run yet.
+    mocker.patch.object(database.qualities, "has_summary_table", return_value=False)
+    assert [(await py_api.post(path, json=body)).json() for path, body in requests] == expected
@@ -105,3 +105,15 @@ async def test_db_get_uploader_name_missing(user_test: AsyncConnection) -> None:
     """get_uploader_name returns None for a non-existent user."""
     user = await database.users.get_user(user_id=_MISSING_USER_ID, connection=user_test)
     assert user is None
+
+
+async def test_db_stream_trace(expdb_test: AsyncConnection) -> None:
+    """stream_trace yields the trace rows of run 34 one at a time."""
+    rows = [row async for row in database.runs.stream_trace(34, expdb_test)]
+    assert rows
+    assert {"repeat", "fold", "iteration", "selected"} <= set(rows[0]._fields)
+
+
+async def test_db_stream_trace_missing(expdb_test: AsyncConnection) -> None:
+    """stream_trace yields nothing for a run without trace."""
+    assert [row async for row in database.runs.stream_trace(_RUN_ID, expdb_test)] == []
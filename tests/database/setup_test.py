@@ -0,0 +1,42 @@
+from typing import TYPE_CHECKING, cast
+
+from database.setup import (
+    _read_engine,
+    databases_ready,
+    expdb_database,
+    expdb_read_database,
+    is_autocommit,
+    prepare_databases,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.pool import QueuePool
+
+
+def test_read_engine_single_engine() -> None:
+    engine = cast("AsyncEngine", object())
+    assert _read_engine((engine,)) is engine
+
+
+def test_read_engine_round_robins_over_replicas() -> None:
+    replicas = cast("tuple[AsyncEngine, ...]", (object(), object()))
+    picked = [_read_engine(replicas) for _ in range(4)]
+    assert set(map(id, picked)) == set(map(id, replicas))
+    assert picked[0] is picked[2]
+    assert picked[1] is picked[3]
+
+
+def test_read_engine_is_autocommit_engine_for_primary() -> None:
+    engine = expdb_read_database()
+    assert is_autocommit(engine)
+    assert not is_autocommit(expdb_database())
+    assert engine.pool is expdb_database().pool
+
+
+async def test_prepare_databases_warms_up_pools() -> None:
+    assert await prepare_databases()
+    assert databases_ready()
+    for engine in (expdb_database(), expdb_read_database()):
+        pool = cast("QueuePool", engine.pool)
+        assert pool.checkedin() >= 1
@@ -3,12 +3,15 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+import database.users
 from core.errors import AuthenticationFailedError, AuthenticationRequiredError
+from database.caches import api_keys
 from database.users import User
 from routers.dependencies import fetch_user, fetch_user_or_raise
 from tests.users import ADMIN_USER, OWNER_USER, SOME_USER, ApiKey
 
 if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
@@ -44,3 +47,37 @@ async def test_fetch_user_or_raise_raises_if_no_user() -> None:
     # so it only needs to correctly handle possible output of `fetch_user`.
     with pytest.raises(AuthenticationRequiredError):
         fetch_user_or_raise(user=None)
+
+
+async def test_fetch_user_is_cached_with_groups(
+    user_test: AsyncConnection,
+    mocker: MockerFixture,
+) -> None:
+    api_keys.invalidate()
+    async with aclosing(fetch_user(ApiKey.ADMIN, user_data=user_test)) as agen:
+        await anext(agen)
+
+    get_user = mocker.spy(database.users, "get_user")
+    get_groups = mocker.spy(database.users, "get_user_groups_for")
+    async with aclosing(fetch_user(ApiKey.ADMIN, user_data=user_test)) as agen:
+        user = await anext(agen)
+    assert isinstance(user, User)
+    assert await user.is_admin()
+    get_user.assert_not_called()
+    get_groups.assert_not_called()
+
+
+async def test_fetch_user_invalid_key_is_cached(
+    user_test: AsyncConnection,
+    mocker: MockerFixture,
+) -> None:
+    api_keys.invalidate()
+    with pytest.raises(AuthenticationFailedError):
+        async with aclosing(fetch_user(api_key=ApiKey.INVALID, user_data=user_test)) as agen:
+            await anext(agen)
+
+    get_user = mocker.spy(database.users, "get_user")
+    with pytest.raises(AuthenticationFailedError):
+        async with aclosing(fetch_user(api_key=ApiKey.INVALID, user_data=user_test)) as agen:
+            await anext(agen)
+    get_user.assert_not_called()
@@ -3,7 +3,7 @@ from typing import Any
 import pytest
 from pydantic import ValidationError
 
-from routers.dependencies import Pagination
+from routers.dependencies import Pagination, encode_cursor
 
 
 def test_pagination_defaults() -> None:
@@ -36,3 +36,29 @@ def test_pagination_invalid_type(kwargs: dict[str, Any], expected_field: str) ->
         Pagination(**kwargs)
     errors = exc_info.value.errors()
     assert any(error["loc"] == (expected_field,) for error in errors)
+
+
+@pytest.mark.parametrize("last_id", [0, 1, 130, 2**31])
+def test_pagination_cursor_round_trip(last_id: int) -> None:
+    """A cursor made for the last id of a page continues after that id."""
+    cursor = encode_cursor(last_id)
+    assert cursor.isascii()
+    assert "=" not in cursor
+    assert Pagination(cursor=cursor).after == last_id
+
+
+def test_pagination_without_cursor() -> None:
+    assert Pagination(offset=5).after is None
+
+
+@pytest.mark.parametrize("cursor", ["", "%%%", "YWJj", "LTE"])
+def test_pagination_invalid_cursor(cursor: str) -> None:
+    """Cursors that were not issued by the API raise a ValidationError."""
+    with pytest.raises(ValidationError) as exc_info:
+        Pagination(cursor=cursor)
+    assert any(error["loc"] == ("cursor",) for error in exc_info.value.errors())
+
+
+def test_pagination_offset_and_cursor() -> None:
+    with pytest.raises(ValidationError, match="either an offset or a cursor"):
+        Pagination(offset=5, cursor=encode_cursor(1))
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 import pytest
 
 from core.errors import DatasetNotFoundError, TagAlreadyExistsError
+from core.shared_cache import shared_cache
 from database.datasets import get_tags_for
 from database.users import User
 from routers.openml.datasets import tag_dataset
@@ -53,6 +54,19 @@ async def test_dataset_tag(
     assert tag in tags
 
 
+@pytest.mark.mut
+async def test_dataset_tag_invalidates_cached_responses(
+    expdb_test: AsyncConnection, dataset_factory: DatasetFactory
+) -> None:
+    dataset_id = await dataset_factory()
+    cache = shared_cache()
+    await cache.set(
+        f"response:/datasets/{dataset_id}", b"{}", ttl=60, tags=[f"dataset:{dataset_id}"]
+    )
+    await tag_dataset(data_id=dataset_id, tag="test_tag", user=ADMIN_USER, expdb_db=expdb_test)
+    assert await cache.get(f"response:/datasets/{dataset_id}") is None
+
+
 @pytest.mark.mut
 async def test_dataset_tag_returns_existing_tags(
     expdb_test: AsyncConnection, dataset_factory: DatasetFactory
@@ -0,0 +1,78 @@
+"""Tests for the POST /datasets/batch endpoint."""
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+
+from routers.dependencies import LIMIT_MAX
+from routers.openml.datasets import get_datasets
+from tests.benchmarks.round_trips import count_round_trips
+from tests.users import ADMIN_USER, DATASET_130_OWNER, SOME_USER
+
+if TYPE_CHECKING:
+    import httpx
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from database.users import User
+
+
+async def test_get_datasets_matches_get_dataset(py_api: httpx.AsyncClient) -> None:
+    response = await py_api.post("/datasets/batch", json={"dataset_ids": [2, 130, 1, 2, 100_000]})
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()
+    # One result for each distinct id, in the order they are requested.
+    assert [result["id"] for result in results] == [2, 130, 1, 100_000]
+
+    for result in results:
+        single = await py_api.get(f"/datasets/{result['id']}")
+        if single.status_code == HTTPStatus.OK:
+            assert result == {"id": result["id"], "dataset": single.json(), "problem": None}
+        else:
+            assert result == {"id": result["id"], "dataset": None, "problem": single.json()}
+
+
+@pytest.mark.parametrize(
+    ("user", "has_access"),
+    [(DATASET_130_OWNER, True), (ADMIN_USER, True), (SOME_USER, False)],
+)
+async def test_get_datasets_private(
+    user: User,
+    *,
+    has_access: bool,
+    expdb_test: AsyncConnection,
+    user_test: AsyncConnection,
+) -> None:
+    [result] = await get_datasets(
+        dataset_ids=[130],
+        user=user,
+        user_db=user_test,
+        expdb_db=expdb_test,
+    )
+    assert (result.dataset is not None) == has_access
+    assert (result.problem is None) == has_access
+
+
+async def test_get_datasets_queries_do_not_grow_with_ids(
+    mocker: MockerFixture,
+    expdb_test: AsyncConnection,
+    user_test: AsyncConnection,
+) -> None:
+    async def get(dataset_ids: list[int]) -> int:
+        with count_round_trips(mocker) as round_trips:
+            await get_datasets(dataset_ids, user=None, user_db=user_test, expdb_db=expdb_test)
+        return round_trips.statements
+
+    await get([1])  # The largest dataset id is fetched once, and remembered.
+    # The datasets, files, tags, descriptions, processing updates, and statuses.
+    assert await get([1, 2]) == await get(list(range(1, 101))) == 6  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("dataset_ids", [[], list(range(1, LIMIT_MAX + 2))])
+async def test_get_datasets_number_of_ids(
+    dataset_ids: list[int],
+    py_api: httpx.AsyncClient,
+) -> None:
+    response = await py_api.post("/datasets/batch", json={"dataset_ids": dataset_ids})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
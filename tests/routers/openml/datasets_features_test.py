@@ -3,11 +3,14 @@
 import asyncio
 import re
 from http import HTTPStatus
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 import pytest
 
+from config import get_config
 from core.errors import DatasetNoAccessError, DatasetNotFoundError, DatasetProcessingError
+from database.connection import LazyConnection
+from database.setup import _create_engine
 from database.users import User
 from routers.openml.datasets import get_dataset_features
 from tests.users import ADMIN_USER, DATASET_130_OWNER
@@ -109,6 +112,23 @@ async def test_dataset_features_dataset_does_not_exist(expdb_test: AsyncConnecti
         await get_dataset_features(dataset_id=1000, user=None, expdb=expdb_test)
 
 
+async def test_dataset_features_fan_out_with_exhausted_pool(expdb_test: AsyncConnection) -> None:
+    # The request holds the only connection of the pool, so the queries it fans out
+    # can not borrow another one and must run on the request connection instead.
+    configuration = get_config().expdb_database.model_copy(
+        update={"pool_size": 1, "max_overflow": 0, "pool_timeout": 1},
+    )
+    engine = _create_engine(configuration, name="expdb/exhausted")
+    try:
+        async with LazyConnection(engine, max_parallel_queries=4) as lazy:
+            expdb = cast("AsyncConnection", lazy)
+            features = await get_dataset_features(dataset_id=11, user=None, expdb=expdb)
+            assert lazy.checked_out
+    finally:
+        await engine.dispose()
+    assert features == await get_dataset_features(dataset_id=11, user=None, expdb=expdb_test)
+
+
 # -- migration tests --
 
 
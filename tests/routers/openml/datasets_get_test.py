@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING
 import pytest
 from sqlalchemy import text
 
+import database.datasets
 import tests.constants
 from core.errors import DatasetNoAccessError, DatasetNotFoundError
 from database.users import User
@@ -18,6 +19,7 @@ from tests.users import ADMIN_USER, DATASET_130_OWNER, NO_USER, SOME_USER, ApiKe
 
 if TYPE_CHECKING:
     import httpx
+    from pytest_mock import MockerFixture
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
@@ -90,6 +92,19 @@ async def test_dataset_no_500_with_multiple_processing_entries(
     assert response.status_code == HTTPStatus.OK
 
 
+async def test_get_dataset_above_largest_id_is_not_queried(
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    get = mocker.spy(database.datasets, "get")
+    for dataset_id in (138, 100_000_000):
+        response = await py_api.get(f"/datasets/{dataset_id}")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response.json()["type"] == DatasetNotFoundError.uri
+    # The id above the largest id is rejected without querying for the dataset.
+    assert get.call_count == 1
+
+
 @pytest.mark.parametrize(
     "dataset_id",
     [138, 100_000],
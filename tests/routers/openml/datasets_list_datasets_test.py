@@ -10,7 +10,7 @@ from hypothesis import strategies as st
 
 from core.errors import NoResultsError
 from database.users import User
-from routers.dependencies import LIMIT_DEFAULT, Pagination
+from routers.dependencies import LIMIT_DEFAULT, NEXT_CURSOR_HEADER, Pagination, encode_cursor
 from routers.openml.datasets import DatasetStatusFilter, list_datasets
 from tests import constants
 from tests.users import ADMIN_USER, DATASET_130_OWNER, SOME_USER, ApiKey
@@ -25,6 +25,37 @@ async def test_list_route(py_api: httpx.AsyncClient) -> None:
     assert len(response.json()) >= 1
 
 
+async def test_list_pages_by_cursor(py_api: httpx.AsyncClient) -> None:
+    """Following the cursors yields the same datasets as paging by offset, in order."""
+    limit = 40
+    by_offset = await py_api.post(
+        "/datasets/list",
+        json={"status": "all", "pagination": {"limit": constants.NUMBER_OF_DATASETS}},
+    )
+    expected_ids = [dataset["did"] for dataset in by_offset.json()]
+
+    ids: list[int] = []
+    pagination: dict[str, Any] = {"limit": limit}
+    while True:
+        response = await py_api.post(
+            "/datasets/list", json={"status": "all", "pagination": pagination}
+        )
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            break
+        assert response.status_code == HTTPStatus.OK
+        ids.extend(dataset["did"] for dataset in response.json())
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        pagination = {"limit": limit, "cursor": response.headers[NEXT_CURSOR_HEADER]}
+    assert ids == expected_ids == sorted(expected_ids)
+
+
+async def test_list_offset_and_cursor_rejected(py_api: httpx.AsyncClient) -> None:
+    pagination = {"offset": 10, "cursor": encode_cursor(10)}
+    response = await py_api.post("/datasets/list", json={"pagination": pagination})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.slow
 @hypothesis.settings(  # type: ignore[untyped-decorator]  # 108
     max_examples=500,  # This number needs to be better motivated
@@ -338,6 +369,8 @@ async def test_list_data_tag_empty(expdb_test: AsyncConnection) -> None:
         ("number_classes", "2..3", 56),
         ("number_missing_values", "2", 1),
         ("number_missing_values", "2..100000", 23),
+        ("number_instances", "149.5..150.5", 2),
+        ("number_classes", "1.5..3.5", 56),
     ],
 )
 async def test_list_data_quality(
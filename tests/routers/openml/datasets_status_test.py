@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 import pytest
 
 from core.errors import DatasetAdminOnlyError, DatasetNotOwnedError
+from core.shared_cache import shared_cache
 from routers.openml.datasets import update_dataset_status
 from schemas.datasets.openml import DatasetStatus
 from tests import constants
@@ -39,6 +40,21 @@ async def test_dataset_status_update_active_to_deactivated(
     assert result == {"dataset_id": dataset_id, "status": DatasetStatus.DEACTIVATED}
 
 
+@pytest.mark.mut
+async def test_dataset_status_update_invalidates_cached_responses(
+    expdb_test: AsyncConnection,
+) -> None:
+    cache = shared_cache()
+    await cache.set("response:/datasets/3", b"{}", ttl=60, tags=["dataset:3"])
+    await update_dataset_status(
+        dataset_id=3,
+        status=DatasetStatus.DEACTIVATED,
+        user=ADMIN_USER,
+        expdb=expdb_test,
+    )
+    assert await cache.get("response:/datasets/3") is None
+
+
 @pytest.mark.mut
 async def test_dataset_status_update_in_preparation_to_active(
     expdb_test: AsyncConnection,
@@ -4,14 +4,20 @@ from typing import TYPE_CHECKING, Any
 
 import deepdiff.diff
 import pytest
+from sqlalchemy.exc import OperationalError
 
+import database.flows
 from core.conversions import (
     nested_remove_single_element_list,
     nested_str_to_num,
 )
+from core.errors import QueryTimeoutError
+from database.caches import flow_rows, flows
+from database.exceptions import _QUERY_TIMEOUT
 
 if TYPE_CHECKING:
     import httpx
+    from pytest_mock import MockerFixture
 
 
 async def test_get_flow_no_subflow(py_api: httpx.AsyncClient) -> None:
@@ -362,3 +368,36 @@ async def test_get_flow_equal(
         ignore_numeric_type_changes=True,
     )
     assert not difference
+
+
+async def test_get_flow_query_timeout(py_api: httpx.AsyncClient, mocker: MockerFixture) -> None:
+    timeout = OperationalError("SELECT", {}, Exception(_QUERY_TIMEOUT, "interrupted"))
+    mocker.patch("database.flows.get", side_effect=timeout)
+    response = await py_api.get("/flows/1")
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["content-type"] == "application/problem+json"
+    assert response.json()["type"] == QueryTimeoutError.uri
+
+
+async def test_get_flow_not_modified(py_api: httpx.AsyncClient) -> None:
+    response = await py_api.get("/flows/1")
+    assert response.status_code == HTTPStatus.OK
+    assert "max-age" in response.headers["cache-control"]
+
+    response = await py_api.get("/flows/1", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+
+
+async def test_get_flow_repeated_only_queries_tags(
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    first = await py_api.get("/flows/3")
+    misses = flows.misses, flow_rows.misses
+    get_tags_for = mocker.spy(database.flows, "get_tags_for")
+
+    second = await py_api.get("/flows/3")
+    assert second.json() == first.json()
+    assert (flows.misses, flow_rows.misses) == misses
+    get_tags_for.assert_called_once()
@@ -1,15 +1,28 @@
 import asyncio
+import time
+from collections.abc import Iterator
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 
 import pytest
 from sqlalchemy import text
 
+from database.caches import quality_names
+
 if TYPE_CHECKING:
     import httpx
+    from pytest_mock import MockerFixture
     from sqlalchemy.ext.asyncio import AsyncConnection
 
 
+@pytest.fixture
+def fresh_quality_names() -> Iterator[None]:
+    """Do not let cached quality names outlive the test, its changes are rolled back."""
+    quality_names.invalidate()
+    yield
+    quality_names.invalidate()
+
+
 async def _remove_quality_from_database(quality_name: str, expdb_test: AsyncConnection) -> None:
     await expdb_test.execute(
         text(
@@ -31,6 +44,11 @@ async def _remove_quality_from_database(quality_name: str, expdb_test: AsyncConn
     )
 
 
+def _expire_quality_names(mocker: MockerFixture) -> None:
+    expired = time.monotonic() + quality_names.ttl + 1
+    mocker.patch("core.cache.time.monotonic", return_value=expired)
+
+
 async def test_list_qualities_identical(
     py_api: httpx.AsyncClient, php_api: httpx.AsyncClient
 ) -> None:
@@ -44,7 +62,12 @@ async def test_list_qualities_identical(
 
 
 @pytest.mark.mut
-async def test_list_qualities(py_api: httpx.AsyncClient, expdb_test: AsyncConnection) -> None:
+@pytest.mark.usefixtures("fresh_quality_names")
+async def test_list_qualities(
+    py_api: httpx.AsyncClient,
+    expdb_test: AsyncConnection,
+    mocker: MockerFixture,
+) -> None:
     response = await py_api.get("/datasets/qualities/list")
     assert response.status_code == HTTPStatus.OK
     expected = {
@@ -165,6 +188,44 @@ async def test_list_qualities(py_api: httpx.AsyncClient, expdb_test: AsyncConnec
     deleted = expected["data_qualities_list"]["quality"].pop()
     await _remove_quality_from_database(quality_name=deleted, expdb_test=expdb_test)
 
+    _expire_quality_names(mocker)
     response = await py_api.get("/datasets/qualities/list")
     assert response.status_code == HTTPStatus.OK
     assert response.json() == expected
+
+
+@pytest.mark.mut
+@pytest.mark.usefixtures("fresh_quality_names")
+async def test_list_qualities_refreshes_on_expiry(
+    py_api: httpx.AsyncClient,
+    expdb_test: AsyncConnection,
+    mocker: MockerFixture,
+) -> None:
+    response = await py_api.get("/datasets/qualities/list")
+    assert "NewQuality" not in response.json()["data_qualities_list"]["quality"]
+
+    # E.g., a quality the evaluation engine backfills for an existing dataset.
+    await expdb_test.execute(
+        text(
+            """
+            INSERT INTO quality (`name`, `type`, `showonline`)
+            VALUES ('NewQuality', 'DataQuality', 'true')
+            """,
+        ),
+    )
+    await expdb_test.execute(
+        text(
+            """
+            INSERT INTO data_quality (`data`, `quality`, `evaluation_engine_id`, `value`)
+            VALUES (1, 'NewQuality', 1, '0.5')
+            """,
+        ),
+    )
+
+    # The names are served from the cache until it expires.
+    response = await py_api.get("/datasets/qualities/list")
+    assert "NewQuality" not in response.json()["data_qualities_list"]["quality"]
+
+    _expire_quality_names(mocker)
+    response = await py_api.get("/datasets/qualities/list")
+    assert "NewQuality" in response.json()["data_qualities_list"]["quality"]
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 import deepdiff
 import pytest
 
+import database.tasks
 from core.conversions import (
     nested_num_to_str,
     nested_remove_single_element_list,
@@ -13,6 +14,7 @@ from core.conversions import (
 
 if TYPE_CHECKING:
     import httpx
+    from pytest_mock import MockerFixture
 
 
 async def test_get_task(py_api: httpx.AsyncClient) -> None:
@@ -63,6 +65,17 @@ async def test_get_task(py_api: httpx.AsyncClient) -> None:
     assert not differences
 
 
+async def test_get_task_looks_up_estimation_procedure_in_memory(
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    get_lookup_row = mocker.spy(database.tasks, "get_lookup_row")
+    for task_id in (59, 1):
+        response = await py_api.get(f"/tasks/{task_id}")
+        assert response.status_code == HTTPStatus.OK
+    get_lookup_row.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "task_id",
     range(1, 1306),
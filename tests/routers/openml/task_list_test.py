@@ -4,10 +4,12 @@ from typing import TYPE_CHECKING, Any, cast
 
 import deepdiff
 import pytest
+from fastapi import Response
+from sqlalchemy import text
 
 from core.conversions import nested_remove_single_element_list
 from core.errors import NoResultsError
-from routers.dependencies import LIMIT_MAX, Pagination
+from routers.dependencies import LIMIT_MAX, NEXT_CURSOR_HEADER, Pagination
 from routers.openml.tasks import TaskStatusFilter, list_tasks
 
 if TYPE_CHECKING:
@@ -209,6 +211,22 @@ async def test_list_tasks_pagination_order_stable(expdb_test: AsyncConnection) -
         assert max(ids1) < min(ids2)
 
 
+async def test_list_tasks_pagination_cursor(expdb_test: AsyncConnection) -> None:
+    """The cursor of a full page continues right after its last task."""
+    response = Response()
+    tasks1 = await list_tasks(pagination=Pagination(limit=5), expdb=expdb_test, response=response)
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    tasks2 = await list_tasks(pagination=Pagination(limit=5, cursor=cursor), expdb=expdb_test)
+    baseline = await list_tasks(pagination=Pagination(limit=10), expdb=expdb_test)
+    assert [t["task_id"] for t in tasks1 + tasks2] == [t["task_id"] for t in baseline]
+
+
+async def test_list_tasks_last_page_has_no_cursor(expdb_test: AsyncConnection) -> None:
+    response = Response()
+    await list_tasks(pagination=Pagination(limit=LIMIT_MAX), expdb=expdb_test, response=response)
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
 async def test_list_tasks_number_instances_range(expdb_test: AsyncConnection) -> None:
     """number_instances range filter returns tasks whose dataset matches."""
     min_instances, max_instances = 100, 1000
@@ -242,6 +260,20 @@ async def test_list_tasks_quality_values_are_strings(expdb_test: AsyncConnection
     assert all(isinstance(quality["value"], str) for quality in qualities)
 
 
+async def test_list_tasks_quality_values_as_stored(expdb_test: AsyncConnection) -> None:
+    """Quality values are the stored text, e.g., "150" rather than "150.0"."""
+    tasks = await list_tasks(pagination=Pagination(limit=5, offset=0), expdb=expdb_test)
+    task = next(task for task in tasks if task.get("quality"))
+    rows = await expdb_test.execute(
+        text("SELECT `quality`, `value` FROM data_quality WHERE `data` = :did"),
+        parameters={"did": task["did"]},
+    )
+    stored = {row.quality: str(row.value) for row in rows.all()}
+    assert {quality["name"]: quality["value"] for quality in task["quality"]} == {
+        quality["name"]: stored[quality["name"]] for quality in task["quality"]
+    }
+
+
 @pytest.mark.parametrize(
     "payload",
     [
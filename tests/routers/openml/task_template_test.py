@@ -0,0 +1,66 @@
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+from routers.openml.tasks import TaskTemplate
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import RowMapping
+
+ESTIMATION_PROCEDURE_TEMPLATE = """
+<oml:estimation_procedure>
+  <oml:id>[INPUT:estimation_procedure]</oml:id>
+  <oml:type>[LOOKUP:estimation_procedure.type]</oml:type>
+  <oml:data_splits_url>[CONSTANT:base_url]api_splits/get/[TASK:id]/Task_[TASK:id]_splits.arff</oml:data_splits_url>
+  <oml:parameter name="number_repeats">[LOOKUP:estimation_procedure.repeats]</oml:parameter>
+  <oml:parameter name="cost_matrix">[INPUT:cost_matrix]</oml:parameter>
+</oml:estimation_procedure>
+"""
+
+
+def test_task_template_parse() -> None:
+    template = TaskTemplate.parse(ESTIMATION_PROCEDURE_TEMPLATE)
+    assert template.lookup_tables == {"estimation_procedure"}
+
+
+def test_task_template_fill() -> None:
+    template = TaskTemplate.parse(ESTIMATION_PROCEDURE_TEMPLATE)
+    row = cast("RowMapping", {"id": 5, "type": "holdout", "repeats": 1})
+    filled = template.fill(59, {"estimation_procedure": 5}, {"estimation_procedure": row})
+    assert filled == {
+        "estimation_procedure": {
+            "id": 5,
+            "type": "holdout",
+            "data_splits_url": "http://php-api:80/api_splits/get/59/Task_59_splits.arff",
+            "parameter": [
+                {"name": "number_repeats", "value": 1},
+                {"name": "cost_matrix", "value": []},
+            ],
+        },
+    }
+
+
+def test_task_template_fill_does_not_modify_template() -> None:
+    template = TaskTemplate.parse("<oml:a><oml:b>[TASK:id]</oml:b></oml:a>")
+    assert template.fill(1, {}, {}) == {"a": {"b": "1"}}
+    assert template.fill(2, {}, {}) == {"a": {"b": "2"}}
+
+
+def test_task_template_fill_directives_in_text() -> None:
+    template = TaskTemplate.parse(
+        "<oml:a><oml:b>Task [TASK:id] on [INPUT:source_data]</oml:b>"
+        "<oml:c>[LOOKUP:estimation_procedure.type][INPUT:source_data]</oml:c></oml:a>",
+    )
+    assert template.lookup_tables == {"estimation_procedure"}
+    row = cast("RowMapping", {"id": 5, "type": "holdout"})
+    filled = template.fill(
+        59,
+        {"source_data": 61, "estimation_procedure": 5},
+        {"estimation_procedure": row},
+    )
+    assert filled == {"a": {"b": "Task 59 on 61", "c": "holdout61"}}
+
+
+def test_task_template_rejects_empty_elements() -> None:
+    with pytest.raises(TypeError):
+        TaskTemplate.parse("<oml:a><oml:b/></oml:a>")
@@ -11,6 +11,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncConnection  # noqa: TC002 used at runtime by pytest fixtures
 
+import database.users
 from core.errors import AccountHasResourcesError, ForbiddenError, UserNotFoundError
 from database.users import UserGroup
 from routers.openml.users import delete_user_account
@@ -90,6 +91,29 @@ async def test_delete_user_api_success_self_delete(
     )
 
 
+@pytest.mark.mut
+async def test_delete_user_api_key_stops_authenticating(
+    py_api: httpx.AsyncClient,
+    disposable_user: DisposableUser,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    broadcast = mocker.spy(database.users, "broadcast_invalidation")
+    response = await py_api.delete(
+        f"/users/{disposable_user.user_id}",
+        params={"api_key": disposable_user.api_key},
+    )
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+    # The first request cached the API key, deleting the user must remove it.
+    response = await py_api.delete(
+        f"/users/{disposable_user.user_id}",
+        params={"api_key": disposable_user.api_key},
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    # Other workers cached the API key as well.
+    broadcast.assert_awaited_once_with("api_keys")
+
+
 @pytest.mark.mut
 async def test_delete_user_api_success_admin_deletes_disposable_user(
     py_api: httpx.AsyncClient,
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from core.errors import CacheInvalidationError, CacheNotFoundError, ForbiddenError
+from database.caches import reference_data
+from tests.users import ApiKey
+
+if TYPE_CHECKING:
+    import httpx
+    from pytest_mock import MockerFixture
+
+
+async def test_cache_statistics_count_hits(py_api: httpx.AsyncClient) -> None:
+    await py_api.get("/tasktype/list")
+    await py_api.get("/tasktype/list")
+    response = await py_api.get("/system/caches")
+    assert response.status_code == HTTPStatus.OK
+    (statistics,) = (cache for cache in response.json() if cache["name"] == "reference_data")
+    assert statistics["size"] >= 1
+    assert statistics["hits"] >= 1
+
+
+async def test_clear_cache_as_admin(py_api: httpx.AsyncClient) -> None:
+    await py_api.get("/estimationprocedure/list")
+    response = await py_api.delete(f"/system/caches/reference_data?api_key={ApiKey.ADMIN}")
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    assert reference_data.statistics()["size"] == 0
+
+
+async def test_clear_cache_without_shared_cache(
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("routers.system.broadcast_invalidation", side_effect=ConnectionRefusedError)
+    await py_api.get("/estimationprocedure/list")
+    response = await py_api.delete(f"/system/caches/reference_data?api_key={ApiKey.ADMIN}")
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()["type"] == CacheInvalidationError.uri
+    assert reference_data.statistics()["size"] == 0
+
+
+async def test_clear_cache_requires_admin(py_api: httpx.AsyncClient) -> None:
+    response = await py_api.delete(f"/system/caches/reference_data?api_key={ApiKey.SOME_USER}")
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json()["type"] == ForbiddenError.uri
+
+
+async def test_clear_unknown_cache(py_api: httpx.AsyncClient) -> None:
+    response = await py_api.delete(f"/system/caches/unknown?api_key={ApiKey.ADMIN}")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json()["type"] == CacheNotFoundError.uri
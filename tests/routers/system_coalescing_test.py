@@ -0,0 +1,19 @@
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+
+async def test_coalescing_statistics_count_computations(py_api: httpx.AsyncClient) -> None:
+    before = await py_api.get("/system/coalescing")
+    await py_api.get("/tasks/59")
+    after = await py_api.get("/system/coalescing")
+    assert after.status_code == HTTPStatus.OK
+
+    def tasks(response: httpx.Response) -> dict[str, int]:
+        return next(group for group in response.json() if group["name"] == "tasks")
+
+    assert tasks(after)["computations"] == tasks(before)["computations"] + 1
+    assert tasks(after)["in_flight"] == 0
+    assert {"datasets", "studies"} <= {group["name"] for group in after.json()}
@@ -0,0 +1,16 @@
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+
+async def test_get_pool_statistics(py_api: httpx.AsyncClient) -> None:
+    response = await py_api.get("/system/pools")
+    assert response.status_code == HTTPStatus.OK
+    statistics = {pool["engine"]: pool for pool in response.json()}
+    # The test fixtures hold a connection to each database for the duration of the test.
+    assert statistics.keys() == {"user/primary", "expdb/primary"}
+    for pool in statistics.values():
+        assert pool["checked_out"] >= 1
+        assert pool["wait_ms_max"] >= pool["wait_ms_mean"] >= 0
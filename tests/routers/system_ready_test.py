@@ -0,0 +1,26 @@
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from core.errors import ServiceNotReadyError
+
+if TYPE_CHECKING:
+    import httpx
+    from pytest_mock import MockerFixture
+
+
+async def test_ready_after_startup(py_api: httpx.AsyncClient) -> None:
+    response = await py_api.get("/system/ready")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"ready": True}
+
+
+async def test_not_ready_if_databases_unreachable(
+    py_api: httpx.AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("routers.system.databases_ready", return_value=False)
+    prepare = mocker.patch("routers.system.prepare_databases", return_value=False)
+    response = await py_api.get("/system/ready")
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()["type"] == ServiceNotReadyError.uri
+    prepare.assert_awaited_once()
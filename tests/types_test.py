@@ -11,7 +11,7 @@ import string
 import pytest
 from pydantic import TypeAdapter, ValidationError
 
-from routers.types import CasualString, Identifier, TagString
+from routers.types import CasualString, Identifier, NumberRange, TagString
 
 _identifier = TypeAdapter(Identifier)
 
@@ -82,3 +82,17 @@ def test_casual_string_accepts_valid(string: str) -> None:
 def test_casual_string_rejects_invalid(string: str) -> None:
     with pytest.raises(ValidationError):
         _casual_string.validate_strings(string)
+
+
+_number_range = TypeAdapter(NumberRange)
+
+
+@pytest.mark.parametrize("range_", ["12", "3..150", "0.5", "0.5..1.5", "1..2.5"])
+def test_number_range_accepts_valid(range_: str) -> None:
+    assert _number_range.validate_strings(range_) == range_
+
+
+@pytest.mark.parametrize("range_", ["", "-1", "1.", ".5", "..3", "1...5", "1..", "1e3"])
+def test_number_range_rejects_invalid(range_: str) -> None:
+    with pytest.raises(ValidationError):
+        _number_range.validate_strings(range_)